@@ -1,18 +1,30 @@
 """FastAPI router definitions for rule management and evaluation."""
 
-from typing import Any, Dict, List, Optional
+from functools import partial
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, status
+import anyio
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from application.services import EvaluationService, RuleService
+from adapters import json_codec
+from adapters.json_codec import JSONCodecResponse
+from application.services import EvaluationService, RuleService, RuleSetService
 from domain.exceptions import (
     DomainException,
     RuleNotFoundException,
+    RuleSetNotFoundException,
     RuleValidationException,
     EvaluationException
 )
+from domain.models import EvaluationResponse
+
+T = TypeVar("T")
+
+# Runs a blocking function in the router's worker threads
+RunBlocking = Callable[..., Awaitable[Any]]
 
 
 class PredicateRequest(BaseModel):
@@ -132,10 +144,68 @@ class RuleResponse(BaseModel):
         }
 
 
+class RuleSetCreateRequest(BaseModel):
+    """Request model for creating a rule set."""
+    name: str = Field(..., description="Rule set name")
+    description: str = Field(..., description="Rule set description")
+    rule_ids: List[str] = Field(..., description="IDs of the rules in the set, in evaluation order")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "Loan Eligibility",
+                "description": "Rules every loan application is checked against",
+                "rule_ids": [
+                    "123e4567-e89b-12d3-a456-426614174000",
+                    "223e4567-e89b-12d3-a456-426614174000"
+                ]
+            }
+        }
+
+
+class RuleSetUpdateRequest(BaseModel):
+    """Request model for updating a rule set."""
+    name: str = Field(..., description="Rule set name")
+    description: str = Field(..., description="Rule set description")
+    rule_ids: List[str] = Field(..., description="IDs of the rules in the set, in evaluation order")
+
+
+class RuleSetResponse(BaseModel):
+    """Response model for a rule set."""
+    id: str
+    name: str
+    description: str
+    rule_ids: List[str]
+
+
+class RuleSetEvaluateRequest(BaseModel):
+    """Request model for evaluating a payload against a rule set."""
+    payload: Dict[str, Any] = Field(..., description="The JSON payload to evaluate")
+    explain: bool = Field(
+        True,
+        description="Include per-comparison details. Set to false for a faster, verdict-only evaluation"
+    )
+    stop_on_first_fail: bool = Field(
+        False,
+        description="Stop at the first failing rule; rules not evaluated are listed in skipped_rules"
+    )
+
+
 class EvaluateRequest(BaseModel):
     """Request model for evaluation."""
     payload: Dict[str, Any] = Field(..., description="The JSON payload to evaluate")
     rule_ids: List[str] = Field(..., description="List of rule IDs to evaluate against")
+    explain: bool = Field(
+        True,
+        description="Include per-comparison details. Set to false for a faster, verdict-only evaluation"
+    )
+    stop_on_first_fail: bool = Field(
+        False,
+        description=(
+            "Stop at the first failing rule, trying rules that fail often and cheaply first. "
+            "Rules not evaluated are listed in skipped_rules"
+        )
+    )
 
     class Config:
         json_schema_extra = {
@@ -155,6 +225,11 @@ class EvaluateResponse(BaseModel):
     result: str = Field(..., description="Overall result (PASS or FAIL)")
     reasons: List[str] = Field(..., description="List of reasons for each rule")
     details: List[Dict[str, Any]] = Field(..., description="Detailed evaluation results")
+    snapshot_version: Optional[int] = Field(None, description="Version of the rule snapshot the payload was evaluated against")
+    skipped_rules: Optional[List[str]] = Field(
+        None,
+        description="IDs of rules not evaluated because another rule already failed (stop_on_first_fail only)"
+    )
 
     class Config:
         json_schema_extra = {
@@ -163,6 +238,7 @@ class EvaluateResponse(BaseModel):
                 "reasons": [
                     "Age Verification: User meets minimum age requirement"
                 ],
+                "snapshot_version": 3,
                 "details": [
                     {
                         "rule_id": "123e4567-e89b-12d3-a456-426614174000",
@@ -184,10 +260,188 @@ class EvaluateResponse(BaseModel):
         }
 
 
-def create_rule_router(rule_service: RuleService, evaluation_service: EvaluationService) -> APIRouter:
-    """Create and configure the API router."""
+class EvaluateAllRequest(BaseModel):
+    """Request model for evaluation against the whole rule base."""
+    payload: Dict[str, Any] = Field(..., description="The JSON payload to evaluate")
+    explain: bool = Field(False, description="Include per-comparison details for every evaluated rule")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "payload": {
+                    "age": 25,
+                    "country": "USA",
+                    "credit_score": 720
+                }
+            }
+        }
+
+
+class EvaluateAllResponse(BaseModel):
+    """Response model for evaluation against the whole rule base."""
+    total_rules: int = Field(..., description="Number of rules in the rule base")
+    evaluated_rules: int = Field(..., description="Number of rules applicable to the payload, and evaluated")
+    matched: List[str] = Field(..., description="IDs of evaluated rules that passed")
+    failed: List[str] = Field(..., description="IDs of evaluated rules that failed")
+    details: List[Dict[str, Any]] = Field(..., description="Result of every evaluated rule, in rule base order")
+    snapshot_version: int = Field(..., description="Version of the rule snapshot the payload was evaluated against")
+
+
+class BatchEvaluateRequest(BaseModel):
+    """Request model for batch evaluation."""
+    payloads: List[Dict[str, Any]] = Field(..., description="The JSON payloads to evaluate")
+    rule_ids: List[str] = Field(..., description="List of rule IDs to evaluate every payload against")
+    explain: bool = Field(False, description="Include per-comparison details for every payload")
+    explain_indices: Optional[List[int]] = Field(
+        None,
+        description="Zero-based positions of payloads to include per-comparison details for when explain is false"
+    )
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "payloads": [
+                    {"age": 25, "country": "USA", "credit_score": 720},
+                    {"age": 16, "country": "UK", "credit_score": 600}
+                ],
+                "rule_ids": ["123e4567-e89b-12d3-a456-426614174000"],
+                "explain": False
+            }
+        }
+
+
+class BatchEvaluateResponse(BaseModel):
+    """Response model for batch evaluation."""
+    count: int = Field(..., description="Number of payloads evaluated")
+    passed: int = Field(..., description="Number of payloads with an overall PASS")
+    failed: int = Field(..., description="Number of payloads with an overall FAIL")
+    elapsed_ms: float = Field(..., description="Server-side evaluation time in milliseconds")
+    records_per_second: Optional[float] = Field(None, description="Evaluation throughput")
+    snapshot_version: int = Field(..., description="Version of the rule snapshot every payload was evaluated against")
+    results: List[EvaluateResponse] = Field(..., description="One result per payload, in request order")
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response whose body iterator consumes the request body as it goes.
+
+    Starlette's StreamingResponse watches for client disconnects by reading
+    from `receive`, which would swallow the request body messages we are
+    still streaming in. Here a disconnect surfaces from request.stream()
+    instead.
+    """
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+def _evaluate_ndjson_lines(
+    first_index: int,
+    lines: List[bytes],
+    evaluate_payload: Callable[[Dict[str, Any]], EvaluationResponse]
+) -> bytes:
+    """Evaluate consecutive NDJSON payload lines and encode their results."""
+    return b"".join(
+        _evaluate_ndjson_line(first_index + offset, line, evaluate_payload)
+        for offset, line in enumerate(lines)
+    )
+
+
+def _evaluate_ndjson_line(
+    index: int,
+    line: bytes,
+    evaluate_payload: Callable[[Dict[str, Any]], EvaluationResponse]
+) -> bytes:
+    """Evaluate one NDJSON payload line and encode the result as an NDJSON line."""
+    try:
+        payload = json_codec.loads(line)
+    except ValueError as e:
+        record = {"index": index, "error": f"Invalid JSON: {e}"}
+    else:
+        if isinstance(payload, dict):
+            record = {"index": index, **evaluate_payload(payload).to_dict()}
+        else:
+            record = {"index": index, "error": "Each line must be a JSON object"}
+    return json_codec.dumps(record) + b"\n"
+
+
+async def _stream_ndjson_results(
+    request: Request,
+    evaluate_payload: Callable[[Dict[str, Any]], EvaluationResponse],
+    max_line_bytes: int,
+    run_blocking: RunBlocking
+) -> AsyncIterator[bytes]:
+    """Evaluate NDJSON payloads as the request body arrives.
+
+    Only the current chunk and one partial line are held in memory. Results
+    for each received chunk are yielded before the next chunk is read, so a
+    slow client reading the response also slows down how fast we consume
+    its request body. The lines of a chunk are evaluated in a worker thread.
+    """
+    buffer = bytearray()
+    index = 0
+
+    async for chunk in request.stream():
+        buffer += chunk
+        lines = []
+        start = 0
+        too_long = False
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                # The partial last line is checked once it has grown past the limit
+                too_long = len(buffer) - start > max_line_bytes
+                break
+            if end - start > max_line_bytes:
+                # A complete line can arrive in one chunk; it is not parsed either
+                too_long = True
+                break
+            line = bytes(buffer[start:end])
+            start = end + 1
+            if line.strip():
+                lines.append(line)
+        del buffer[:start]
+
+        output = b""
+        if lines:
+            output = await run_blocking(_evaluate_ndjson_lines, index, lines, evaluate_payload)
+            index += len(lines)
+
+        if too_long:
+            yield output + json_codec.dumps({
+                "index": index,
+                "error": f"Line exceeds the maximum length of {max_line_bytes} bytes"
+            }) + b"\n"
+            return
+
+        if output:
+            yield output
+
+    if buffer.strip():
+        yield await run_blocking(_evaluate_ndjson_line, index, bytes(buffer), evaluate_payload)
+
+
+def create_rule_router(
+    rule_service: RuleService,
+    evaluation_service: EvaluationService,
+    stream_max_line_bytes: int = 1024 * 1024,
+    max_blocking_threads: int = 40,
+    rule_set_service: Optional[RuleSetService] = None
+) -> APIRouter:
+    """Create and configure the API router.
+
+    Service calls block (file reads, writer locks, CPU-bound evaluation), so
+    handlers run them in worker threads, at most `max_blocking_threads` at
+    a time, and the event loop stays free for other requests.
+    """
 
     router = APIRouter(prefix="/api/v1", tags=["rules"])
+    limiter = anyio.CapacityLimiter(max_blocking_threads)
+
+    async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=limiter)
 
     @router.get(
         "/rules",
@@ -197,7 +451,7 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
     )
     async def list_rules():
         """List all rules."""
-        rules = rule_service.get_all_rules()
+        rules = await run_blocking(rule_service.get_all_rules)
         return [RuleResponse(**rule.to_dict()) for rule in rules]
 
     @router.get(
@@ -209,7 +463,7 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
     async def get_rule(rule_id: UUID):
         """Get a specific rule."""
         try:
-            rule = rule_service.get_rule(rule_id)
+            rule = await run_blocking(rule_service.get_rule, rule_id)
             return RuleResponse(**rule.to_dict())
         except RuleNotFoundException as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -264,7 +518,8 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
             if request.predicates:
                 predicates_dict = [p.model_dump() for p in request.predicates]
 
-            rule = rule_service.create_rule(
+            rule = await run_blocking(
+                rule_service.create_rule,
                 name=request.name,
                 description=request.description,
                 predicates=predicates_dict,
@@ -304,7 +559,8 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
             if request.predicates:
                 predicates_dict = [p.model_dump() for p in request.predicates]
 
-            rule = rule_service.update_rule(
+            rule = await run_blocking(
+                rule_service.update_rule,
                 rule_id=rule_id,
                 name=request.name,
                 description=request.description,
@@ -329,7 +585,7 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
     async def delete_rule(rule_id: UUID):
         """Delete a rule."""
         try:
-            rule_service.delete_rule(rule_id)
+            await run_blocking(rule_service.delete_rule, rule_id)
         except RuleNotFoundException as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
 
@@ -337,13 +593,23 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
         "/evaluate",
         response_model=EvaluateResponse,
         summary="Evaluate a payload against rules",
-        description="Evaluate a JSON payload against one or more rules and get PASS/FAIL result with detailed reasoning"
+        description=(
+            "Evaluate a JSON payload against one or more rules and get PASS/FAIL result with detailed reasoning. "
+            "Set explain=false to skip per-comparison details and short-circuit AND/OR"
+        )
     )
     async def evaluate(request: EvaluateRequest):
         """Evaluate a payload against specified rules."""
         try:
-            result = evaluation_service.evaluate(request.payload, request.rule_ids)
-            return EvaluateResponse(**result.to_dict())
+            result = await run_blocking(
+                evaluation_service.evaluate,
+                request.payload,
+                request.rule_ids,
+                explain=request.explain,
+                stop_on_first_fail=request.stop_on_first_fail
+            )
+            # Serialized straight from the domain result; response_model only documents the schema
+            return JSONCodecResponse(result.to_dict())
         except RuleNotFoundException as e:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
         except EvaluationException as e:
@@ -351,5 +617,206 @@ def create_rule_router(rule_service: RuleService, evaluation_service: Evaluation
         except DomainException as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    @router.post(
+        "/evaluate/all",
+        response_model=EvaluateAllResponse,
+        summary="Evaluate a payload against all applicable rules",
+        description=(
+            "Evaluate a JSON payload against every rule in the rule base that can apply to it. "
+            "Rules whose required fields are absent, or whose top-level equality/IN guards do not match, "
+            "are skipped without being evaluated"
+        )
+    )
+    async def evaluate_all(request: EvaluateAllRequest):
+        """Evaluate a payload against all applicable rules."""
+        try:
+            result = await run_blocking(evaluation_service.evaluate_all, request.payload, explain=request.explain)
+            return JSONCodecResponse(result.to_dict())
+        except EvaluationException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except DomainException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.post(
+        "/evaluate/batch",
+        response_model=BatchEvaluateResponse,
+        summary="Evaluate many payloads against rules",
+        description=(
+            "Evaluate an array of JSON payloads against the same rules in one request. "
+            "Rules are resolved and compiled once for the whole batch"
+        )
+    )
+    async def evaluate_batch(request: BatchEvaluateRequest):
+        """Evaluate a batch of payloads against specified rules."""
+        try:
+            result = await run_blocking(
+                evaluation_service.evaluate_batch,
+                request.payloads,
+                request.rule_ids,
+                explain=request.explain,
+                explain_indices=request.explain_indices
+            )
+            # Large batches take a while to encode too
+            return await run_blocking(lambda: JSONCodecResponse(result.to_dict()))
+        except RuleNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except EvaluationException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except DomainException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.post(
+        "/evaluate/stream",
+        response_class=NDJSONStreamingResponse,
+        summary="Evaluate a stream of payloads against rules",
+        description=(
+            "Evaluate newline-delimited JSON payloads from the request body against the same rules. "
+            "Results are streamed back as NDJSON, one line per payload with its zero-based index, "
+            "as soon as they are produced"
+        ),
+        responses={
+            200: {
+                "description": "One JSON object per line",
+                "content": {
+                    "application/x-ndjson": {
+                        "example": '{"index": 0, "result": "PASS", "reasons": ["..."], "details": [...]}'
+                    }
+                }
+            }
+        }
+    )
+    async def evaluate_stream(
+        request: Request,
+        rule_ids: List[str] = Query(..., description="Rule IDs to evaluate every payload against"),
+        explain: bool = Query(False, description="Include per-comparison details for every payload")
+    ):
+        """Evaluate an NDJSON stream of payloads against specified rules."""
+        try:
+            evaluate_payload = await run_blocking(evaluation_service.prepare, rule_ids, explain=explain)
+        except RuleNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except EvaluationException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        except DomainException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        return NDJSONStreamingResponse(
+            _stream_ndjson_results(request, evaluate_payload, stream_max_line_bytes, run_blocking)
+        )
+
+    if rule_set_service is not None:
+        _add_rule_set_routes(router, rule_set_service, run_blocking)
+
     return router
 
+
+def _add_rule_set_routes(router: APIRouter, rule_set_service: RuleSetService, run_blocking: RunBlocking) -> None:
+    """Register the rule set management and evaluation endpoints."""
+
+    @router.get(
+        "/rulesets",
+        response_model=List[RuleSetResponse],
+        summary="List all rule sets",
+        description="Retrieve all rule sets"
+    )
+    async def list_rule_sets():
+        """List all rule sets."""
+        rule_sets = await run_blocking(rule_set_service.get_all_rule_sets)
+        return [RuleSetResponse(**rule_set.to_dict()) for rule_set in rule_sets]
+
+    @router.get(
+        "/rulesets/{rule_set_id}",
+        response_model=RuleSetResponse,
+        summary="Get a rule set by ID",
+        description="Retrieve a specific rule set by its UUID"
+    )
+    async def get_rule_set(rule_set_id: UUID):
+        """Get a specific rule set."""
+        try:
+            rule_set = await run_blocking(rule_set_service.get_rule_set, rule_set_id)
+            return RuleSetResponse(**rule_set.to_dict())
+        except RuleSetNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    @router.post(
+        "/rulesets",
+        response_model=RuleSetResponse,
+        status_code=status.HTTP_201_CREATED,
+        summary="Create a new rule set",
+        description="Create a named set of existing rules that are evaluated together"
+    )
+    async def create_rule_set(request: RuleSetCreateRequest):
+        """Create a new rule set."""
+        try:
+            rule_set = await run_blocking(
+                rule_set_service.create_rule_set,
+                name=request.name,
+                description=request.description,
+                rule_ids=request.rule_ids
+            )
+            return RuleSetResponse(**rule_set.to_dict())
+        except RuleNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except DomainException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.put(
+        "/rulesets/{rule_set_id}",
+        response_model=RuleSetResponse,
+        summary="Update a rule set",
+        description="Update an existing rule set by its UUID"
+    )
+    async def update_rule_set(rule_set_id: UUID, request: RuleSetUpdateRequest):
+        """Update an existing rule set."""
+        try:
+            rule_set = await run_blocking(
+                rule_set_service.update_rule_set,
+                rule_set_id=rule_set_id,
+                name=request.name,
+                description=request.description,
+                rule_ids=request.rule_ids
+            )
+            return RuleSetResponse(**rule_set.to_dict())
+        except (RuleSetNotFoundException, RuleNotFoundException) as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except DomainException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    @router.delete(
+        "/rulesets/{rule_set_id}",
+        status_code=status.HTTP_204_NO_CONTENT,
+        summary="Delete a rule set",
+        description="Delete a rule set by its UUID. Its rules are kept"
+    )
+    async def delete_rule_set(rule_set_id: UUID):
+        """Delete a rule set."""
+        try:
+            await run_blocking(rule_set_service.delete_rule_set, rule_set_id)
+        except RuleSetNotFoundException as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    @router.post(
+        "/rulesets/{rule_set_id}/evaluate",
+        response_model=EvaluateResponse,
+        summary="Evaluate a payload against a rule set",
+        description=(
+            "Evaluate a JSON payload against every rule of a rule set, in the set's order. "
+            "The set's rules are resolved and compiled ahead of time and only re-prepared after a rule changes"
+        )
+    )
+    async def evaluate_rule_set(rule_set_id: UUID, request: RuleSetEvaluateRequest):
+        """Evaluate a payload against a rule set."""
+        try:
+            result = await run_blocking(
+                rule_set_service.evaluate,
+                rule_set_id,
+                request.payload,
+                explain=request.explain,
+                stop_on_first_fail=request.stop_on_first_fail
+            )
+            return JSONCodecResponse(result.to_dict())
+        except (RuleSetNotFoundException, RuleNotFoundException) as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except DomainException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
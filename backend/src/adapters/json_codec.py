@@ -0,0 +1,68 @@
+"""JSON encoding and decoding shared by the adapters.
+
+Uses orjson when it is installed and the standard library otherwise. Both
+paths produce the same Python values and equivalent JSON:
+
+- orjson only represents integers from -2**63 to 2**64 - 1. Others would
+  be read back as floats, so a document containing a run of 20 or more
+  digits, or a minus sign followed by 19, is decoded with the standard
+  library, and values orjson cannot encode fall back to it as well.
+- Output is UTF-8 (no \\u escapes) in both cases.
+"""
+
+import json
+from typing import Any, Union
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+ORJSON_AVAILABLE = orjson is not None
+
+# Maps every digit to "0", so a run of 20 digits, or of 19 after a minus
+# sign (an integer that may not fit in 64 bits), becomes a substring search
+_DIGITS_TO_ZERO = bytes.maketrans(b"123456789", b"000000000")
+_LONG_DIGITS = b"0" * 20
+_LONG_NEGATIVE_DIGITS = b"-" + b"0" * 19
+
+
+def dumps(value: Any, indent: bool = False) -> bytes:
+    """Encode a value as UTF-8 JSON, indented by two spaces if `indent` is set."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(value, option=option)
+        except TypeError:
+            # Integers beyond 64 bits or types only the standard library handles
+            pass
+    if indent:
+        return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        raw = data.encode("utf-8") if isinstance(data, str) else data
+        digits = raw.translate(_DIGITS_TO_ZERO)
+        if _LONG_DIGITS not in digits and _LONG_NEGATIVE_DIGITS not in digits:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # NaN/Infinity literals are accepted by the standard library only
+                pass
+    return json.loads(data)
+
+
+class JSONCodecResponse(JSONResponse):
+    """JSON response rendered with the shared codec."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,82 @@
+"""Locked, atomic writes of the JSON files behind the file-based repositories."""
+
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+# (st_mtime_ns, st_size, st_ino) of a file (and of any other file the stored
+# data is read from), used to detect external changes
+FileSignature = Tuple[int, ...]
+
+
+def file_signature(path: Path) -> Optional[FileSignature]:
+    """Return the current signature of a file, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+@contextmanager
+def write_locked(lock: threading.Lock, lock_path: Path) -> Iterator[None]:
+    """Hold the writer lock of this process and, where fcntl exists, an exclusive lock on `lock_path`.
+
+    The lock file serializes writers across processes sharing the data
+    file, so read-modify-write cycles never lose each other's writes.
+    """
+    with lock:
+        if fcntl is None:
+            yield
+            return
+        with open(lock_path, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Atomically replace a file with `data`.
+
+    The data is written to a temp file in the same directory, which is
+    fsynced and then renamed over the file. A crash leaves either the old
+    or the new file in place, never a truncated one.
+    """
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    fsync_directory(path.parent)
+
+
+def fsync_directory(path: Path) -> None:
+    """Persist a rename in the directory, where the platform supports it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
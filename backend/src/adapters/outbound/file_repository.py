@@ -1,90 +1,244 @@
 """File-based repository implementation for rule persistence."""
 
-import json
+import itertools
 import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import UUID
 
+from adapters import json_codec
+from adapters.outbound.atomic_json_file import FileSignature, atomic_write, file_signature, write_locked
+from adapters.outbound.file_watcher import FileWatcher
 from application.ports import RuleRepository
 from domain.models import Rule
 
 
 class FileRuleRepository(RuleRepository):
-    """Repository that persists rules to a JSON file."""
-
-    def __init__(self, file_path: str):
+    """Repository that persists rules to a JSON file.
+
+    Rules are kept in memory as a dict keyed by rule id. The file is only
+    re-read when its mtime, size or inode changes, so lookups on the
+    evaluation path are O(1) and do not touch the disk.
+
+    The file is replaced atomically on every write (temp file, fsync,
+    os.replace), so readers in this or any other process always see either
+    the old or the new rule base, never a partial one. Reads therefore take
+    no lock and run in parallel on the current copy-on-write index; the
+    writer lock only serializes read-modify-write cycles of writers. When
+    the file changed on disk, a single reader reloads it while concurrent
+    readers keep using the index they already have.
+
+    Writers also take an exclusive fcntl lock on `<rules file>.lock`, so
+    several worker processes sharing the file never lose each other's
+    writes. By default every read stats the file to notice such writes;
+    after `start_watching` a background thread polls instead, reads are
+    served from memory without any system call, and changes made by other
+    processes show up within one polling interval.
+
+    The file is indented for readability unless `compact_json` is set,
+    which makes it smaller and faster to write and parse.
+    """
+
+    def __init__(self, file_path: str, compact_json: bool = False):
         self.file_path = Path(file_path)
+        self.compact_json = compact_json
+        self.lock_path = self.file_path.with_name(f"{self.file_path.name}.lock")
+        # Serializes writers of this process; the lock file serializes processes
         self._lock = threading.Lock()
+        # Held by the one thread reloading the file after an external change
+        self._reload_lock = threading.Lock()
+        # Held while swapping in a new index
+        self._publish_lock = threading.Lock()
+        self._versions = itertools.count(1)
+        # Published as a single (signature, rules, version) tuple so readers never see a torn index
+        self._index: Tuple[Optional[FileSignature], Dict[UUID, Rule], int] = (None, {}, 0)
+        self._watcher: Optional[FileWatcher] = None
         self._ensure_file_exists()
 
+    @property
+    def version(self) -> int:
+        """Number that changes every time the in-memory index changes.
+
+        Reading it picks up changes made to the file on disk first.
+        """
+        self._load_index()
+        return self._index[2]
+
     def _ensure_file_exists(self) -> None:
         """Ensure the rules file exists, create with empty list if not."""
         if not self.file_path.exists():
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            self._write_rules([])
+            with self._write_lock():
+                # Another process may have created it while we waited
+                if not self.file_path.exists():
+                    self._write_rules({})
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Hold the writer lock of this process and, where fcntl exists, of every process."""
+        with write_locked(self._lock, self.lock_path):
+            yield
+
+    def start_watching(self, interval: float = 1.0, on_change: Optional[Callable[[], None]] = None) -> FileWatcher:
+        """Poll the file for changes in a background thread instead of on every read.
+
+        `on_change` is called from the watcher thread after a change made
+        by another process has been loaded.
+        """
+        if self._watcher is not None:
+            return self._watcher
+        watcher = FileWatcher(self.refresh, interval)
+        if on_change is not None:
+            watcher.add_listener(on_change)
+        self._load_index(wait=True)
+        self._watcher = watcher
+        watcher.start()
+        return watcher
+
+    def stop_watching(self) -> None:
+        """Stop the watcher thread; reads check the file themselves again."""
+        watcher, self._watcher = self._watcher, None
+        if watcher is not None:
+            watcher.stop()
+
+    def refresh(self) -> bool:
+        """Reload the rules if the file changed on disk. Returns True if the index changed."""
+        version = self._index[2]
+        self._load_index(wait=True)
+        return self._index[2] != version
+
+    def _file_signature(self) -> Optional[FileSignature]:
+        """Return the current signature of the rules file, or None if it is missing."""
+        return file_signature(self.file_path)
+
+    def _load_index(self, wait: bool = False) -> Dict[UUID, Rule]:
+        """Return the in-memory rule index, reloading it if the file changed on disk.
+
+        If another thread is already reloading, the current index is
+        returned instead of parsing the same file again, unless `wait` is
+        set (writers need the latest rules) or nothing has been loaded yet.
+        While a watcher is running, only `wait` calls check the file.
+        """
+        signature, rules, _ = self._index
+        if signature is not None and (
+            (not wait and self._watcher is not None) or signature == self._file_signature()
+        ):
+            return rules
+
+        if not self._reload_lock.acquire(blocking=wait or signature is None):
+            return rules
+        try:
+            # Re-check: the reload we waited for may already be up to date
+            signature, rules, version = self._index
+            current_signature = self._file_signature()
+            if signature is None or signature != current_signature:
+                rules, current_signature = self._read_consistent(current_signature)
+                if not self._publish(current_signature, rules, expected_version=version):
+                    # A writer of this process published newer rules while the file was read
+                    rules = self._index[1]
+            return rules
+        finally:
+            self._reload_lock.release()
+
+    def _read_consistent(self, signature: Optional[FileSignature]) -> Tuple[Dict[UUID, Rule], Optional[FileSignature]]:
+        """Read the rules and return them with the signature they were read at.
+
+        Reads take no writer lock, so a writer may replace the files during
+        the read (a subclass may read several files one after the other).
+        If the signature changed across the read, the rules are read again.
+        """
+        while True:
+            rules = {rule.id: rule for rule in self._read_rules()}
+            read_signature, signature = signature, self._file_signature()
+            if signature == read_signature:
+                return rules, signature
+
+    def _publish(
+        self,
+        signature: Optional[FileSignature],
+        rules: Dict[UUID, Rule],
+        expected_version: Optional[int] = None
+    ) -> bool:
+        """Swap in a new index under a new version.
+
+        Reloads pass the version of the index they started from and are
+        dropped if it changed meanwhile, so rules parsed from an older file
+        never replace rules a writer has published since. Returns True if
+        the index was replaced.
+        """
+        with self._publish_lock:
+            if expected_version is not None and self._index[2] != expected_version:
+                return False
+            self._index = (signature, rules, next(self._versions))
+            return True
 
     def _read_rules(self) -> List[Rule]:
         """Read rules from file."""
-        with self._lock:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return [Rule.from_dict(rule_data) for rule_data in data]
-
-    def _write_rules(self, rules: List[Rule]) -> None:
-        """Write rules to file."""
-        with self._lock:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                data = [rule.to_dict() for rule in rules]
-                json.dump(data, f, indent=2, ensure_ascii=False)
+        with open(self.file_path, 'rb') as f:
+            data = json_codec.loads(f.read())
+        return [Rule.from_dict(rule_data) for rule_data in data]
+
+    def _write_snapshot(self, rules: Dict[UUID, Rule]) -> None:
+        """Atomically replace the rules file with every rule.
+
+        A crash leaves either the old or the new file in place, never a
+        truncated one.
+        """
+        data = [rule.to_dict() for rule in rules.values()]
+        atomic_write(self.file_path, json_codec.dumps(data, indent=not self.compact_json))
+
+    def _write_rules(self, rules: Dict[UUID, Rule]) -> None:
+        """Write rules to file and publish them as the new index. Caller must hold the lock."""
+        self._write_snapshot(rules)
+        self._publish(self._file_signature(), rules)
 
     def get_all(self) -> List[Rule]:
         """Retrieve all rules."""
-        return self._read_rules()
+        return list(self._load_index().values())
 
     def get_by_id(self, rule_id: UUID) -> Optional[Rule]:
         """Retrieve a rule by its ID."""
-        rules = self._read_rules()
-        for rule in rules:
-            if rule.id == rule_id:
-                return rule
-        return None
+        return self._load_index().get(rule_id)
+
+    def get_many(self, rule_ids: Sequence[UUID]) -> Dict[UUID, Rule]:
+        """Retrieve several rules from a single read of the index."""
+        rules = self._load_index()
+        return {rule_id: rules[rule_id] for rule_id in rule_ids if rule_id in rules}
 
     def create(self, rule: Rule) -> Rule:
         """Create a new rule."""
-        rules = self._read_rules()
-        rules.append(rule)
-        self._write_rules(rules)
+        with self._write_lock():
+            # Copy-on-write so concurrent readers keep a consistent view
+            rules = dict(self._load_index(wait=True))
+            rules[rule.id] = rule
+            self._write_rules(rules)
         return rule
 
     def update(self, rule: Rule) -> Rule:
         """Update an existing rule."""
-        rules = self._read_rules()
-        updated = False
-
-        for i, existing_rule in enumerate(rules):
-            if existing_rule.id == rule.id:
-                rules[i] = rule
-                updated = True
-                break
-
-        if updated:
-            self._write_rules(rules)
+        with self._write_lock():
+            rules = self._load_index(wait=True)
+            if rule.id in rules:
+                rules = dict(rules)
+                rules[rule.id] = rule
+                self._write_rules(rules)
 
         return rule
 
     def delete(self, rule_id: UUID) -> bool:
         """Delete a rule by its ID."""
-        rules = self._read_rules()
-        initial_count = len(rules)
-        rules = [rule for rule in rules if rule.id != rule_id]
+        with self._write_lock():
+            rules = self._load_index(wait=True)
+            if rule_id not in rules:
+                return False
 
-        if len(rules) < initial_count:
+            rules = dict(rules)
+            del rules[rule_id]
             self._write_rules(rules)
             return True
-        return False
 
     def save_all(self, rules: List[Rule]) -> None:
         """Save all rules to storage."""
-        self._write_rules(rules)
-
+        with self._write_lock():
+            self._write_rules({rule.id: rule for rule in rules})
@@ -0,0 +1,63 @@
+"""Background polling of rule storage files for changes made by other processes."""
+
+import logging
+import threading
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """Calls `check` every `interval` seconds and notifies listeners when it reports a change.
+
+    Polling is used rather than inotify: inotify is not in the standard
+    library, is Linux-only and misses changes on network and some container
+    filesystems. A stat call per interval is cheap, and a change made by
+    another process is noticed within one interval.
+    """
+
+    def __init__(self, check: Callable[[], bool], interval: float = 1.0):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        self.check = check
+        self.interval = interval
+        self._listeners: List[Callable[[], None]] = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_listener(self, listener: Callable[[], None]) -> None:
+        """Register a function called (from the watcher thread) after every change."""
+        self._listeners.append(listener)
+
+    def poll(self) -> bool:
+        """Check once and notify the listeners if something changed."""
+        if not self.check():
+            return False
+        for listener in self._listeners:
+            try:
+                listener()
+            except Exception:
+                logger.exception("File change listener failed")
+        return True
+
+    def start(self) -> None:
+        """Start polling in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling and wait for the thread to exit."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                logger.exception("Polling for file changes failed")
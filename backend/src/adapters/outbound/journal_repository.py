@@ -0,0 +1,173 @@
+"""Log-structured repository: a JSON snapshot plus an append-only journal."""
+
+import logging
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional
+from uuid import UUID
+
+from adapters import json_codec
+from adapters.outbound.atomic_json_file import FileSignature
+from adapters.outbound.file_repository import FileRuleRepository
+from domain.models import Rule
+
+logger = logging.getLogger(__name__)
+
+
+class JournalRuleRepository(FileRuleRepository):
+    """Repository that appends every mutation to a journal instead of rewriting the rules file.
+
+    The rules file keeps the same format as FileRuleRepository and acts as a
+    snapshot. Each create, update or delete appends one JSON line to the
+    journal, so a single-rule write costs O(1) bytes regardless of the size
+    of the rule base. Loading reads the snapshot and replays the journal.
+
+    Once the journal holds `compact_threshold` records it is compacted: the
+    current rules are written as a new snapshot and the journal is emptied.
+    Replaying a record twice has no further effect, so a crash between the
+    two steps loses nothing. A reload that reads the old snapshot and then
+    the emptied journal sees the combined signature change and reads again.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        journal_path: Optional[str] = None,
+        compact_threshold: int = 1000,
+        compact_json: bool = False
+    ):
+        if compact_threshold < 1:
+            raise ValueError("compact_threshold must be at least 1")
+        self.journal_path = Path(journal_path or f"{file_path}.journal")
+        self.compact_threshold = compact_threshold
+        self._journal_records = 0
+        super().__init__(file_path, compact_json=compact_json)
+
+    def _file_signature(self) -> Optional[FileSignature]:
+        """Return the combined signature of the snapshot and the journal."""
+        snapshot = super()._file_signature()
+        if snapshot is None:
+            return None
+        try:
+            stat = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return snapshot
+        return snapshot + (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _read_rules(self) -> List[Rule]:
+        """Read the snapshot and replay the journal over it."""
+        rules = {rule.id: rule for rule in super()._read_rules()}
+        records = 0
+        try:
+            with open(self.journal_path, 'rb') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json_codec.loads(line)
+                    except ValueError:
+                        # Only a write interrupted by a crash leaves a partial line, and it is the last one
+                        logger.warning("Ignoring incomplete journal record in %s", self.journal_path)
+                        break
+                    self._apply(rules, record)
+                    records += 1
+        except FileNotFoundError:
+            pass
+        self._journal_records = records
+        return list(rules.values())
+
+    @staticmethod
+    def _apply(rules: Dict[UUID, Rule], record: Dict[str, Any]) -> None:
+        """Apply one journal record to a rules dict."""
+        if record["op"] == "put":
+            rule = Rule.from_dict(record["rule"])
+            rules[rule.id] = rule
+        elif record["op"] == "delete":
+            rules.pop(UUID(record["id"]), None)
+        else:
+            raise ValueError(f"Unknown journal operation: {record['op']}")
+
+    def _write_rules(self, rules: Dict[UUID, Rule]) -> None:
+        """Write a new snapshot, empty the journal and publish. Caller must hold the lock."""
+        self._write_snapshot(rules)
+        with open(self.journal_path, 'wb'):
+            pass
+        self._journal_records = 0
+        self._publish(self._file_signature(), rules)
+
+    def _append(self, record: Dict[str, Any], rules: Dict[UUID, Rule]) -> None:
+        """Append a record to the journal and publish the resulting rules. Caller must hold the lock."""
+        with open(self.journal_path, 'a+b') as f:
+            self._repair_tail(f)
+            f.write(json_codec.dumps(record) + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_records += 1
+
+        if self._journal_records >= self.compact_threshold:
+            self._write_rules(rules)
+        else:
+            self._publish(self._file_signature(), rules)
+
+    def _repair_tail(self, f: BinaryIO) -> None:
+        """Make the open journal end with a complete line. Caller must hold the lock.
+
+        A crash during an append can leave a partial last line. A record
+        appended straight after it would be merged into that line, and
+        loading stops at the first line that does not parse, so every
+        later record would be lost. A partial line is cut off; a complete
+        record that only misses its newline is kept and terminated.
+        """
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+
+        f.seek(0)
+        data = f.read()
+        start = data.rfind(b"\n") + 1
+        try:
+            json_codec.loads(data[start:])
+        except ValueError:
+            logger.warning("Discarding incomplete journal record in %s", self.journal_path)
+            f.truncate(start)
+        else:
+            f.write(b"\n")
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot now."""
+        with self._write_lock():
+            self._write_rules(self._load_index(wait=True))
+
+    def create(self, rule: Rule) -> Rule:
+        """Create a new rule."""
+        with self._write_lock():
+            rules = dict(self._load_index(wait=True))
+            rules[rule.id] = rule
+            self._append({"op": "put", "rule": rule.to_dict()}, rules)
+        return rule
+
+    def update(self, rule: Rule) -> Rule:
+        """Update an existing rule."""
+        with self._write_lock():
+            rules = self._load_index(wait=True)
+            if rule.id in rules:
+                rules = dict(rules)
+                rules[rule.id] = rule
+                self._append({"op": "put", "rule": rule.to_dict()}, rules)
+
+        return rule
+
+    def delete(self, rule_id: UUID) -> bool:
+        """Delete a rule by its ID."""
+        with self._write_lock():
+            rules = self._load_index(wait=True)
+            if rule_id not in rules:
+                return False
+
+            rules = dict(rules)
+            del rules[rule_id]
+            self._append({"op": "delete", "id": str(rule_id)}, rules)
+            return True
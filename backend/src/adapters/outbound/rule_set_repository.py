@@ -0,0 +1,102 @@
+"""File-based repository implementation for rule set persistence."""
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from adapters import json_codec
+from adapters.outbound.atomic_json_file import FileSignature, atomic_write, file_signature, write_locked
+from application.ports import RuleSetRepository
+from domain.models import RuleSet
+
+
+class FileRuleSetRepository(RuleSetRepository):
+    """Repository that persists rule sets to a JSON file.
+
+    Rule sets change rarely and are read on every rule set evaluation, so
+    they are kept in memory and the file is only re-read when its mtime,
+    size or inode changes. Writes replace the file atomically and take an
+    exclusive fcntl lock on `<file>.lock`, like FileRuleRepository.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = Path(file_path)
+        self.lock_path = self.file_path.with_name(f"{self.file_path.name}.lock")
+        self._lock = threading.Lock()
+        # Held while swapping in a new index
+        self._publish_lock = threading.Lock()
+        # Published as a single (signature, rule sets) tuple so readers never see a torn index
+        self._index: Tuple[Optional[FileSignature], Dict[UUID, RuleSet]] = (None, {})
+        if not self.file_path.exists():
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._write_lock():
+                if not self.file_path.exists():
+                    self._write_rule_sets({})
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Hold the writer lock of this process and, where fcntl exists, of every process."""
+        with write_locked(self._lock, self.lock_path):
+            yield
+
+    def _load_index(self) -> Dict[UUID, RuleSet]:
+        """Return the in-memory rule sets, reloading them if the file changed on disk."""
+        index = self._index
+        signature, rule_sets = index
+        current_signature = file_signature(self.file_path)
+        if signature is not None and signature == current_signature:
+            return rule_sets
+
+        with open(self.file_path, 'rb') as f:
+            data = json_codec.loads(f.read())
+        rule_sets = {rule_set.id: rule_set for rule_set in map(RuleSet.from_dict, data)}
+        with self._publish_lock:
+            if self._index is not index:
+                # A writer published newer rule sets while the file was read
+                return self._index[1]
+            self._index = (current_signature, rule_sets)
+        return rule_sets
+
+    def _write_rule_sets(self, rule_sets: Dict[UUID, RuleSet]) -> None:
+        """Atomically replace the file with every rule set. Caller must hold the lock."""
+        data = [rule_set.to_dict() for rule_set in rule_sets.values()]
+        atomic_write(self.file_path, json_codec.dumps(data, indent=True))
+        with self._publish_lock:
+            self._index = (file_signature(self.file_path), rule_sets)
+
+    def get_all(self) -> List[RuleSet]:
+        """Retrieve all rule sets."""
+        return list(self._load_index().values())
+
+    def get_by_id(self, rule_set_id: UUID) -> Optional[RuleSet]:
+        """Retrieve a rule set by its ID."""
+        return self._load_index().get(rule_set_id)
+
+    def create(self, rule_set: RuleSet) -> RuleSet:
+        """Create a new rule set."""
+        with self._write_lock():
+            rule_sets = dict(self._load_index())
+            rule_sets[rule_set.id] = rule_set
+            self._write_rule_sets(rule_sets)
+        return rule_set
+
+    def update(self, rule_set: RuleSet) -> RuleSet:
+        """Update an existing rule set."""
+        with self._write_lock():
+            rule_sets = dict(self._load_index())
+            if rule_set.id in rule_sets:
+                rule_sets[rule_set.id] = rule_set
+                self._write_rule_sets(rule_sets)
+        return rule_set
+
+    def delete(self, rule_set_id: UUID) -> bool:
+        """Delete a rule set by its ID."""
+        with self._write_lock():
+            rule_sets = dict(self._load_index())
+            if rule_set_id not in rule_sets:
+                return False
+            del rule_sets[rule_set_id]
+            self._write_rule_sets(rule_sets)
+        return True
@@ -0,0 +1,141 @@
+"""SQLite-backed repository implementation for rule persistence."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from uuid import UUID
+
+from adapters import json_codec
+from application.ports import RuleRepository
+from domain.models import Rule
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rules (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS rules_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO rules_meta (key, value) VALUES ('version', 0);
+CREATE TRIGGER IF NOT EXISTS rules_version_insert AFTER INSERT ON rules
+BEGIN
+    UPDATE rules_meta SET value = value + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS rules_version_update AFTER UPDATE ON rules
+BEGIN
+    UPDATE rules_meta SET value = value + 1 WHERE key = 'version';
+END;
+CREATE TRIGGER IF NOT EXISTS rules_version_delete AFTER DELETE ON rules
+BEGIN
+    UPDATE rules_meta SET value = value + 1 WHERE key = 'version';
+END;
+"""
+
+_SELECT_ALL = "SELECT data FROM rules ORDER BY rowid"
+_SELECT_ONE = "SELECT data FROM rules WHERE id = ?"
+_SELECT_MANY = "SELECT id, data FROM rules WHERE id IN ({})"
+# Stays below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds (999)
+_MAX_PARAMETERS = 500
+_SELECT_VERSION = "SELECT value FROM rules_meta WHERE key = 'version'"
+_UPSERT = "INSERT INTO rules (id, data) VALUES (?, ?) ON CONFLICT(id) DO UPDATE SET data = excluded.data"
+_UPDATE = "UPDATE rules SET data = ? WHERE id = ?"
+_DELETE = "DELETE FROM rules WHERE id = ?"
+_DELETE_ALL = "DELETE FROM rules"
+_INSERT = "INSERT INTO rules (id, data) VALUES (?, ?)"
+
+
+class SqliteRuleRepository(RuleRepository):
+    """Repository that persists rules in a SQLite database.
+
+    Each rule is one row keyed by its id (primary-key index), so lookups and
+    single-rule writes cost O(log n) regardless of the size of the rule base.
+    The database runs in WAL mode: readers never block the writer, and
+    several worker processes can share one database file safely.
+
+    Connections are per thread; sqlite3 caches the prepared form of every
+    statement on its connection.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def close(self) -> None:
+        """Close the calling thread's connection."""
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by triggers on every row change, including changes by other processes."""
+        return self._connection().execute(_SELECT_VERSION).fetchone()[0]
+
+    @staticmethod
+    def _encode(rule: Rule) -> str:
+        return json_codec.dumps(rule.to_dict()).decode('utf-8')
+
+    @staticmethod
+    def _decode(data: str) -> Rule:
+        return Rule.from_dict(json_codec.loads(data))
+
+    def get_all(self) -> List[Rule]:
+        """Retrieve all rules, in insertion order."""
+        return [self._decode(data) for (data,) in self._connection().execute(_SELECT_ALL)]
+
+    def get_by_id(self, rule_id: UUID) -> Optional[Rule]:
+        """Retrieve a rule by its ID."""
+        row = self._connection().execute(_SELECT_ONE, (str(rule_id),)).fetchone()
+        return self._decode(row[0]) if row else None
+
+    def get_many(self, rule_ids: Sequence[UUID]) -> Dict[UUID, Rule]:
+        """Retrieve several rules with one query per 500 IDs."""
+        keys = list(dict.fromkeys(str(rule_id) for rule_id in rule_ids))
+        connection = self._connection()
+        rules = {}
+        for start in range(0, len(keys), _MAX_PARAMETERS):
+            chunk = keys[start:start + _MAX_PARAMETERS]
+            query = _SELECT_MANY.format(", ".join("?" * len(chunk)))
+            for rule_id, data in connection.execute(query, chunk):
+                rules[UUID(rule_id)] = self._decode(data)
+        return rules
+
+    def create(self, rule: Rule) -> Rule:
+        """Create a new rule."""
+        with self._connection() as connection:
+            connection.execute(_UPSERT, (str(rule.id), self._encode(rule)))
+        return rule
+
+    def update(self, rule: Rule) -> Rule:
+        """Update an existing rule."""
+        with self._connection() as connection:
+            connection.execute(_UPDATE, (self._encode(rule), str(rule.id)))
+        return rule
+
+    def delete(self, rule_id: UUID) -> bool:
+        """Delete a rule by its ID."""
+        with self._connection() as connection:
+            return connection.execute(_DELETE, (str(rule_id),)).rowcount > 0
+
+    def save_all(self, rules: List[Rule]) -> None:
+        """Replace every stored rule in a single transaction."""
+        with self._connection() as connection:
+            connection.execute(_DELETE_ALL)
+            connection.executemany(_INSERT, [(str(rule.id), self._encode(rule)) for rule in rules])
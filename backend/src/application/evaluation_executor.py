@@ -0,0 +1,110 @@
+"""Executor spreading evaluation work over worker processes."""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("serial", "process")
+
+
+class EvaluationExecutor:
+    """Runs independent chunks of evaluation work on a pool of workers.
+
+    - "serial" runs everything in the calling thread.
+    - "process" uses a pool of worker processes, started with "spawn" so
+      they do not inherit the server's threads and locks. Tasks must be
+      module-level functions with picklable arguments.
+
+    There is no thread pool: evaluation is pure Python and holds the GIL,
+    so threads gave no speedup on a regular CPython build.
+
+    The pool is started on first use. Work is only split when its
+    estimated cost (in the relative units of CompiledRule.cost) leaves at
+    least `min_chunk_cost` per chunk, and when the work a split saves
+    exceeds the estimated cost of copying the results back, which the
+    calling process does serially. Measured on CPython 3.11, a unit costs
+    about 0.6 us verdict-only (0.35 us per weighted unit explained) and a
+    task's round trip to a worker about 0.15 ms. The default of 5000
+    units (about 3 ms verdict-only) keeps that round trip under 5% of a
+    chunk. Unpickling results costs about 60% as much as computing them,
+    which limits the speedup of large batches to roughly 1.6x.
+    """
+
+    def __init__(self, kind: str = "serial", max_workers: Optional[int] = None, min_chunk_cost: float = 5000.0):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown executor kind: {kind} (expected one of {', '.join(EXECUTOR_KINDS)})")
+        if min_chunk_cost <= 0:
+            raise ValueError("min_chunk_cost must be positive")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_chunk_cost = min_chunk_cost
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def chunk_count(self, cost: float, transfer_cost: float = 0.0) -> int:
+        """Return how many chunks work of the given estimated cost should be split into; 1 means serial.
+
+        `transfer_cost` estimates copying the results back from the
+        workers; work is kept serial unless splitting saves more than that.
+        """
+        if self.kind == "serial" or self.max_workers < 2:
+            return 1
+        chunks = max(1, min(self.max_workers, int(cost // self.min_chunk_cost)))
+        if chunks > 1 and cost - cost / chunks <= transfer_cost:
+            return 1
+        return chunks
+
+    def map(self, func: Callable[..., Any], tasks: Sequence[Tuple[Any, ...]]) -> List[Any]:
+        """Run `func(*task)` for every task on the pool and return the results in task order.
+
+        If the process pool breaks (a worker was killed), the tasks run
+        serially instead and a new pool is started next time.
+        """
+        pool = self._get_pool()
+        try:
+            futures = [pool.submit(func, *task) for task in tasks]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            logger.warning("Evaluation worker pool broke; evaluating serially")
+            with self._lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False)
+            return [func(*task) for task in tasks]
+
+    def shutdown(self) -> None:
+        """Stop the workers, if any were started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        pool = self._pool
+        if pool is not None:
+            return pool
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+
+def split(items: Sequence[Any], chunks: int) -> List[Sequence[Any]]:
+    """Split items into at most `chunks` contiguous slices of nearly equal size."""
+    chunks = max(1, min(chunks, len(items)))
+    size, extra = divmod(len(items), chunks)
+    slices = []
+    start = 0
+    for i in range(chunks):
+        end = start + size + (1 if i < extra else 0)
+        slices.append(items[start:end])
+        start = end
+    return slices
@@ -0,0 +1,83 @@
+"""Precompiled evaluation plans for rule sets."""
+
+from typing import Callable, List, Sequence, Tuple
+from uuid import UUID
+
+from application.rule_snapshot import RuleSnapshot
+from domain.compiled_rule import CompiledRule
+from domain.exceptions import RulesNotFoundException
+from domain.models import Rule
+from domain.rule_network import RuleNetwork
+
+
+class EvaluationPlan:
+    """Everything needed to evaluate a rule set, prepared against one snapshot.
+
+    Holds the member rules resolved and compiled in the rule set's order
+    (the execution list) and the shared-predicate network that deduplicates
+    their comparisons. Evaluating a payload against a plan needs no
+    lookups, parsing or compilation. A plan stays current across newer
+    snapshots as long as none of its member rules changed (see
+    `is_current`), so editing a member rule takes effect on the next
+    evaluation while edits to other rules leave the plan alone.
+    """
+
+    def __init__(
+        self,
+        rule_ids: Sequence[UUID],
+        snapshot_version: int,
+        compiled_rules: Sequence[Tuple[Rule, CompiledRule]],
+        network: RuleNetwork
+    ):
+        self.rule_ids: Tuple[UUID, ...] = tuple(rule_ids)
+        self.snapshot_version = snapshot_version
+        self.compiled_rules: List[Tuple[Rule, CompiledRule]] = list(compiled_rules)
+        self.network = network
+
+    @classmethod
+    def build(
+        cls,
+        snapshot: RuleSnapshot,
+        rule_ids: Sequence[UUID],
+        network: Callable[[List[Tuple[Rule, CompiledRule]]], RuleNetwork]
+    ) -> "EvaluationPlan":
+        """Resolve the rules from a snapshot and build their network with `network`.
+
+        Raises:
+            EvaluationException: If one of the rules is stored but cannot be compiled
+            RulesNotFoundException: If any of the rules is not in the snapshot, listing every missing ID
+        """
+        compiled_rules = []
+        missing = []
+        for rule_id in rule_ids:
+            snapshot.check_valid(rule_id)
+            entry = snapshot.get(rule_id)
+            if entry is None:
+                missing.append(str(rule_id))
+            else:
+                compiled_rules.append(entry)
+        if missing:
+            raise RulesNotFoundException(missing)
+        return cls(rule_ids, snapshot.version, compiled_rules, network(compiled_rules))
+
+    def is_current(self, snapshot: RuleSnapshot, rule_ids: Sequence[UUID]) -> bool:
+        """Return True if the plan still reflects these rule IDs as of the given snapshot.
+
+        Only the member rules are compared: each must still be in the
+        snapshot with the same definition and compiled fingerprint.
+        """
+        if self.rule_ids != tuple(rule_ids):
+            return False
+        if self.snapshot_version == snapshot.version:
+            return True
+        for rule_id, member in zip(self.rule_ids, self.compiled_rules):
+            entry = snapshot.get(rule_id)
+            if entry is not member and (
+                entry is None or entry[1].fingerprint != member[1].fingerprint or entry[0] != member[0]
+            ):
+                return False
+        return True
+
+    def at_version(self, snapshot_version: int) -> "EvaluationPlan":
+        """Return this plan, reporting a newer snapshot in which its rules are unchanged."""
+        return EvaluationPlan(self.rule_ids, snapshot_version, self.compiled_rules, self.network)
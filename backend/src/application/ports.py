@@ -1,15 +1,25 @@
 """Port interfaces defining contracts for external dependencies."""
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 from uuid import UUID
 
-from domain.models import Rule
+from domain.models import Rule, RuleSet
 
 
 class RuleRepository(ABC):
     """Port interface for rule persistence."""
 
+    @property
+    def version(self) -> Optional[int]:
+        """Counter that changes whenever the stored rules change, or None if not tracked.
+
+        Lets callers cache data derived from the whole rule base. It must
+        increase by exactly one for a write that changes one rule, so a
+        caller can tell its own write from a concurrent one.
+        """
+        return None
+
     @abstractmethod
     def get_all(self) -> List[Rule]:
         """Retrieve all rules."""
@@ -20,6 +30,18 @@ class RuleRepository(ABC):
         """Retrieve a rule by its ID."""
         pass
 
+    def get_many(self, rule_ids: Sequence[UUID]) -> Dict[UUID, Rule]:
+        """Retrieve several rules in one access. IDs that do not exist are absent from the result.
+
+        Adapters should override this; the default looks each rule up separately.
+        """
+        rules = {}
+        for rule_id in rule_ids:
+            rule = self.get_by_id(rule_id)
+            if rule is not None:
+                rules[rule_id] = rule
+        return rules
+
     @abstractmethod
     def create(self, rule: Rule) -> Rule:
         """Create a new rule."""
@@ -40,3 +62,31 @@ class RuleRepository(ABC):
         """Save all rules to storage."""
         pass
 
+
+class RuleSetRepository(ABC):
+    """Port interface for rule set persistence."""
+
+    @abstractmethod
+    def get_all(self) -> List[RuleSet]:
+        """Retrieve all rule sets."""
+        pass
+
+    @abstractmethod
+    def get_by_id(self, rule_set_id: UUID) -> Optional[RuleSet]:
+        """Retrieve a rule set by its ID."""
+        pass
+
+    @abstractmethod
+    def create(self, rule_set: RuleSet) -> RuleSet:
+        """Create a new rule set."""
+        pass
+
+    @abstractmethod
+    def update(self, rule_set: RuleSet) -> RuleSet:
+        """Update an existing rule set."""
+        pass
+
+    @abstractmethod
+    def delete(self, rule_set_id: UUID) -> bool:
+        """Delete a rule set by its ID. Returns True if deleted, False if not found."""
+        pass
@@ -0,0 +1,114 @@
+"""Cache of compiled rules shared by the application services."""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Sequence, Tuple
+from uuid import UUID
+
+from domain.compiled_rule import CompiledRule, compile_rule, rule_fingerprint
+from domain.models import Rule
+from domain.predicate_order import PredicateStatistics
+from domain.rule_network import RuleNetwork
+
+
+class CompiledRuleCache:
+    """LRU cache of compiled rules keyed by rule id and content hash.
+
+    An entry is only reused if its fingerprint matches the rule being
+    evaluated, so a rule edited outside of RuleService (e.g. directly in
+    the rules file) is recompiled on its next lookup.
+
+    It also keeps the shared-predicate networks built for the rule
+    combinations most recently evaluated together, the comparison
+    statistics those networks order their operands by, and how often each
+    rule passed when evaluated with stop_on_first_fail.
+    """
+
+    def __init__(self, max_size: int = 10000, max_networks: int = 256):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if max_networks < 1:
+            raise ValueError("max_networks must be at least 1")
+        self.max_size = max_size
+        self.max_networks = max_networks
+        self._entries: "OrderedDict[UUID, CompiledRule]" = OrderedDict()
+        self._networks: "OrderedDict[Tuple[Hashable, ...], RuleNetwork]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.statistics = PredicateStatistics()
+        # Keyed by (rule id, fingerprint), so an edited rule starts over
+        self.rule_statistics = PredicateStatistics()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, rule: Rule) -> CompiledRule:
+        """Return the compiled form of a rule, compiling it on a miss."""
+        fingerprint = rule_fingerprint(rule)
+        with self._lock:
+            compiled = self._entries.get(rule.id)
+            if compiled is not None and compiled.fingerprint == fingerprint:
+                self._entries.move_to_end(rule.id)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        return self.put(rule)
+
+    def put(self, rule: Rule) -> CompiledRule:
+        """Compile a rule and store it, replacing any previous entry."""
+        compiled = compile_rule(rule)
+        with self._lock:
+            self._entries[rule.id] = compiled
+            self._entries.move_to_end(rule.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def network(self, compiled_rules: Sequence[CompiledRule]) -> RuleNetwork:
+        """Return the shared-predicate network for a combination of compiled rules.
+
+        Networks are keyed by each rule's id and fingerprint, so editing a
+        rule simply stops its old networks from being looked up; they age
+        out of the LRU.
+        """
+        key = tuple((compiled.rule_id, compiled.fingerprint) for compiled in compiled_rules)
+        with self._lock:
+            network = self._networks.get(key)
+            if network is not None:
+                self._networks.move_to_end(key)
+                return network
+
+        network = RuleNetwork(compiled_rules, self.statistics)
+        with self._lock:
+            self._networks[key] = network
+            while len(self._networks) > self.max_networks:
+                self._networks.popitem(last=False)
+        return network
+
+    def invalidate(self, rule_id: UUID) -> None:
+        """Drop the compiled form of a rule, if cached."""
+        with self._lock:
+            if self._entries.pop(rule_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop every cached entry."""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._networks.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "networks": len(self._networks)
+            }
@@ -0,0 +1,250 @@
+"""Immutable, versioned snapshots of the rule base."""
+
+import itertools
+import logging
+import threading
+from functools import cached_property
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from application.ports import RuleRepository
+from application.rule_cache import CompiledRuleCache
+from domain.compiled_rule import CompiledRule, rule_fingerprint
+from domain.exceptions import EvaluationException, RulesNotFoundException
+from domain.models import Rule
+from domain.predicate_order import PredicateStatistics
+from domain.rule_index import RuleIndex
+from domain.rule_network import RuleNetwork
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def parse_rule_ids(rule_ids: List[str]) -> List[UUID]:
+    """Parse the string rule IDs of an evaluation request.
+
+    Raises:
+        EvaluationException: If no IDs are given or an ID is not a valid UUID
+    """
+    if not rule_ids:
+        raise EvaluationException("At least one rule_id must be provided")
+
+    parsed = []
+    for rule_id_str in rule_ids:
+        try:
+            parsed.append(UUID(rule_id_str))
+        except ValueError:
+            raise EvaluationException(f"Invalid UUID format: {rule_id_str}")
+    return parsed
+
+
+class RuleSnapshot:
+    """Every stored rule with its compiled form, as of one version.
+
+    A snapshot is never modified once published; a change to the rules
+    produces a new snapshot. Evaluation takes the current snapshot once per
+    request, so every rule it looks up comes from the same version without
+    any locking.
+
+    Stored rules that fail to compile (e.g. a hand-edited rules file) are
+    kept out of the compiled rules, the index and the network, and listed
+    in `invalid` with their error; only requests for them fail.
+    """
+
+    def __init__(
+        self,
+        version: int,
+        source_version: Optional[int],
+        compiled_rules: Sequence[Tuple[Rule, CompiledRule]],
+        statistics: Optional[PredicateStatistics] = None,
+        invalid: Optional[Dict[UUID, str]] = None
+    ):
+        # Version reported to clients; increases with every published snapshot
+        self.version = version
+        # Repository version the snapshot was built from (None if unknown)
+        self.source_version = source_version
+        self.compiled_rules: Tuple[Tuple[Rule, CompiledRule], ...] = tuple(compiled_rules)
+        self._positions: Dict[UUID, int] = {rule.id: i for i, (rule, _) in enumerate(self.compiled_rules)}
+        # Comparison statistics the network orders its operands by
+        self.statistics = statistics
+        # Rule id -> compilation error of stored rules that cannot be evaluated
+        self.invalid: Dict[UUID, str] = dict(invalid or {})
+
+    def __len__(self) -> int:
+        return len(self.compiled_rules)
+
+    def check_valid(self, rule_id: UUID) -> None:
+        """Raise if the rule is stored but could not be compiled.
+
+        Raises:
+            EvaluationException: If the rule's stored definition is invalid
+        """
+        error = self.invalid.get(rule_id)
+        if error is not None:
+            raise EvaluationException(f"Rule with id '{rule_id}' cannot be evaluated: {error}")
+
+    def get(self, rule_id: UUID) -> Optional[Tuple[Rule, CompiledRule]]:
+        """Return a rule and its compiled form, or None if the snapshot does not contain it."""
+        position = self._positions.get(rule_id)
+        return None if position is None else self.compiled_rules[position]
+
+    def resolve(self, rule_ids: List[str]) -> List[Tuple[Rule, CompiledRule]]:
+        """Look up rules by their string IDs.
+
+        Raises:
+            EvaluationException: If no IDs are given, an ID is not a valid UUID or
+                a requested rule's stored definition cannot be compiled
+            RulesNotFoundException: If any of the rules does not exist, listing every missing ID
+        """
+        compiled_rules = []
+        missing = []
+        for rule_id_str, rule_id in zip(rule_ids, parse_rule_ids(rule_ids)):
+            self.check_valid(rule_id)
+            entry = self.get(rule_id)
+            if entry is None:
+                missing.append(rule_id_str)
+            else:
+                compiled_rules.append(entry)
+
+        if missing:
+            raise RulesNotFoundException(missing)
+        return compiled_rules
+
+    @cached_property
+    def index(self) -> RuleIndex:
+        """Inverted index over every rule, built on first use."""
+        return RuleIndex([compiled for _, compiled in self.compiled_rules])
+
+    @cached_property
+    def network(self) -> RuleNetwork:
+        """Shared-predicate network over every rule, built on first use."""
+        return RuleNetwork([compiled for _, compiled in self.compiled_rules], self.statistics)
+
+    def replace(
+        self,
+        version: int,
+        source_version: Optional[int],
+        rule_id: UUID,
+        entry: Optional[Tuple[Rule, CompiledRule]]
+    ) -> "RuleSnapshot":
+        """Return a new snapshot with one rule added, replaced or (entry None) removed."""
+        invalid = self.invalid
+        if rule_id in invalid:
+            invalid = {key: error for key, error in invalid.items() if key != rule_id}
+        compiled_rules = list(self.compiled_rules)
+        position = self._positions.get(rule_id)
+        if position is None:
+            if entry is not None:
+                compiled_rules.append(entry)
+        elif entry is None:
+            del compiled_rules[position]
+        else:
+            compiled_rules[position] = entry
+        return RuleSnapshot(version, source_version, compiled_rules, self.statistics, invalid)
+
+
+class RuleSnapshotStore:
+    """Holds the current rule snapshot and swaps in a new one on every change.
+
+    Readers take `current()` without locking. Writes made through `write()`
+    (as RuleService does) publish a snapshot reflecting the change right
+    away; changes made behind the store's back (another process, an edited
+    rules file) are detected through the repository version and trigger a
+    full rebuild on the next read. That includes changes that land while
+    a write of the store is in flight: the write is only applied to the
+    existing snapshot if the repository version moved by exactly the one
+    step the write itself accounts for.
+    """
+
+    def __init__(self, repository: RuleRepository, compiled_cache: Optional[CompiledRuleCache] = None):
+        self.repository = repository
+        self.compiled_cache = compiled_cache or CompiledRuleCache()
+        self._versions = itertools.count(1)
+        self._snapshot: Optional[RuleSnapshot] = None
+        # Last snapshot published, even once stale: rebuilds take unchanged rules' compiled forms from it
+        self._latest: Optional[RuleSnapshot] = None
+        # Serializes rebuilds and swaps; never taken by readers of an up-to-date snapshot
+        self._lock = threading.Lock()
+
+    def current(self) -> RuleSnapshot:
+        """Return the latest snapshot, rebuilding it if the repository changed."""
+        snapshot = self._snapshot
+        if snapshot is not None and self._is_current(snapshot, self.repository.version):
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            source_version = self.repository.version
+            if snapshot is not None and self._is_current(snapshot, source_version):
+                return snapshot
+            return self._rebuild(source_version)
+
+    def write(self, rule_id: UUID, write: Callable[[], T], stored: Optional[Rule] = None) -> T:
+        """Run a repository write affecting one rule and publish the resulting snapshot.
+
+        `stored` is the rule the write stores under `rule_id`. Without it the
+        write is a delete and must return whether it deleted the rule.
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            before = self.repository.version
+            result = write()
+            after = self.repository.version
+
+            if snapshot is None or not self._is_current(snapshot, before) or after != before + 1:
+                # Stale before this write, or another writer got in between
+                # (or the write changed nothing while someone else's change
+                # was picked up): the next read rebuilds from scratch
+                self._snapshot = None
+                return result
+
+            rule = self.repository.get_by_id(rule_id)
+            if rule != stored or (stored is None and result is not True):
+                # The version step was not this write's own
+                self._snapshot = None
+                return result
+
+            entry = None if rule is None else (rule, self.compiled_cache.get(rule))
+            self._snapshot = self._latest = snapshot.replace(next(self._versions), after, rule_id, entry)
+            return result
+
+    @staticmethod
+    def _is_current(snapshot: RuleSnapshot, source_version: Optional[int]) -> bool:
+        # Without a repository version every read has to rebuild
+        return source_version is not None and snapshot.source_version == source_version
+
+    def _rebuild(self, source_version: Optional[int]) -> RuleSnapshot:
+        """Build and publish a snapshot from every stored rule. Caller must hold the lock.
+
+        Unchanged rules keep the compiled form they have in the previous
+        snapshot; only new and changed rules go through the compiled rule
+        cache. A rule base larger than the cache therefore does not evict
+        and recompile itself on every rebuild.
+        """
+        compiled_rules = []
+        invalid = {}
+        for rule in self.repository.get_all():
+            try:
+                compiled_rules.append((rule, self._compiled(rule)))
+            except Exception as e:
+                logger.warning("Rule %s cannot be compiled: %s", rule.id, e)
+                invalid[rule.id] = str(e)
+
+        snapshot = RuleSnapshot(
+            next(self._versions),
+            # Only trust the version if nothing changed while reading
+            source_version if source_version == self.repository.version else None,
+            compiled_rules,
+            self.compiled_cache.statistics,
+            invalid
+        )
+        self._snapshot = self._latest = snapshot
+        return snapshot
+
+    def _compiled(self, rule: Rule) -> CompiledRule:
+        """Return the compiled form of a rule, from the previous snapshot if the rule did not change."""
+        entry = None if self._latest is None else self._latest.get(rule.id)
+        if entry is not None and entry[1].fingerprint == rule_fingerprint(rule):
+            return entry[1]
+        return self.compiled_cache.get(rule)
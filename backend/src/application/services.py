@@ -1,37 +1,66 @@
 """Application services implementing business use cases."""
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 from uuid import UUID, uuid4
 
-from application.ports import RuleRepository
+from application.evaluation_executor import EvaluationExecutor, split
+from application.evaluation_plan import EvaluationPlan
+from application.ports import RuleRepository, RuleSetRepository
+from application.rule_cache import CompiledRuleCache
+from application.rule_snapshot import RuleSnapshotStore
 from domain.exceptions import (
     EvaluationException,
     MissingFieldException,
     RuleNotFoundException,
+    RuleSetNotFoundException,
+    RulesNotFoundException,
     RuleValidationException,
     TypeMismatchException
 )
-from domain.expression_evaluator import evaluate_expression_detailed
-from domain.expression_parser import parse_expression, extract_fields_from_ast
+from domain.compiled_rule import CompiledRule
+from domain.expression_parser import parse_expression
 from domain.models import (
+    BatchEvaluationResponse,
     EvaluationResponse,
     EvaluationResult,
     OperatorType,
     Predicate,
     Rule,
-    RuleEffect
+    RuleBaseEvaluationResponse,
+    RuleEffect,
+    RuleSet
 )
 from domain.reason_generator import ReasonGenerator
+from domain.rule_network import RuleNetwork
+from domain.vectorized_evaluator import NUMPY_AVAILABLE, VectorizedEvaluator
 
 logger = logging.getLogger(__name__)
 
+# Explained evaluation builds a result and a reason for every comparison
+# and takes about ten times as long as a verdict through the network; its
+# estimated cost is weighted by this factor when deciding whether a job is
+# large enough to spread over the evaluation executor
+_EXPLAIN_COST_FACTOR = 10.0
+# Estimated cost (in CompiledRule.cost units, weighted like the work) of
+# copying one rule's result back from a worker process; measured at about
+# 2.3 us verdict-only and 12 us explained
+_RESULT_TRANSFER_COST = 4.0
+
 
 class RuleService:
     """Service for managing rule definitions."""
 
-    def __init__(self, repository: RuleRepository):
+    def __init__(
+        self,
+        repository: RuleRepository,
+        compiled_cache: Optional[CompiledRuleCache] = None,
+        snapshots: Optional[RuleSnapshotStore] = None
+    ):
         self.repository = repository
+        self.compiled_cache = compiled_cache or CompiledRuleCache()
+        self.snapshots = snapshots or RuleSnapshotStore(repository, self.compiled_cache)
 
     def get_all_rules(self) -> List[Rule]:
         """Retrieve all rules."""
@@ -70,7 +99,8 @@ class RuleService:
             logical_operator=logical_operator
         )
 
-        return self.repository.create(rule)
+        self.compiled_cache.put(rule)
+        return self.snapshots.write(rule.id, lambda: self.repository.create(rule), stored=rule)
 
     def update_rule(
         self,
@@ -104,11 +134,13 @@ class RuleService:
             logical_operator=logical_operator
         )
 
-        return self.repository.update(updated_rule)
+        self.compiled_cache.put(updated_rule)
+        return self.snapshots.write(rule_id, lambda: self.repository.update(updated_rule), stored=updated_rule)
 
     def delete_rule(self, rule_id: UUID) -> bool:
         """Delete a rule."""
-        deleted = self.repository.delete(rule_id)
+        deleted = self.snapshots.write(rule_id, lambda: self.repository.delete(rule_id))
+        self.compiled_cache.invalidate(rule_id)
         if not deleted:
             raise RuleNotFoundException(str(rule_id))
         return deleted
@@ -166,50 +198,106 @@ class RuleService:
                 raise RuleValidationException(f"Invalid expression syntax: {str(e)}")
 
 
-class EvaluationService:
-    """Service for evaluating payloads against rules."""
+class CompiledRuleEvaluator:
+    """Evaluates payloads against rules that are already resolved and compiled.
 
-    def __init__(self, repository: RuleRepository):
-        self.repository = repository
+    Holds the evaluation logic of EvaluationService without the rule
+    lookups, so executor worker processes can evaluate rules they are sent.
+    """
 
-    def evaluate(self, payload: Dict[str, Any], rule_ids: List[str]) -> EvaluationResponse:
-        """
-        Evaluate a payload against specified rules.
+    def __init__(self, compiled_cache: Optional[CompiledRuleCache] = None):
+        self.compiled_cache = compiled_cache or CompiledRuleCache()
 
-        Args:
-            payload: The JSON payload to evaluate
-            rule_ids: List of rule IDs to evaluate against
+    def _network(self, compiled_rules: List[Tuple[Rule, CompiledRule]]) -> RuleNetwork:
+        """Return the shared-predicate network for the compiled rules."""
+        return self.compiled_cache.network([compiled for _, compiled in compiled_rules])
 
-        Returns:
-            EvaluationResponse with overall result and detailed reasons
+    def _evaluate_compiled(
+        self,
+        payload: Dict[str, Any],
+        compiled_rules: List[Tuple[Rule, CompiledRule]],
+        explain: bool,
+        network: Optional[RuleNetwork] = None
+    ) -> EvaluationResponse:
+        """Evaluate a payload against already compiled rules.
+
+        Verdict-only evaluation goes through the rules' shared-predicate
+        network, so a comparison repeated across rules is computed once.
         """
-        if not rule_ids:
-            raise EvaluationException("At least one rule_id must be provided")
-
-        rules_to_evaluate = []
-        for rule_id_str in rule_ids:
-            try:
-                rule_id = UUID(rule_id_str)
-            except ValueError:
-                raise EvaluationException(f"Invalid UUID format: {rule_id_str}")
-
-            rule = self.repository.get_by_id(rule_id)
-            if not rule:
-                raise RuleNotFoundException(rule_id_str)
-            rules_to_evaluate.append(rule)
-
-        evaluation_results = []
+        if explain:
+            return self._summarize([
+                self._evaluate_rule(rule, compiled, payload) for rule, compiled in compiled_rules
+            ])
+
+        if network is None:
+            network = self._network(compiled_rules)
+        verdicts = network.evaluate(payload)
+        return self._summarize([
+            self._verdict_result(rule, passed) for (rule, _), passed in zip(compiled_rules, verdicts)
+        ])
+
+    def _evaluate_payloads(
+        self,
+        compiled_rules: List[Tuple[Rule, CompiledRule]],
+        payloads: Sequence[Dict[str, Any]],
+        explain_flags: Sequence[bool],
+        network: Optional[RuleNetwork] = None
+    ) -> List[EvaluationResponse]:
+        """Evaluate each payload against the rules, with or without details as flagged."""
+        return [
+            self._evaluate_compiled(payload, compiled_rules, explain, network)
+            for payload, explain in zip(payloads, explain_flags)
+        ]
+
+    def _evaluate_until_fail(
+        self,
+        payload: Dict[str, Any],
+        compiled_rules: List[Tuple[Rule, CompiledRule]],
+        explain: bool
+    ) -> EvaluationResponse:
+        """Evaluate rules until one fails, trying the likeliest to fail cheaply first.
+
+        Rules are ordered by cost per chance of failing, from how often
+        each rule passed in earlier evaluations of this kind. Results are
+        reported in the requested order; rules after the first failure are
+        listed as skipped.
+        """
+        statistics = self.compiled_cache.rule_statistics
+
+        def priority(position: int) -> float:
+            rule, compiled = compiled_rules[position]
+            failure_rate = 1.0 - statistics.pass_rate((rule.id, compiled.fingerprint))
+            return compiled.cost / max(failure_rate, 1e-6)
+
+        results: Dict[int, EvaluationResult] = {}
+        for position in sorted(range(len(compiled_rules)), key=priority):
+            rule, compiled = compiled_rules[position]
+            if explain:
+                result = self._evaluate_rule(rule, compiled, payload)
+            else:
+                result = self._verdict_result(rule, compiled.verdict(payload))
+            results[position] = result
+            passed = result.result == RuleEffect.PASS
+            statistics.record((rule.id, compiled.fingerprint), passed)
+            if not passed:
+                break
+
+        response = self._summarize([results[position] for position in sorted(results)])
+        response.skipped_rules = [
+            rule.id for position, (rule, _) in enumerate(compiled_rules) if position not in results
+        ]
+        return response
+
+    def _summarize(self, evaluation_results: List[EvaluationResult]) -> EvaluationResponse:
+        """Combine per-rule results into the overall response."""
         all_passed = True
         reasons = []
 
-        for rule in rules_to_evaluate:
-            result = self._evaluate_rule(rule, payload)
-            evaluation_results.append(result)
-
+        for result in evaluation_results:
             if result.result == RuleEffect.FAIL:
                 all_passed = False
 
-            reasons.append(f"{rule.name}: {result.reason}")
+            reasons.append(f"{result.rule_name}: {result.reason}")
 
         overall_result = RuleEffect.PASS if all_passed else RuleEffect.FAIL
 
@@ -219,21 +307,32 @@ class EvaluationService:
             details=evaluation_results
         )
 
-    def _evaluate_rule(self, rule: Rule, payload: Dict[str, Any]) -> EvaluationResult:
+    def _evaluate_rule(self, rule: Rule, compiled: CompiledRule, payload: Dict[str, Any]) -> EvaluationResult:
         """Evaluate a single rule against the payload."""
         if rule.expression:
-            return self._evaluate_expression_rule(rule, payload)
+            return self._evaluate_expression_rule(rule, compiled, payload)
 
-        return self._evaluate_predicate_rule(rule, payload)
+        return self._evaluate_predicate_rule(rule, compiled, payload)
 
-    def _evaluate_expression_rule(self, rule: Rule, payload: Dict[str, Any]) -> EvaluationResult:
+    def _verdict_result(self, rule: Rule, passed: bool) -> EvaluationResult:
+        """Build a rule result that carries only the verdict."""
+        return EvaluationResult(
+            rule_id=rule.id,
+            rule_name=rule.name,
+            result=RuleEffect.PASS if passed else RuleEffect.FAIL,
+            reason=f"{rule.name} passed all conditions" if passed else f"Rule {rule.name} failed"
+        )
+
+    def _evaluate_expression_rule(
+        self,
+        rule: Rule,
+        compiled: CompiledRule,
+        payload: Dict[str, Any]
+    ) -> EvaluationResult:
         """Evaluate a rule with an expression."""
         try:
-            expression_ast = parse_expression(rule.expression)
-
             # Check that all fields referenced in the expression exist in the payload
-            required_fields = extract_fields_from_ast(expression_ast)
-            missing_fields = [field for field in required_fields if field not in payload]
+            missing_fields = [field for field in compiled.required_fields if field not in payload]
 
             if missing_fields:
                 missing_fields_str = ", ".join(missing_fields)
@@ -248,7 +347,7 @@ class EvaluationService:
                     }]
                 )
 
-            passed, comparison_results = evaluate_expression_detailed(expression_ast, payload)
+            passed, comparison_results = compiled.evaluate_detailed(payload)
 
             # Generate smart reasons for each comparison
             predicate_results = []
@@ -319,16 +418,21 @@ class EvaluationService:
                 }]
             )
 
-    def _evaluate_predicate_rule(self, rule: Rule, payload: Dict[str, Any]) -> EvaluationResult:
+    def _evaluate_predicate_rule(
+        self,
+        rule: Rule,
+        compiled: CompiledRule,
+        payload: Dict[str, Any]
+    ) -> EvaluationResult:
         """Evaluate a rule with predicates."""
         predicate_results = []
         passed_count = 0
         failed_count = 0
         failed_predicate_reasons = []
 
-        for predicate in rule.predicates:
+        for predicate, evaluate_predicate in zip(rule.predicates, compiled.predicate_evaluators):
             try:
-                passed = self._evaluate_predicate(predicate, payload)
+                passed = evaluate_predicate(payload)
                 actual_value = payload.get(predicate.field)
 
                 # Auto-generate smart reason
@@ -403,84 +507,422 @@ class EvaluationService:
             predicate_results=predicate_results
         )
 
-    def _evaluate_predicate(self, predicate: Predicate, payload: Dict[str, Any]) -> bool:
-        """Evaluate a single predicate against the payload."""
-        if predicate.field not in payload:
-            raise MissingFieldException(predicate.field)
 
-        actual_value = payload[predicate.field]
-        expected_value = predicate.value
+class EvaluationService(CompiledRuleEvaluator):
+    """Service for evaluating payloads against rules."""
 
-        try:
-            if predicate.operator == OperatorType.EQUALS:
-                return actual_value == expected_value
+    def __init__(
+        self,
+        repository: RuleRepository,
+        compiled_cache: Optional[CompiledRuleCache] = None,
+        vectorize_min_batch: Optional[int] = 256,
+        snapshots: Optional[RuleSnapshotStore] = None,
+        executor: Optional[EvaluationExecutor] = None
+    ):
+        super().__init__(compiled_cache)
+        self.repository = repository
+        # Smallest verdict-only batch evaluated column-wise; None disables it
+        self.vectorize_min_batch = vectorize_min_batch
+        self.snapshots = snapshots or RuleSnapshotStore(repository, self.compiled_cache)
+        # Spreads large evaluations over worker threads or processes
+        self.executor = executor or EvaluationExecutor()
 
-            elif predicate.operator == OperatorType.NOT_EQUALS:
-                return actual_value != expected_value
+    def evaluate(
+        self,
+        payload: Dict[str, Any],
+        rule_ids: List[str],
+        explain: bool = True,
+        stop_on_first_fail: bool = False
+    ) -> EvaluationResponse:
+        """
+        Evaluate a payload against specified rules.
 
-            elif predicate.operator == OperatorType.GREATER_THAN:
-                return actual_value > expected_value
+        All rules are taken from the same rule snapshot, whose version is
+        reported in the response.
 
-            elif predicate.operator == OperatorType.GREATER_THAN_OR_EQUAL:
-                return actual_value >= expected_value
+        Args:
+            payload: The JSON payload to evaluate
+            rule_ids: List of rule IDs to evaluate against
+            explain: When False, only the PASS/FAIL verdict of each rule is
+                computed (AND/OR short-circuit) and predicate_results are left empty
+            stop_on_first_fail: Stop at the first failing rule, trying rules
+                that fail often and cheaply first; the rules left out are
+                listed in skipped_rules
 
-            elif predicate.operator == OperatorType.LESS_THAN:
-                return actual_value < expected_value
+        Returns:
+            EvaluationResponse with overall result and detailed reasons
+        """
+        snapshot = self.snapshots.current()
+        compiled_rules = snapshot.resolve(rule_ids)
+        if stop_on_first_fail:
+            response = self._evaluate_until_fail(payload, compiled_rules, explain)
+        else:
+            response = self._evaluate_spread(compiled_rules, [payload], [explain])[0]
+        response.snapshot_version = snapshot.version
+        return response
 
-            elif predicate.operator == OperatorType.LESS_THAN_OR_EQUAL:
-                return actual_value <= expected_value
+    def evaluate_all(self, payload: Dict[str, Any], explain: bool = False) -> RuleBaseEvaluationResponse:
+        """
+        Evaluate a payload against every rule in the rule base that can apply to it.
 
-            elif predicate.operator == OperatorType.CONTAINS:
-                if isinstance(actual_value, str):
-                    return expected_value in actual_value
-                elif isinstance(actual_value, list):
-                    return expected_value in actual_value
-                else:
-                    raise TypeMismatchException(
-                        predicate.field,
-                        "string or list",
-                        type(actual_value).__name__
-                    )
+        Candidate rules are looked up in an inverted index over required
+        fields and top-level equality/IN guards, so rules that cannot apply
+        (a required field is absent or a guard does not match) are never
+        evaluated and are left out of the response.
 
-            elif predicate.operator == OperatorType.NOT_CONTAINS:
-                if isinstance(actual_value, str):
-                    return expected_value not in actual_value
-                elif isinstance(actual_value, list):
-                    return expected_value not in actual_value
-                else:
-                    raise TypeMismatchException(
-                        predicate.field,
-                        "string or list",
-                        type(actual_value).__name__
-                    )
+        Args:
+            payload: The JSON payload to evaluate
+            explain: Include per-comparison details for every evaluated rule
 
-            elif predicate.operator == OperatorType.IN:
-                if isinstance(expected_value, list):
-                    return actual_value in expected_value
-                else:
-                    raise TypeMismatchException(
-                        predicate.field,
-                        "expected value to be a list",
-                        type(expected_value).__name__
-                    )
+        Returns:
+            RuleBaseEvaluationResponse listing the evaluated rules and their verdicts
+        """
+        snapshot = self.snapshots.current()
+        positions = snapshot.index.candidates(payload)
+
+        if explain:
+            details = [
+                self._evaluate_rule(rule, compiled, payload)
+                for rule, compiled in (snapshot.compiled_rules[p] for p in positions)
+            ]
+        else:
+            verdicts = snapshot.network.evaluate_applicable(payload, positions)
+            details = [
+                self._verdict_result(snapshot.compiled_rules[p][0], passed)
+                for p, passed in zip(positions, verdicts)
+            ]
+
+        return RuleBaseEvaluationResponse(
+            total_rules=len(snapshot),
+            details=details,
+            snapshot_version=snapshot.version
+        )
 
-            elif predicate.operator == OperatorType.NOT_IN:
-                if isinstance(expected_value, list):
-                    return actual_value not in expected_value
-                else:
-                    raise TypeMismatchException(
-                        predicate.field,
-                        "expected value to be a list",
-                        type(expected_value).__name__
-                    )
+    def evaluate_batch(
+        self,
+        payloads: List[Dict[str, Any]],
+        rule_ids: List[str],
+        explain: bool = False,
+        explain_indices: Optional[List[int]] = None
+    ) -> BatchEvaluationResponse:
+        """
+        Evaluate many payloads against the same rules.
 
+        Rules are resolved and compiled once for the whole batch. Large
+        verdict-only batches are evaluated column-wise with NumPy when it is
+        installed; other large batches are split into runs of payloads
+        evaluated on the service's executor.
+
+        Args:
+            payloads: The JSON payloads to evaluate
+            rule_ids: List of rule IDs to evaluate every payload against
+            explain: Include per-comparison details for every payload
+            explain_indices: Positions of payloads to include details for
+                when explain is False
+
+        Returns:
+            BatchEvaluationResponse with one EvaluationResponse per payload, in order
+        """
+        if not payloads:
+            raise EvaluationException("At least one payload must be provided")
+
+        explain_rows = set(explain_indices or ())
+        out_of_range = [i for i in explain_rows if not 0 <= i < len(payloads)]
+        if out_of_range:
+            raise EvaluationException(f"explain_indices out of range: {sorted(out_of_range)}")
+
+        started = time.perf_counter()
+        snapshot = self.snapshots.current()
+        compiled_rules = snapshot.resolve(rule_ids)
+
+        if not explain and self._should_vectorize(len(payloads)):
+            results = self._evaluate_vectorized(payloads, compiled_rules, explain_rows)
+        else:
+            network = None if explain else self._network(compiled_rules)
+            explain_flags = [explain or i in explain_rows for i in range(len(payloads))]
+            results = self._evaluate_spread(compiled_rules, payloads, explain_flags, network)
+        for response in results:
+            response.snapshot_version = snapshot.version
+
+        return BatchEvaluationResponse(
+            results=results,
+            elapsed_seconds=time.perf_counter() - started,
+            snapshot_version=snapshot.version
+        )
+
+    def prepare(
+        self,
+        rule_ids: List[str],
+        explain: bool = True
+    ) -> Callable[[Dict[str, Any]], EvaluationResponse]:
+        """
+        Resolve and compile rules once and return a function that evaluates one payload.
+
+        Every payload is evaluated against the rule snapshot current at the
+        time of the call.
+
+        Raises:
+            EvaluationException: If no IDs are given or an ID is not a valid UUID
+            RulesNotFoundException: If any of the rules does not exist, listing every missing ID
+        """
+        snapshot = self.snapshots.current()
+        compiled_rules = snapshot.resolve(rule_ids)
+        network = None if explain else self._network(compiled_rules)
+
+        def evaluate_payload(payload: Dict[str, Any]) -> EvaluationResponse:
+            response = self._evaluate_compiled(payload, compiled_rules, explain, network)
+            response.snapshot_version = snapshot.version
+            return response
+
+        return evaluate_payload
+
+    def plan(self, rule_ids: Sequence[UUID], current: Optional[EvaluationPlan] = None) -> EvaluationPlan:
+        """
+        Return an evaluation plan for the rules as of the current snapshot.
+
+        `current` is kept if it was built for the same rules and none of
+        them changed since; only its snapshot version is brought up to date.
+
+        Raises:
+            RulesNotFoundException: If any of the rules does not exist, listing every missing ID
+        """
+        snapshot = self.snapshots.current()
+        if current is not None and current.is_current(snapshot, rule_ids):
+            if current.snapshot_version == snapshot.version:
+                return current
+            return current.at_version(snapshot.version)
+        return EvaluationPlan.build(snapshot, rule_ids, self._network)
+
+    def evaluate_plan(
+        self,
+        plan: EvaluationPlan,
+        payload: Dict[str, Any],
+        explain: bool = True,
+        stop_on_first_fail: bool = False
+    ) -> EvaluationResponse:
+        """Evaluate a payload against the prepared rules of a plan."""
+        if stop_on_first_fail:
+            response = self._evaluate_until_fail(payload, plan.compiled_rules, explain)
+        else:
+            response = self._evaluate_spread(plan.compiled_rules, [payload], [explain], plan.network)[0]
+        response.snapshot_version = plan.snapshot_version
+        return response
+
+    def _evaluate_spread(
+        self,
+        compiled_rules: List[Tuple[Rule, CompiledRule]],
+        payloads: List[Dict[str, Any]],
+        explain_flags: List[bool],
+        network: Optional[RuleNetwork] = None
+    ) -> List[EvaluationResponse]:
+        """Evaluate payloads, spreading jobs large enough to pay for it over the executor.
+
+        Several payloads are split into runs of payloads. A single explained
+        payload is split into runs of rules, whose results are merged back
+        in the requested order; a single verdict-only payload stays on the
+        shared-predicate network, which is cheaper than any split.
+        """
+        weight = sum(_EXPLAIN_COST_FACTOR if explain else 1.0 for explain in explain_flags)
+        cost = weight * sum(compiled.cost for _, compiled in compiled_rules)
+        chunks = self.executor.chunk_count(cost, weight * len(compiled_rules) * _RESULT_TRANSFER_COST)
+        if chunks < 2 or (len(payloads) == 1 and (not explain_flags[0] or len(compiled_rules) < 2)):
+            return self._evaluate_payloads(compiled_rules, payloads, explain_flags, network)
+
+        if len(payloads) > 1:
+            positions = split(range(len(payloads)), chunks)
+            tasks = [
+                (compiled_rules, [payloads[i] for i in run], [explain_flags[i] for i in run])
+                for run in positions
+            ]
+            return [response for responses in self._map(tasks) for response in responses]
+
+        tasks = [(rule_run, payloads, explain_flags) for rule_run in split(compiled_rules, chunks)]
+        details = [result for responses in self._map(tasks) for result in responses[0].details]
+        return [self._summarize(details)]
+
+    def _map(
+        self,
+        tasks: List[Tuple[List[Tuple[Rule, CompiledRule]], List[Dict[str, Any]], List[bool]]]
+    ) -> List[List[EvaluationResponse]]:
+        """Run evaluation tasks on the executor's worker processes, in task order.
+
+        Workers get the rules rather than their compiled form, which cannot
+        be pickled, and compile them into their own cache.
+        """
+        return self.executor.map(_evaluate_in_worker, [
+            ([rule for rule, _ in compiled_rules], payloads, explain_flags)
+            for compiled_rules, payloads, explain_flags in tasks
+        ])
+
+    def _should_vectorize(self, batch_size: int) -> bool:
+        """Decide whether a verdict-only batch is large enough for column-wise evaluation."""
+        return NUMPY_AVAILABLE and self.vectorize_min_batch is not None and batch_size >= self.vectorize_min_batch
+
+    def _evaluate_vectorized(
+        self,
+        payloads: List[Dict[str, Any]],
+        compiled_rules: List[Tuple[Rule, CompiledRule]],
+        explain_rows: Set[int]
+    ) -> List[EvaluationResponse]:
+        """Evaluate a batch column-wise, materializing details only for explain_rows."""
+        evaluator = VectorizedEvaluator(payloads)
+        rule_passes = []
+        for rule, compiled in compiled_rules:
+            if compiled.expression_ast is not None:
+                mask = evaluator.evaluate_verdict(compiled.expression_ast)
             else:
-                raise EvaluationException(f"Unsupported operator: {predicate.operator}")
+                mask = evaluator.evaluate_predicates(compiled.predicate_nodes, rule.logical_operator)
+            rule_passes.append(mask.tolist())
+
+        # Verdict-only results carry nothing payload-specific, so each rule's
+        # PASS and FAIL result (and its reason line) is built once and shared
+        # by every row that has that verdict
+        outcomes = []
+        for rule, _ in compiled_rules:
+            failed = self._verdict_result(rule, False)
+            passed = self._verdict_result(rule, True)
+            outcomes.append((
+                (failed, f"{rule.name}: {failed.reason}"),
+                (passed, f"{rule.name}: {passed.reason}")
+            ))
+
+        responses = []
+        for i, (payload, verdicts) in enumerate(zip(payloads, zip(*rule_passes))):
+            if i in explain_rows:
+                responses.append(self._evaluate_compiled(payload, compiled_rules, True))
+                continue
+            row = [outcome[passed] for outcome, passed in zip(outcomes, verdicts)]
+            responses.append(EvaluationResponse(
+                result=RuleEffect.PASS if all(verdicts) else RuleEffect.FAIL,
+                reasons=[reason for _, reason in row],
+                details=[result for result, _ in row]
+            ))
+        return responses
+
+
+class RuleSetService:
+    """Service for managing rule sets and evaluating payloads against them.
+
+    Keeps the evaluation plan of every rule set it evaluated, so repeated
+    evaluations of a set do no per-request setup until the set or one of
+    the rules changes.
+    """
+
+    def __init__(self, repository: RuleSetRepository, evaluation_service: EvaluationService):
+        self.repository = repository
+        self.evaluation_service = evaluation_service
+        self._plans: Dict[UUID, EvaluationPlan] = {}
 
-        except TypeError:
-            raise TypeMismatchException(
-                predicate.field,
-                str(type(expected_value).__name__),
-                str(type(actual_value).__name__)
-            )
+    def get_all_rule_sets(self) -> List[RuleSet]:
+        """Retrieve all rule sets."""
+        return self.repository.get_all()
+
+    def get_rule_set(self, rule_set_id: UUID) -> RuleSet:
+        """Retrieve a specific rule set by ID."""
+        rule_set = self.repository.get_by_id(rule_set_id)
+        if not rule_set:
+            raise RuleSetNotFoundException(str(rule_set_id))
+        return rule_set
+
+    def create_rule_set(self, name: str, description: str, rule_ids: List[str]) -> RuleSet:
+        """Create a new rule set from existing rules."""
+        rule_set = RuleSet(
+            id=uuid4(),
+            name=name,
+            description=description,
+            rule_ids=self._validate_rule_set_data(name, rule_ids)
+        )
+        return self.repository.create(rule_set)
+
+    def update_rule_set(self, rule_set_id: UUID, name: str, description: str, rule_ids: List[str]) -> RuleSet:
+        """Update an existing rule set."""
+        self.get_rule_set(rule_set_id)
+        rule_set = RuleSet(
+            id=rule_set_id,
+            name=name,
+            description=description,
+            rule_ids=self._validate_rule_set_data(name, rule_ids)
+        )
+        return self.repository.update(rule_set)
 
+    def delete_rule_set(self, rule_set_id: UUID) -> bool:
+        """Delete a rule set."""
+        deleted = self.repository.delete(rule_set_id)
+        self._plans.pop(rule_set_id, None)
+        if not deleted:
+            raise RuleSetNotFoundException(str(rule_set_id))
+        return deleted
+
+    def evaluate(
+        self,
+        rule_set_id: UUID,
+        payload: Dict[str, Any],
+        explain: bool = True,
+        stop_on_first_fail: bool = False
+    ) -> EvaluationResponse:
+        """
+        Evaluate a payload against every rule of a rule set, in the set's order.
+
+        With stop_on_first_fail, evaluation stops at the first failing rule
+        (see EvaluationService.evaluate).
+
+        Raises:
+            RuleSetNotFoundException: If the rule set does not exist
+            RulesNotFoundException: If rules of the set have been deleted, listing every missing ID
+        """
+        try:
+            rule_set = self.get_rule_set(rule_set_id)
+        except RuleSetNotFoundException:
+            # Deleted by another process
+            self._plans.pop(rule_set_id, None)
+            raise
+
+        plan = self.evaluation_service.plan(rule_set.rule_ids, self._plans.get(rule_set_id))
+        self._plans[rule_set_id] = plan
+        return self.evaluation_service.evaluate_plan(plan, payload, explain, stop_on_first_fail)
+
+    def _validate_rule_set_data(self, name: str, rule_ids: List[str]) -> List[UUID]:
+        """Validate rule set data and return the parsed rule IDs."""
+        if not name or not name.strip():
+            raise RuleValidationException("Rule set name cannot be empty")
+
+        if not rule_ids:
+            raise RuleValidationException("Rule set must contain at least one rule")
+
+        parsed = []
+        for rule_id_str in rule_ids:
+            try:
+                parsed.append(UUID(rule_id_str))
+            except ValueError:
+                raise RuleValidationException(f"Invalid UUID format: {rule_id_str}")
+
+        if len(set(parsed)) != len(parsed):
+            raise RuleValidationException("Rule set cannot contain the same rule twice")
+
+        found = self.evaluation_service.repository.get_many(parsed)
+        missing = [rule_id_str for rule_id_str, rule_id in zip(rule_ids, parsed) if rule_id not in found]
+        if missing:
+            raise RulesNotFoundException(missing)
+        return parsed
+
+
+# Evaluator of an executor worker process, created on its first task
+_worker_evaluator: Optional[CompiledRuleEvaluator] = None
+
+
+def _evaluate_in_worker(
+    rules: List[Rule],
+    payloads: List[Dict[str, Any]],
+    explain_flags: List[bool]
+) -> List[EvaluationResponse]:
+    """Evaluate payloads in an executor worker process.
+
+    Each worker keeps its compiled rules and networks across tasks, so a
+    rule is compiled once per worker and later tasks only pay for
+    unpickling it and checking its fingerprint.
+    """
+    global _worker_evaluator
+    if _worker_evaluator is None:
+        _worker_evaluator = CompiledRuleEvaluator()
+    compiled_rules = [(rule, _worker_evaluator.compiled_cache.get(rule)) for rule in rules]
+    return _worker_evaluator._evaluate_payloads(compiled_rules, payloads, explain_flags)
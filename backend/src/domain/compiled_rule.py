@@ -0,0 +1,118 @@
+"""Compiled form of a rule.
+
+Parsing an expression is the most expensive part of evaluating a rule, so the
+artifacts derived from a rule's definition (AST, required fields and the
+compiled evaluation closures) are computed once and reused for every
+evaluation until the rule changes.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Iterator, Optional, Tuple, Union
+from uuid import UUID
+
+from domain.expression_compiler import (
+    CompiledDetailedExpression,
+    CompiledExpression,
+    CompiledVerdict,
+    compile_comparison,
+    compile_expression_detailed,
+    compile_expression_verdict,
+    compile_predicates_verdict
+)
+from domain.expression_parser import (
+    BinaryOpNode,
+    ComparisonNode,
+    extract_fields_from_ast,
+    parse_expression
+)
+from domain.models import Rule
+from domain.predicate_order import comparison_cost
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """Artifacts derived from a rule definition."""
+    rule_id: UUID
+    fingerprint: str
+    expression_ast: Optional[Union[ComparisonNode, BinaryOpNode]]
+    required_fields: Tuple[str, ...]
+    # Short-circuiting PASS/FAIL function, for callers that do not need details
+    verdict: Optional[CompiledVerdict] = field(default=None, compare=False, repr=False)
+    # Expression rules: compiled detailed evaluator for the whole expression
+    evaluate_detailed: Optional[CompiledDetailedExpression] = field(default=None, compare=False, repr=False)
+    # Predicate rules: how predicate outcomes are combined ("AND" or "OR")
+    logical_operator: str = field(default="AND", compare=False)
+    # Predicate rules: each predicate as a comparison node, in order
+    predicate_nodes: Tuple[ComparisonNode, ...] = field(default=(), compare=False, repr=False)
+    # Predicate rules: one compiled comparison per predicate, in order
+    predicate_evaluators: Tuple[CompiledExpression, ...] = field(default=(), compare=False, repr=False)
+    # Relative cost of evaluating every comparison of the rule
+    cost: float = field(default=1.0, compare=False)
+
+
+def rule_fingerprint(rule: Rule) -> str:
+    """Compute a content hash over the parts of a rule that affect evaluation.
+
+    Name and description are excluded because they do not change the
+    compiled artifacts.
+    """
+    if rule.expression is not None:
+        content = "expr:" + rule.expression
+    else:
+        predicates = [p.to_dict() for p in rule.predicates]
+        content = "pred:" + rule.logical_operator + ":" + json.dumps(
+            predicates, sort_keys=True, default=str
+        )
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+def compile_rule(rule: Rule) -> CompiledRule:
+    """Compile a rule into its reusable evaluation artifacts.
+
+    Raises:
+        ValueError: If the rule's expression is invalid
+        EvaluationException: If the expression uses an unsupported operator
+    """
+    expression_ast = None
+    evaluate_detailed = None
+    predicate_nodes: Tuple[ComparisonNode, ...] = ()
+    predicate_evaluators: Tuple[CompiledExpression, ...] = ()
+
+    if rule.expression is not None:
+        expression_ast = parse_expression(rule.expression)
+        required_fields = tuple(extract_fields_from_ast(expression_ast))
+        evaluate_detailed = compile_expression_detailed(expression_ast)
+        verdict = compile_expression_verdict(expression_ast, required_fields)
+    else:
+        required_fields = tuple(dict.fromkeys(p.field for p in rule.predicates))
+        predicate_nodes = tuple(
+            ComparisonNode(field=p.field, operator=p.operator.value, value=p.value)
+            for p in rule.predicates
+        )
+        predicate_evaluators = tuple(compile_comparison(node) for node in predicate_nodes)
+        verdict = compile_predicates_verdict(predicate_evaluators, rule.logical_operator)
+
+    comparisons = predicate_nodes if expression_ast is None else _comparisons(expression_ast)
+
+    return CompiledRule(
+        rule_id=rule.id,
+        fingerprint=rule_fingerprint(rule),
+        expression_ast=expression_ast,
+        required_fields=required_fields,
+        verdict=verdict,
+        evaluate_detailed=evaluate_detailed,
+        logical_operator=rule.logical_operator,
+        predicate_nodes=predicate_nodes,
+        predicate_evaluators=predicate_evaluators,
+        cost=sum(comparison_cost(node) for node in comparisons)
+    )
+
+
+def _comparisons(node: Union[ComparisonNode, BinaryOpNode]) -> Iterator[ComparisonNode]:
+    if isinstance(node, ComparisonNode):
+        yield node
+    else:
+        yield from _comparisons(node.left)
+        yield from _comparisons(node.right)
@@ -1,5 +1,7 @@
 """Domain-specific exceptions."""
 
+from typing import List
+
 
 class DomainException(Exception):
     """Base exception for domain errors."""
@@ -13,6 +15,25 @@ class RuleNotFoundException(DomainException):
         super().__init__(f"Rule with id '{rule_id}' not found")
 
 
+class RulesNotFoundException(RuleNotFoundException):
+    """Raised when one or more of several requested rules are not found."""
+    def __init__(self, rule_ids: List[str]):
+        self.rule_ids = list(rule_ids)
+        if len(self.rule_ids) == 1:
+            super().__init__(self.rule_ids[0])
+            return
+        self.rule_id = self.rule_ids[0]
+        missing = ", ".join(f"'{rule_id}'" for rule_id in self.rule_ids)
+        DomainException.__init__(self, f"Rules with ids {missing} not found")
+
+
+class RuleSetNotFoundException(DomainException):
+    """Raised when a rule set is not found."""
+    def __init__(self, rule_set_id: str):
+        self.rule_set_id = rule_set_id
+        super().__init__(f"Rule set with id '{rule_set_id}' not found")
+
+
 class RuleValidationException(DomainException):
     """Raised when a rule fails validation."""
     pass
@@ -0,0 +1,445 @@
+"""Expression compiler for rule evaluation.
+
+Turns a parsed expression AST into nested Python closures. Operator lookup,
+literal capture and node-type dispatch all happen once at compile time, so
+evaluating a compiled expression is a single call with no per-node
+isinstance checks or operator string comparisons.
+
+The compiled functions have exactly the same semantics as
+ExpressionEvaluator and DetailedExpressionEvaluator. A third, verdict-only
+form short-circuits AND/OR for callers that only need PASS/FAIL.
+"""
+
+import operator as _operator
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from domain.exceptions import EvaluationException, MissingFieldException, TypeMismatchException
+from domain.expression_parser import BinaryOpNode, ComparisonNode, extract_fields_from_ast
+
+Payload = Dict[str, Any]
+CompiledExpression = Callable[[Payload], bool]
+CompiledDetailedExpression = Callable[[Payload], Tuple[bool, List[Dict[str, Any]]]]
+CompiledVerdict = Callable[[Payload], bool]
+# Builds the leaf function for a comparison; leaves receive whatever context the tree is called with
+LeafFactory = Callable[[ComparisonNode], Callable[[Any], bool]]
+
+_EVALUATION_ERRORS = (MissingFieldException, TypeMismatchException, EvaluationException)
+
+
+def _contains(field: str) -> Callable[[Any, Any], bool]:
+    def contains(actual_value: Any, expected_value: Any) -> bool:
+        if isinstance(actual_value, (str, list)):
+            return expected_value in actual_value
+        raise TypeMismatchException(field, "string or list", type(actual_value).__name__)
+    return contains
+
+
+def _not_contains(field: str) -> Callable[[Any, Any], bool]:
+    def not_contains(actual_value: Any, expected_value: Any) -> bool:
+        if isinstance(actual_value, (str, list)):
+            return expected_value not in actual_value
+        raise TypeMismatchException(field, "string or list", type(actual_value).__name__)
+    return not_contains
+
+
+def _in(field: str) -> Callable[[Any, Any], bool]:
+    def is_in(actual_value: Any, expected_value: Any) -> bool:
+        if isinstance(expected_value, list):
+            return actual_value in expected_value
+        raise TypeMismatchException(field, "expected value to be a list", type(expected_value).__name__)
+    return is_in
+
+
+def _not_in(field: str) -> Callable[[Any, Any], bool]:
+    def is_not_in(actual_value: Any, expected_value: Any) -> bool:
+        if isinstance(expected_value, list):
+            return actual_value not in expected_value
+        raise TypeMismatchException(field, "expected value to be a list", type(expected_value).__name__)
+    return is_not_in
+
+
+# Operator -> factory taking the field name and returning a binary comparison function
+_OPERATOR_FACTORIES: Dict[str, Callable[[str], Callable[[Any, Any], bool]]] = {
+    '==': lambda field: _operator.eq,
+    '!=': lambda field: _operator.ne,
+    '>': lambda field: _operator.gt,
+    '>=': lambda field: _operator.ge,
+    '<': lambda field: _operator.lt,
+    '<=': lambda field: _operator.le,
+    'contains': _contains,
+    'not_contains': _not_contains,
+    'in': _in,
+    'not_in': _not_in,
+}
+
+
+def resolve_operator(operator: str, field: str) -> Callable[[Any, Any], bool]:
+    """Resolve an operator string to a binary comparison function.
+
+    The returned function raises TypeMismatchException for the non-relational
+    operators; TypeError from relational operators is left to the caller.
+
+    Raises:
+        EvaluationException: If the operator is not supported
+    """
+    factory = _OPERATOR_FACTORIES.get(operator)
+    if factory is None:
+        raise EvaluationException(f"Unsupported operator: {operator}")
+    return factory(field)
+
+
+def compile_comparison(node: ComparisonNode) -> CompiledExpression:
+    """Compile a comparison node into a function of the payload."""
+    field = node.field
+    compare = resolve_operator(node.operator, field)
+
+    if node.is_field_comparison:
+        other_field = node.value
+
+        def compare_fields(payload: Payload) -> bool:
+            if field not in payload:
+                raise MissingFieldException(field)
+            if other_field not in payload:
+                raise MissingFieldException(other_field)
+            actual_value = payload[field]
+            expected_value = payload[other_field]
+            try:
+                return compare(actual_value, expected_value)
+            except TypeError:
+                raise TypeMismatchException(
+                    field, type(expected_value).__name__, type(actual_value).__name__
+                )
+
+        return compare_fields
+
+    expected_value = node.value
+    expected_type = type(expected_value).__name__
+
+    def compare_literal(payload: Payload) -> bool:
+        if field not in payload:
+            raise MissingFieldException(field)
+        actual_value = payload[field]
+        try:
+            return compare(actual_value, expected_value)
+        except TypeError:
+            raise TypeMismatchException(field, expected_type, type(actual_value).__name__)
+
+    return compare_literal
+
+
+def _check_binary_operator(node: BinaryOpNode) -> None:
+    if node.operator not in ('AND', 'OR'):
+        raise EvaluationException(f"Unknown binary operator: {node.operator}")
+
+
+def _compile_node(node: Union[ComparisonNode, BinaryOpNode]) -> CompiledExpression:
+    if isinstance(node, ComparisonNode):
+        return compile_comparison(node)
+    if not isinstance(node, BinaryOpNode):
+        raise EvaluationException(f"Unknown node type: {type(node)}")
+    _check_binary_operator(node)
+
+    left = _compile_node(node.left)
+    right = _compile_node(node.right)
+
+    # Always evaluate both sides - we want answers to all predicates
+    if node.operator == 'AND':
+        def evaluate_and(payload: Payload) -> bool:
+            left_result = left(payload)
+            right_result = right(payload)
+            return left_result and right_result
+        return evaluate_and
+
+    def evaluate_or(payload: Payload) -> bool:
+        left_result = left(payload)
+        right_result = right(payload)
+        return left_result or right_result
+    return evaluate_or
+
+
+def compile_expression(expression_ast: Union[ComparisonNode, BinaryOpNode]) -> CompiledExpression:
+    """Compile an expression AST into a single callable.
+
+    The callable behaves like ExpressionEvaluator.evaluate: it returns the
+    boolean result and raises MissingFieldException, TypeMismatchException
+    or EvaluationException on failure.
+
+    Raises:
+        EvaluationException: If the AST contains an unknown node or operator
+    """
+    return _compile_node(expression_ast)
+
+
+def _compile_tracked_comparison(node: ComparisonNode) -> Callable[[Payload, List[Dict[str, Any]]], bool]:
+    """Compile a comparison that appends its outcome to a results list."""
+    field = node.field
+    operator = node.operator
+    is_field_comparison = node.is_field_comparison
+    compared_field = node.value if is_field_comparison else None
+    literal_value = node.value
+    compare = compile_comparison(node)
+
+    def tracked(payload: Payload, results: List[Dict[str, Any]]) -> bool:
+        try:
+            passed = compare(payload)
+        except (MissingFieldException, TypeMismatchException) as e:
+            results.append({
+                "field": field,
+                "operator": operator,
+                "expected": payload.get(compared_field) if is_field_comparison else literal_value,
+                "actual": payload.get(field),
+                "passed": False,
+                "error": str(e),
+                "is_field_comparison": is_field_comparison,
+                "compared_field": compared_field
+            })
+            raise
+
+        results.append({
+            "field": field,
+            "operator": operator,
+            "expected": payload[compared_field] if is_field_comparison else literal_value,
+            "actual": payload[field],
+            "passed": passed,
+            "is_field_comparison": is_field_comparison,
+            "compared_field": compared_field
+        })
+        return passed
+
+    return tracked
+
+
+def _compile_tracked_node(
+    node: Union[ComparisonNode, BinaryOpNode]
+) -> Callable[[Payload, List[Dict[str, Any]]], bool]:
+    if isinstance(node, ComparisonNode):
+        return _compile_tracked_comparison(node)
+    if not isinstance(node, BinaryOpNode):
+        raise EvaluationException(f"Unknown node type: {type(node)}")
+    _check_binary_operator(node)
+
+    left = _compile_tracked_node(node.left)
+    right = _compile_tracked_node(node.right)
+
+    if node.operator == 'AND':
+        def evaluate_and(payload: Payload, results: List[Dict[str, Any]]) -> bool:
+            left_result = left(payload, results)
+            right_result = right(payload, results)
+            return left_result and right_result
+        return evaluate_and
+
+    def evaluate_or(payload: Payload, results: List[Dict[str, Any]]) -> bool:
+        left_result = left(payload, results)
+        right_result = right(payload, results)
+        return left_result or right_result
+    return evaluate_or
+
+
+def compile_expression_detailed(
+    expression_ast: Union[ComparisonNode, BinaryOpNode]
+) -> CompiledDetailedExpression:
+    """Compile an expression AST into a callable that reports every comparison.
+
+    The callable behaves like evaluate_expression_detailed: it returns a
+    tuple of (overall_result, list of comparison results) and never raises
+    for missing fields or type mismatches.
+
+    Raises:
+        EvaluationException: If the AST contains an unknown node or operator
+    """
+    root = _compile_tracked_node(expression_ast)
+
+    def evaluate_detailed(payload: Payload) -> Tuple[bool, List[Dict[str, Any]]]:
+        results: List[Dict[str, Any]] = []
+        try:
+            return root(payload, results), results
+        except _EVALUATION_ERRORS:
+            # Return False with whatever results we collected
+            return False, results
+
+    return evaluate_detailed
+
+
+def is_total(node: Union[ComparisonNode, BinaryOpNode]) -> bool:
+    """Return True if evaluating the node can never raise, given all its fields are present.
+
+    Equality checks never raise, and neither does membership in a literal
+    list. Ordering, contains and field-to-field membership can raise
+    TypeMismatchException depending on the payload.
+    """
+    if isinstance(node, ComparisonNode):
+        if node.operator in ('==', '!='):
+            return True
+        return node.operator in ('in', 'not_in') and not node.is_field_comparison \
+            and isinstance(node.value, list)
+    return is_total(node.left) and is_total(node.right)
+
+
+def _comparison_nodes(node: Union[ComparisonNode, BinaryOpNode]) -> Iterable[ComparisonNode]:
+    if isinstance(node, ComparisonNode):
+        yield node
+    else:
+        yield from _comparison_nodes(node.left)
+        yield from _comparison_nodes(node.right)
+
+
+def _compile_error_check(
+    node: Union[ComparisonNode, BinaryOpNode],
+    leaf_factory: LeafFactory
+) -> Optional[Callable[[Any], None]]:
+    """Compile a check that evaluates every comparison of a subtree that could raise.
+
+    Returns None if the subtree can never raise.
+    """
+    leaves = [leaf_factory(leaf) for leaf in _comparison_nodes(node) if not is_total(leaf)]
+    if not leaves:
+        return None
+
+    def check(context: Any) -> None:
+        for leaf in leaves:
+            leaf(context)
+
+    return check
+
+
+def _compile_verdict_node(
+    node: Union[ComparisonNode, BinaryOpNode],
+    leaf_factory: LeafFactory,
+    conjunctive: bool
+) -> Callable[[Any, List[Callable[[Any], None]]], bool]:
+    """Compile a short-circuiting node.
+
+    `conjunctive` is True when every ancestor is an AND, i.e. this node
+    being False makes the whole expression False. Operands skipped anywhere
+    else are pushed onto `deferred` so their errors can still be detected if
+    the expression turns out True.
+    """
+    if isinstance(node, ComparisonNode):
+        compare = leaf_factory(node)
+
+        def verdict_leaf(context: Any, deferred: List[Callable[[Any], None]]) -> bool:
+            return compare(context)
+
+        return verdict_leaf
+    if not isinstance(node, BinaryOpNode):
+        raise EvaluationException(f"Unknown node type: {type(node)}")
+    _check_binary_operator(node)
+
+    if node.operator == 'AND':
+        left = _compile_verdict_node(node.left, leaf_factory, conjunctive)
+        right = _compile_verdict_node(node.right, leaf_factory, conjunctive)
+        check_right = None if conjunctive else _compile_error_check(node.right, leaf_factory)
+
+        if check_right is None:
+            def verdict_and(context: Any, deferred: List[Callable[[Any], None]]) -> bool:
+                return left(context, deferred) and right(context, deferred)
+            return verdict_and
+
+        def verdict_and_deferred(context: Any, deferred: List[Callable[[Any], None]]) -> bool:
+            if not left(context, deferred):
+                deferred.append(check_right)
+                return False
+            return right(context, deferred)
+        return verdict_and_deferred
+
+    left = _compile_verdict_node(node.left, leaf_factory, False)
+    right = _compile_verdict_node(node.right, leaf_factory, False)
+    check_right = _compile_error_check(node.right, leaf_factory)
+
+    if check_right is None:
+        def verdict_or(context: Any, deferred: List[Callable[[Any], None]]) -> bool:
+            return left(context, deferred) or right(context, deferred)
+        return verdict_or
+
+    def verdict_or_deferred(context: Any, deferred: List[Callable[[Any], None]]) -> bool:
+        if left(context, deferred):
+            deferred.append(check_right)
+            return True
+        return right(context, deferred)
+    return verdict_or_deferred
+
+
+def compile_verdict_tree(
+    expression_ast: Union[ComparisonNode, BinaryOpNode],
+    leaf_factory: LeafFactory = compile_comparison
+) -> Callable[[Any], bool]:
+    """Compile a short-circuiting verdict function over an arbitrary leaf context.
+
+    The caller must ensure every field referenced by the expression is
+    present; see compile_expression_verdict for the payload-level wrapper.
+    """
+    root = _compile_verdict_node(expression_ast, leaf_factory, True)
+
+    def verdict(context: Any) -> bool:
+        deferred: List[Callable[[Any], None]] = []
+        try:
+            if not root(context, deferred):
+                return False
+            # The expression is True: surface any error an operand we skipped would have raised
+            for check in deferred:
+                check(context)
+        except _EVALUATION_ERRORS:
+            return False
+        return True
+
+    return verdict
+
+
+def compile_expression_verdict(
+    expression_ast: Union[ComparisonNode, BinaryOpNode],
+    required_fields: Optional[Iterable[str]] = None
+) -> CompiledVerdict:
+    """Compile an expression into a fast PASS/FAIL function.
+
+    AND stops at the first False operand and OR at the first True one. The
+    verdict is always identical to the result of evaluate_expression_detailed:
+    an operand is only skipped for good if it cannot raise, or if the
+    expression is already known to be False. Otherwise its error check is
+    deferred and run only when the expression comes out True.
+    """
+    if required_fields is None:
+        required_fields = extract_fields_from_ast(expression_ast)
+    fields = tuple(required_fields)
+    tree = compile_verdict_tree(expression_ast)
+
+    def verdict(payload: Payload) -> bool:
+        for field in fields:
+            if field not in payload:
+                return False
+        return tree(payload)
+
+    return verdict
+
+
+def compile_predicates_verdict(
+    predicate_evaluators: Iterable[CompiledExpression],
+    logical_operator: str
+) -> CompiledVerdict:
+    """Compile a fast PASS/FAIL function for a predicate rule.
+
+    A predicate that errors counts as failed, so short-circuiting never
+    changes the verdict.
+    """
+    evaluators = tuple(predicate_evaluators)
+    errors = (MissingFieldException, TypeMismatchException)
+
+    if logical_operator == "AND":
+        def verdict_all(payload: Payload) -> bool:
+            for evaluate in evaluators:
+                try:
+                    if not evaluate(payload):
+                        return False
+                except errors:
+                    return False
+            return True
+        return verdict_all
+
+    def verdict_any(payload: Payload) -> bool:
+        for evaluate in evaluators:
+            try:
+                if evaluate(payload):
+                    return True
+            except errors:
+                pass
+        return False
+    return verdict_any
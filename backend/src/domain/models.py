@@ -117,6 +117,34 @@ class Rule:
         )
 
 
+@dataclass
+class RuleSet:
+    """A named, ordered list of rules that clients evaluate together."""
+    id: UUID
+    name: str
+    description: str
+    rule_ids: List[UUID]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert rule set to dictionary representation."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "description": self.description,
+            "rule_ids": [str(rule_id) for rule_id in self.rule_ids]
+        }
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "RuleSet":
+        """Create rule set from dictionary representation."""
+        return RuleSet(
+            id=UUID(data["id"]) if isinstance(data["id"], str) else data["id"],
+            name=data["name"],
+            description=data["description"],
+            rule_ids=[UUID(rule_id) if isinstance(rule_id, str) else rule_id for rule_id in data["rule_ids"]]
+        )
+
+
 @dataclass
 class EvaluationResult:
     """Result of evaluating a payload against a rule."""
@@ -143,12 +171,60 @@ class EvaluationResponse:
     result: RuleEffect
     reasons: List[str]
     details: List[EvaluationResult]
+    # Version of the rule snapshot the payload was evaluated against
+    snapshot_version: Optional[int] = None
+    # Rules not evaluated because an earlier rule already failed (stop_on_first_fail only)
+    skipped_rules: Optional[List[UUID]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert evaluation response to dictionary representation."""
-        return {
+        result = {
             "result": self.result.value,
             "reasons": self.reasons,
-            "details": [d.to_dict() for d in self.details]
+            "details": [d.to_dict() for d in self.details],
+            "snapshot_version": self.snapshot_version
         }
+        if self.skipped_rules is not None:
+            result["skipped_rules"] = [str(rule_id) for rule_id in self.skipped_rules]
+        return result
 
+
+@dataclass
+class RuleBaseEvaluationResponse:
+    """Result of evaluating a payload against every applicable rule in the rule base."""
+    total_rules: int
+    details: List[EvaluationResult]
+    snapshot_version: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert rule base evaluation response to dictionary representation."""
+        return {
+            "total_rules": self.total_rules,
+            "evaluated_rules": len(self.details),
+            "matched": [str(d.rule_id) for d in self.details if d.result == RuleEffect.PASS],
+            "failed": [str(d.rule_id) for d in self.details if d.result == RuleEffect.FAIL],
+            "details": [d.to_dict() for d in self.details],
+            "snapshot_version": self.snapshot_version
+        }
+
+
+@dataclass
+class BatchEvaluationResponse:
+    """Evaluation responses for a batch of payloads."""
+    results: List[EvaluationResponse]
+    elapsed_seconds: float
+    snapshot_version: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert batch evaluation response to dictionary representation."""
+        count = len(self.results)
+        passed = sum(1 for r in self.results if r.result == RuleEffect.PASS)
+        return {
+            "count": count,
+            "passed": passed,
+            "failed": count - passed,
+            "elapsed_ms": round(self.elapsed_seconds * 1000, 3),
+            "records_per_second": round(count / self.elapsed_seconds, 1) if self.elapsed_seconds > 0 else None,
+            "snapshot_version": self.snapshot_version,
+            "results": [r.to_dict() for r in self.results]
+        }
@@ -0,0 +1,149 @@
+"""Cost- and selectivity-based ordering of AND/OR operands.
+
+A short-circuiting AND stops at its first False operand and an OR at its
+first True one, so the order of the operands decides how much of an
+expression is evaluated. Verdict-only evaluation may pick any order: a
+rule's verdict is False as soon as any comparison it evaluates raises,
+and operands it skips are checked for errors before a True verdict is
+returned (see compile_verdict_tree). The verdict is therefore the same
+for every order, and only the work done to reach it changes.
+
+Operands of a chain of the same operator (`a AND b AND c`) are ordered
+together. Under AND, the operand with the lowest cost per chance of
+failing runs first; under OR, the lowest cost per chance of passing. For
+independent operands this minimizes the expected cost of the chain.
+"""
+
+import threading
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple, Union
+
+from domain.expression_parser import BinaryOpNode, ComparisonNode
+
+ExpressionNode = Union[ComparisonNode, BinaryOpNode]
+# Returns (relative cost, probability of passing) of a comparison
+Estimate = Callable[[ComparisonNode], Tuple[float, float]]
+
+# Relative cost of one comparison, by operator. Equality is a single
+# dict lookup and compare; ordering adds a type check; contains and list
+# membership scan a sequence.
+_OPERATOR_COSTS = {
+    '==': 1.0,
+    '!=': 1.0,
+    '>': 1.2,
+    '>=': 1.2,
+    '<': 1.2,
+    '<=': 1.2,
+    'in': 1.5,
+    'not_in': 1.5,
+    'contains': 2.0,
+    'not_contains': 2.0,
+}
+# Keeps the ordering keys finite for operands that always pass or always fail
+_EPSILON = 1e-6
+
+
+def comparison_cost(node: ComparisonNode) -> float:
+    """Return the relative cost of evaluating a comparison."""
+    cost = _OPERATOR_COSTS.get(node.operator, 2.0)
+    if node.is_field_comparison:
+        # Second field lookup
+        cost += 0.5
+    elif node.operator in ('in', 'not_in') and isinstance(node.value, list):
+        cost += len(node.value) / 16
+    return cost
+
+
+class PredicateStatistics:
+    """How often each comparison passed, keyed by predicate_key.
+
+    Counts are updated without a lock, so under concurrent updates a few
+    observations may be lost; they only steer the evaluation order.
+    """
+
+    def __init__(self):
+        # key -> [observations, passes]
+        self._counts: Dict[Hashable, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def record(self, key: Hashable, passed: bool) -> None:
+        """Record one observed outcome; an error counts as not passing."""
+        counts = self._counts.get(key)
+        if counts is None:
+            with self._lock:
+                counts = self._counts.setdefault(key, [0, 0])
+        counts[0] += 1
+        if passed:
+            counts[1] += 1
+
+    def observations(self, key: Hashable) -> int:
+        """Return how many outcomes were recorded for a comparison."""
+        counts = self._counts.get(key)
+        return 0 if counts is None else counts[0]
+
+    def pass_rate(self, key: Hashable) -> float:
+        """Return the estimated probability that a comparison passes.
+
+        Smoothed towards 0.5, which is also the estimate for a comparison
+        that has not been observed yet.
+        """
+        counts = self._counts.get(key)
+        if counts is None:
+            return 0.5
+        observations, passes = counts
+        return (passes + 1) / (observations + 2)
+
+
+def _chain(node: ExpressionNode, operator: str) -> List[ExpressionNode]:
+    """Return the operands of a chain of `operator`, left to right."""
+    if isinstance(node, BinaryOpNode) and node.operator == operator:
+        return _chain(node.left, operator) + _chain(node.right, operator)
+    return [node]
+
+
+def _order(node: ExpressionNode, estimate: Estimate) -> Tuple[ExpressionNode, float, float]:
+    """Return the reordered node with its expected cost and probability of passing."""
+    if isinstance(node, ComparisonNode):
+        cost, pass_rate = estimate(node)
+        return node, cost, pass_rate
+
+    conjunctive = node.operator == 'AND'
+    operands = [_order(operand, estimate) for operand in _chain(node, node.operator)]
+    if conjunctive:
+        operands.sort(key=lambda operand: operand[1] / max(1.0 - operand[2], _EPSILON))
+    else:
+        operands.sort(key=lambda operand: operand[1] / max(operand[2], _EPSILON))
+
+    # Expected cost: each operand only runs if the ones before it did not decide the result
+    cost = 0.0
+    reached = 1.0
+    ordered = None
+    for operand, operand_cost, pass_rate in operands:
+        cost += reached * operand_cost
+        reached *= pass_rate if conjunctive else 1.0 - pass_rate
+        ordered = operand if ordered is None else BinaryOpNode(node.operator, ordered, operand)
+    return ordered, cost, reached if conjunctive else 1.0 - reached
+
+
+def order_operands(node: ExpressionNode, estimate: Estimate) -> ExpressionNode:
+    """Return an equivalent expression with AND/OR operands in the cheapest expected order.
+
+    Stable: operands that are estimated alike keep their original order.
+    """
+    return _order(node, estimate)[0]
+
+
+def order_predicates(
+    nodes: Sequence[ComparisonNode],
+    logical_operator: str,
+    estimate: Estimate
+) -> List[int]:
+    """Return the positions of a predicate rule's predicates in the cheapest expected order."""
+    estimates = [estimate(node) for node in nodes]
+    if logical_operator == "AND":
+        key = lambda i: estimates[i][0] / max(1.0 - estimates[i][1], _EPSILON)
+    else:
+        key = lambda i: estimates[i][0] / max(estimates[i][1], _EPSILON)
+    return sorted(range(len(nodes)), key=key)
@@ -0,0 +1,146 @@
+"""Inverted index selecting the rules that can apply to a payload.
+
+Evaluating a payload against the whole rule base should not mean a linear
+scan. The index maps field names, and literals of top-level equality and
+IN guards, to the rules that depend on them. A rule is a candidate for a
+payload only if:
+
+- every field it requires is present (for OR predicate rules: any of them), and
+- every top-level guard matches, i.e. for each `field == literal` or
+  `field in [...]` that the rule's root AND depends on, the payload value
+  equals the literal or is one of the listed values.
+
+A rule whose guard does not match would be FAIL anyway, since a False
+operand of the root AND makes the whole rule False.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Sequence, Tuple, Union
+
+from domain.compiled_rule import CompiledRule
+from domain.expression_parser import BinaryOpNode, ComparisonNode
+
+# Literal types usable as guard keys; their hashing agrees with ==
+_GUARD_TYPES = (str, int, float, bool, type(None))
+
+
+@dataclass(frozen=True)
+class _Guard:
+    """A top-level equality or membership condition: payload[field] must be in values."""
+    field: str
+    values: FrozenSet[Any]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    """Applicability conditions of one rule."""
+    all_of: FrozenSet[str]
+    any_of: FrozenSet[str]
+    guards: Tuple[_Guard, ...]
+
+
+def _guard(node: ComparisonNode) -> Optional[_Guard]:
+    """Return the guard a comparison imposes, if it is a literal equality or membership."""
+    if node.is_field_comparison:
+        return None
+    if node.operator == '==' and isinstance(node.value, _GUARD_TYPES):
+        return _Guard(node.field, frozenset((node.value,)))
+    if node.operator == 'in' and isinstance(node.value, list) \
+            and all(isinstance(v, _GUARD_TYPES) for v in node.value):
+        return _Guard(node.field, frozenset(node.value))
+    return None
+
+
+def _conjuncts(node: Union[ComparisonNode, BinaryOpNode]) -> Iterator[ComparisonNode]:
+    """Yield the comparisons joined by the root AND chain of an expression."""
+    if isinstance(node, ComparisonNode):
+        yield node
+    elif node.operator == 'AND':
+        yield from _conjuncts(node.left)
+        yield from _conjuncts(node.right)
+
+
+def _entry(compiled: CompiledRule) -> _Entry:
+    if compiled.expression_ast is not None:
+        conjuncts = list(_conjuncts(compiled.expression_ast))
+        return _Entry(
+            all_of=frozenset(compiled.required_fields),
+            any_of=frozenset(),
+            guards=tuple(g for g in map(_guard, conjuncts) if g is not None)
+        )
+    if compiled.logical_operator == "AND":
+        return _Entry(
+            all_of=frozenset(compiled.required_fields),
+            any_of=frozenset(),
+            guards=tuple(g for g in map(_guard, compiled.predicate_nodes) if g is not None)
+        )
+    return _Entry(all_of=frozenset(), any_of=frozenset(compiled.required_fields), guards=())
+
+
+class RuleIndex:
+    """Maps payload fields and values to the positions of candidate rules."""
+
+    def __init__(self, compiled_rules: Sequence[CompiledRule]):
+        self._entries: List[_Entry] = [_entry(compiled) for compiled in compiled_rules]
+        # field -> rules anchored on the field's presence
+        self._by_field: Dict[str, List[int]] = {}
+        # field -> guard literal -> rules anchored on that guard
+        self._by_value: Dict[str, Dict[Any, List[int]]] = {}
+        # Rules that reference no field at all
+        self._always: List[int] = []
+
+        for position, entry in enumerate(self._entries):
+            if entry.guards:
+                # Anchor on the narrowest guard; the others are checked per candidate
+                guard = min(entry.guards, key=lambda g: len(g.values))
+                by_value = self._by_value.setdefault(guard.field, {})
+                for value in guard.values:
+                    by_value.setdefault(value, []).append(position)
+            elif entry.all_of:
+                self._by_field.setdefault(min(entry.all_of), []).append(position)
+            elif entry.any_of:
+                for field in entry.any_of:
+                    self._by_field.setdefault(field, []).append(position)
+            else:
+                self._always.append(position)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def candidates(self, payload: Dict[str, Any]) -> List[int]:
+        """Return the positions of the rules that can apply to the payload, in rule order."""
+        found = set(self._always)
+        by_field = self._by_field
+        by_value = self._by_value
+        for field, value in payload.items():
+            anchored = by_field.get(field)
+            if anchored:
+                found.update(anchored)
+            values = by_value.get(field)
+            if values:
+                try:
+                    anchored = values.get(value)
+                except TypeError:
+                    # Unhashable values (lists, objects) never equal a guard literal
+                    continue
+                if anchored:
+                    found.update(anchored)
+
+        keys = payload.keys()
+        return [position for position in sorted(found) if self._applies(self._entries[position], payload, keys)]
+
+    @staticmethod
+    def _applies(entry: _Entry, payload: Dict[str, Any], keys: Any) -> bool:
+        if not entry.all_of <= keys:
+            return False
+        if entry.any_of and entry.any_of.isdisjoint(keys):
+            return False
+        for guard in entry.guards:
+            if guard.field not in payload:
+                return False
+            try:
+                if payload[guard.field] not in guard.values:
+                    return False
+            except TypeError:
+                return False
+        return True
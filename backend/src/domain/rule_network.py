@@ -0,0 +1,419 @@
+"""Shared-predicate network over a set of compiled rules.
+
+Rules evaluated together often repeat the same comparisons (for example
+`age >= 18` or `status == 'active'`). The network interns every distinct
+comparison across its rules into a single node, in the spirit of a Rete
+alpha network. While a payload is evaluated each node computes its outcome
+at most once and every rule referencing it reuses the memoized result, so
+the work per payload grows with the number of distinct comparisons rather
+than the total number of comparisons in the rules.
+
+Verdicts are identical to evaluating each rule's CompiledRule.verdict on its
+own: memoizing a comparison never changes its outcome, errors included.
+
+Threshold comparisons (`>`, `>=`, `<`, `<=` against a numeric literal) on a
+field used by several of them are resolved together: the network keeps the
+field's distinct thresholds sorted, and a single bisect on the payload value
+gives the outcome of every threshold comparison on that field.
+
+Operands of AND/OR are evaluated in the order that is cheapest by a cost
+model and by how often each comparison passed so far (see
+domain/predicate_order.py). Every `sample_interval`-th payload, every
+comparison of up to 256 of the rules that apply to it is evaluated and its
+outcome recorded; larger networks rotate through their rules from one
+sample to the next. The evaluation order is recomputed after 16, 32, 64,
+... such samples (at most every 1024), 256 rules per sample so no single
+payload pays for re-ordering a large network, and only rules whose order
+changed are recompiled. Reordering never changes a verdict.
+"""
+
+import threading
+
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from domain.compiled_rule import CompiledRule
+from domain.exceptions import MissingFieldException, TypeMismatchException
+from domain.expression_compiler import CompiledExpression, Payload, compile_comparison, compile_verdict_tree
+from domain.expression_parser import BinaryOpNode, ComparisonNode
+from domain.predicate_order import PredicateStatistics, comparison_cost, order_operands, order_predicates
+
+# Marks a node whose outcome has not been computed for the current payload
+_UNSET = object()
+
+
+def predicate_key(node: ComparisonNode) -> Hashable:
+    """Return a key that is equal for comparisons that always have the same outcome.
+
+    Values are keyed by type and repr, so 1, 1.0 and true stay distinct even
+    though they compare equal in Python.
+    """
+    return (node.field, node.operator, node.is_field_comparison, type(node.value).__name__, repr(node.value))
+
+
+def _comparisons(compiled: CompiledRule) -> Iterator[ComparisonNode]:
+    if compiled.expression_ast is None:
+        yield from compiled.predicate_nodes
+        return
+    stack = [compiled.expression_ast]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, ComparisonNode):
+            yield node
+        else:
+            stack.append(node.right)
+            stack.append(node.left)
+
+
+def _is_threshold(node: ComparisonNode) -> bool:
+    """Return True for an ordering comparison against a numeric literal."""
+    return (
+        node.operator in ('>', '>=', '<', '<=')
+        and not node.is_field_comparison
+        and type(node.value) in (int, float)
+        and node.value == node.value
+    )
+
+
+def _locate(payload: Payload, field: str, thresholds: List[Union[int, float]]) -> Optional[Tuple[int, int]]:
+    """Return (thresholds below the value, thresholds at or below it), or None if the value is not a number."""
+    value = payload.get(field)
+    if type(value) not in (int, float) or value != value:
+        # Missing, NaN or not a number: the comparisons themselves decide (and raise)
+        return None
+    return bisect_left(thresholds, value), bisect_right(thresholds, value)
+
+
+# Samples before the first re-optimization; the interval doubles up to the maximum
+_FIRST_REOPTIMIZATION = 16
+_MAX_REOPTIMIZATION_INTERVAL = 1024
+# Rules whose comparisons one sample records, and rules one sample re-orders,
+# bounding the extra latency of a sampled payload
+_MAX_SAMPLED_RULES = 256
+_REOPTIMIZATION_STEP = 256
+
+# Per-payload state passed to every leaf: the payload followed by one memo
+# slot per shared node and per threshold field. A plain list keeps the memo
+# lookup a single index.
+_Activation = List[Any]
+
+
+class RuleNetwork:
+    """Evaluates the verdicts of several compiled rules with shared comparisons."""
+
+    def __init__(
+        self,
+        compiled_rules: Sequence[CompiledRule],
+        statistics: Optional[PredicateStatistics] = None,
+        sample_interval: int = 64
+    ):
+        if sample_interval < 1:
+            raise ValueError("sample_interval must be at least 1")
+        self._compiled_rules = tuple(compiled_rules)
+        # Shared with other networks when given, so they learn from each other's samples
+        self.statistics = statistics if statistics is not None else PredicateStatistics()
+        self.sample_interval = sample_interval
+        self._countdown = sample_interval
+        self._samples = 0
+        self._next_reoptimization = _FIRST_REOPTIMIZATION
+        # Position of the next rule to re-order while a re-optimization is spread over samples
+        self._reoptimize_from: Optional[int] = None
+        # Offset into the applicable rules where the next capped sample starts
+        self._sample_start = 0
+        # Held while sampling or re-optimizing; evaluations that find it taken skip sampling
+        self._sample_lock = threading.Lock()
+        # Per rule: its required fields and distinct (key, comparison) pairs, built the first time it is sampled
+        self._rule_comparisons: List[Optional[
+            Tuple[FrozenSet[str], Tuple[Tuple[Hashable, CompiledExpression], ...]]
+        ]] = [None] * len(self._compiled_rules)
+        self._references = Counter(
+            predicate_key(node) for compiled in compiled_rules for node in _comparisons(compiled)
+        )
+        # Comparisons referenced by the rules, counting repeats
+        self.predicate_count = sum(self._references.values())
+        self._fields = frozenset(field for compiled in compiled_rules for field in compiled.required_fields)
+        self._slot_count = 0
+        self._slots: Dict[Hashable, int] = {}
+        # memo slot -> compiled comparison of a shared node
+        self._nodes: Dict[int, CompiledExpression] = {}
+        # field -> sorted distinct thresholds, for fields with several threshold comparisons
+        self._thresholds = self._collect_thresholds(compiled_rules)
+        self._threshold_slots: Dict[str, int] = {}
+        # Per rule: the operand order its verdict functions were compiled with
+        self._orders = [self._operand_order(compiled) for compiled in self._compiled_rules]
+        verdicts = [self._compile_rule(compiled, order) for compiled, order in zip(self._compiled_rules, self._orders)]
+        # The verdicts with the per-rule missing-field check, and the same
+        # verdicts without it; published together so they always match
+        self._compiled: Tuple[Tuple[Callable[[_Activation], bool], ...], ...] = (
+            tuple(verdict for verdict, _ in verdicts),
+            tuple(complete for _, complete in verdicts)
+        )
+        self._unset = (_UNSET,) * self._slot_count
+
+    @property
+    def node_count(self) -> int:
+        """Number of distinct comparisons in the network."""
+        return len(self._references)
+
+    @property
+    def shared_node_count(self) -> int:
+        """Number of distinct comparisons referenced more than once, and therefore memoized."""
+        return len(self._nodes)
+
+    @property
+    def threshold_fields(self) -> Dict[str, int]:
+        """Number of distinct thresholds per field resolved by bisect."""
+        return {field: len(thresholds) for field, thresholds in self._thresholds.items()}
+
+    def evaluate(self, payload: Payload) -> List[bool]:
+        """Return the PASS/FAIL verdict of every rule, in the order the rules were given."""
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._sample(payload, range(len(self._compiled_rules)))
+        verdicts, complete_verdicts = self._compiled
+        activation = [payload]
+        activation.extend(self._unset)
+        if self._fields <= payload.keys():
+            # Every referenced field is present, so no rule needs its missing-field check
+            return [verdict(activation) for verdict in complete_verdicts]
+        return [verdict(activation) for verdict in verdicts]
+
+    def evaluate_applicable(self, payload: Payload, positions: Sequence[int]) -> List[bool]:
+        """Return the verdicts of the rules at the given positions only.
+
+        The caller guarantees that every field those rules require is
+        present in the payload (see RuleIndex.candidates).
+        """
+        self._countdown -= 1
+        if self._countdown <= 0:
+            self._sample(payload, positions)
+        verdicts = self._compiled[1]
+        activation = [payload]
+        activation.extend(self._unset)
+        return [verdicts[position](activation) for position in positions]
+
+    def reoptimize(self) -> int:
+        """Recompute the operand order of every rule from the current statistics.
+
+        Returns the number of rules whose order changed and that were recompiled.
+        """
+        return self._reoptimize_range(0, len(self._compiled_rules))
+
+    def _reoptimize_range(self, start: int, stop: int) -> int:
+        """Recompute the operand order of the rules at positions start to stop."""
+        changed = []
+        for position in range(start, min(stop, len(self._compiled_rules))):
+            order = self._operand_order(self._compiled_rules[position])
+            if order != self._orders[position]:
+                changed.append((position, order))
+        if not changed:
+            return 0
+
+        verdicts, complete_verdicts = (list(verdicts) for verdicts in self._compiled)
+        for position, order in changed:
+            self._orders[position] = order
+            verdicts[position], complete_verdicts[position] = self._compile_rule(self._compiled_rules[position], order)
+        self._compiled = (tuple(verdicts), tuple(complete_verdicts))
+        return len(changed)
+
+    def _sample(self, payload: Payload, positions: Sequence[int]) -> None:
+        """Record the outcome of every comparison of the given rules that can be evaluated on the payload."""
+        if not self._sample_lock.acquire(blocking=False):
+            return
+        try:
+            self._countdown = self.sample_interval
+            if len(positions) > _MAX_SAMPLED_RULES:
+                start = self._sample_start % len(positions)
+                self._sample_start = start + _MAX_SAMPLED_RULES
+                positions = [positions[(start + i) % len(positions)] for i in range(_MAX_SAMPLED_RULES)]
+
+            keys = payload.keys()
+            outcomes: Dict[Hashable, bool] = {}
+            for position in positions:
+                entry = self._rule_comparisons[position]
+                if entry is None:
+                    compiled = self._compiled_rules[position]
+                    entry = self._rule_comparisons[position] = (
+                        frozenset(compiled.required_fields), self._distinct_comparisons(compiled)
+                    )
+                required_fields, comparisons = entry
+                if not required_fields <= keys:
+                    # The rule's verdict is decided by the missing field, not by its comparisons
+                    continue
+                for key, compare in comparisons:
+                    if key not in outcomes:
+                        try:
+                            outcomes[key] = bool(compare(payload))
+                        except (MissingFieldException, TypeMismatchException):
+                            outcomes[key] = False
+            for key, passed in outcomes.items():
+                self.statistics.record(key, passed)
+
+            self._samples += 1
+            if self._samples >= self._next_reoptimization:
+                self._next_reoptimization = self._samples + min(self._samples, _MAX_REOPTIMIZATION_INTERVAL)
+                if self._reoptimize_from is None:
+                    self._reoptimize_from = 0
+            if self._reoptimize_from is not None:
+                stop = self._reoptimize_from + _REOPTIMIZATION_STEP
+                self._reoptimize_range(self._reoptimize_from, stop)
+                self._reoptimize_from = stop if stop < len(self._compiled_rules) else None
+        finally:
+            self._sample_lock.release()
+
+    @staticmethod
+    def _distinct_comparisons(compiled: CompiledRule) -> Tuple[Tuple[Hashable, CompiledExpression], ...]:
+        comparisons = {}
+        for node in _comparisons(compiled):
+            key = predicate_key(node)
+            if key not in comparisons:
+                comparisons[key] = compile_comparison(node)
+        return tuple(comparisons.items())
+
+    def _estimate(self, node: ComparisonNode) -> Tuple[float, float]:
+        """Return the relative cost and observed pass rate of a comparison."""
+        key = predicate_key(node)
+        if node.field in self._thresholds and _is_threshold(node):
+            # One bisect per payload answers every threshold on the field
+            cost = 0.5
+        else:
+            # A shared node is computed once per payload and read from its memo slot afterwards
+            references = self._references[key]
+            cost = (comparison_cost(node) + (references - 1) * 0.3) / references
+        return cost, self.statistics.pass_rate(key)
+
+    def _operand_order(self, compiled: CompiledRule) -> Union[ComparisonNode, BinaryOpNode, Tuple[int, ...]]:
+        """Return the expression reordered for evaluation, or the order of a predicate rule's predicates."""
+        if compiled.expression_ast is not None:
+            return order_operands(compiled.expression_ast, self._estimate)
+        return tuple(order_predicates(compiled.predicate_nodes, compiled.logical_operator, self._estimate))
+
+    @staticmethod
+    def _collect_thresholds(compiled_rules: Sequence[CompiledRule]) -> Dict[str, List[Union[int, float]]]:
+        values: Dict[str, Set[Union[int, float]]] = {}
+        for compiled in compiled_rules:
+            for node in _comparisons(compiled):
+                if _is_threshold(node):
+                    values.setdefault(node.field, set()).add(node.value)
+        return {field: sorted(field_values) for field, field_values in values.items() if len(field_values) > 1}
+
+    def _allocate_slot(self) -> int:
+        self._slot_count += 1
+        return self._slot_count
+
+    def _threshold_leaf(self, node: ComparisonNode) -> Callable[[_Activation], bool]:
+        """Return a leaf answering a threshold comparison from its field's bisect position."""
+        field = node.field
+        thresholds = self._thresholds[field]
+        slot = self._threshold_slots.get(field)
+        if slot is None:
+            slot = self._threshold_slots[field] = self._allocate_slot()
+        # Position of this threshold among the field's sorted thresholds
+        rank = bisect_left(thresholds, node.value)
+        # value > t and value <= t depend on how many thresholds are below the
+        # value; value >= t and value < t on how many are at or below it
+        bound = 0 if node.operator in ('>', '<=') else 1
+        above = node.operator in ('>', '>=')
+        compare = compile_comparison(node)
+
+        def threshold_leaf(activation: _Activation) -> bool:
+            bounds = activation[slot]
+            if bounds is _UNSET:
+                bounds = activation[slot] = _locate(activation[0], field, thresholds)
+            if bounds is None:
+                return compare(activation[0])
+            if above:
+                return rank < bounds[bound]
+            return rank >= bounds[bound]
+
+        return threshold_leaf
+
+    def _leaf(self, node: ComparisonNode) -> Callable[[_Activation], bool]:
+        """Intern a comparison and return a memoizing leaf for it."""
+        if node.field in self._thresholds and _is_threshold(node):
+            return self._threshold_leaf(node)
+
+        key = predicate_key(node)
+        if self._references[key] == 1:
+            # Referenced by a single rule: nothing to share, skip the memo
+            compare_once = compile_comparison(node)
+
+            def leaf(activation: _Activation) -> bool:
+                return compare_once(activation[0])
+            return leaf
+
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = self._allocate_slot()
+            self._nodes[slot] = compile_comparison(node)
+        compare = self._nodes[slot]
+
+        def shared_leaf(activation: _Activation) -> bool:
+            outcome = activation[slot]
+            if outcome is True or outcome is False:
+                return outcome
+            if outcome is _UNSET:
+                try:
+                    outcome = bool(compare(activation[0]))
+                except (MissingFieldException, TypeMismatchException) as e:
+                    outcome = e
+                activation[slot] = outcome
+                if outcome is True or outcome is False:
+                    return outcome
+            raise outcome
+
+        return shared_leaf
+
+    def _compile_rule(
+        self,
+        compiled: CompiledRule,
+        order: Union[ComparisonNode, BinaryOpNode, Tuple[int, ...]]
+    ) -> Tuple[Callable[[_Activation], bool], Callable[[_Activation], bool]]:
+        """Compile a rule's verdict with and without its missing-field check, in the given operand order."""
+        if compiled.expression_ast is not None:
+            return self._compile_expression_rule(compiled, order)
+        verdict = self._compile_predicate_rule(compiled, order)
+        return verdict, verdict
+
+    def _compile_expression_rule(
+        self,
+        compiled: CompiledRule,
+        expression: Union[ComparisonNode, BinaryOpNode]
+    ) -> Tuple[Callable[[_Activation], bool], Callable[[_Activation], bool]]:
+        fields = compiled.required_fields
+        tree = compile_verdict_tree(expression, self._leaf)
+
+        def verdict(activation: _Activation) -> bool:
+            payload = activation[0]
+            for field in fields:
+                if field not in payload:
+                    return False
+            return tree(activation)
+
+        return verdict, tree
+
+    def _compile_predicate_rule(self, compiled: CompiledRule, order: Tuple[int, ...]) -> Callable[[_Activation], bool]:
+        leaves = tuple(self._leaf(compiled.predicate_nodes[i]) for i in order)
+        errors = (MissingFieldException, TypeMismatchException)
+
+        if compiled.logical_operator == "AND":
+            def verdict_all(activation: _Activation) -> bool:
+                for leaf in leaves:
+                    try:
+                        if not leaf(activation):
+                            return False
+                    except errors:
+                        return False
+                return True
+            return verdict_all
+
+        def verdict_any(activation: _Activation) -> bool:
+            for leaf in leaves:
+                try:
+                    if leaf(activation):
+                        return True
+                except errors:
+                    pass
+            return False
+        return verdict_any
@@ -0,0 +1,256 @@
+"""Column-wise expression evaluation over a batch of payloads.
+
+Instead of evaluating an expression once per payload, each field referenced by
+the expression is turned into a column and every comparison becomes one array
+operation over the whole batch. AND/OR combine the resulting boolean masks.
+
+Results match ExpressionEvaluator exactly: for every row the value mask holds
+the boolean result and the error mask marks rows where ExpressionEvaluator
+would raise (missing field or type mismatch). NumPy's float64 arithmetic is
+only used when it is exact, i.e. for numbers within +/-2**53; everything else
+is compared with plain Python semantics, one element at a time.
+"""
+
+import operator as _operator
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from domain.exceptions import EvaluationException, MissingFieldException, TypeMismatchException
+from domain.expression_compiler import compile_comparison
+from domain.expression_parser import BinaryOpNode, ComparisonNode
+from domain.rule_network import predicate_key
+
+NUMPY_AVAILABLE = np is not None
+
+# Largest magnitude at which every integer is exactly representable as a float64
+_EXACT_FLOAT_LIMIT = 2 ** 53
+
+_RELATIONAL_OPERATORS = {
+    '==': _operator.eq,
+    '!=': _operator.ne,
+    '>': _operator.gt,
+    '>=': _operator.ge,
+    '<': _operator.lt,
+    '<=': _operator.le,
+}
+
+Masks = Tuple["np.ndarray", "np.ndarray"]
+
+# Marks fields absent from a payload while building a column
+_MISSING = object()
+
+
+def _is_exact_number(value: Any) -> bool:
+    """Return True for ints and floats that float64 represents exactly (bools excluded)."""
+    if type(value) is float:
+        return True
+    return type(value) is int and -_EXACT_FLOAT_LIMIT <= value <= _EXACT_FLOAT_LIMIT
+
+
+class _Column:
+    """Values of one field across the batch."""
+
+    def __init__(self, field: str, payloads: Sequence[Dict[str, Any]]):
+        size = len(payloads)
+        values = [p.get(field, _MISSING) for p in payloads]
+        self.objects = np.fromiter(values, dtype=object, count=size)
+        self.present = self.objects != _MISSING
+        self.objects[~self.present] = None
+        self.values: List[Any] = self.objects.tolist()
+        self._numbers: Optional[Tuple["np.ndarray", "np.ndarray"]] = None
+
+    @property
+    def numbers(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        """Return (mask of rows holding an exact number, float64 values with 0 elsewhere)."""
+        if self._numbers is None:
+            size = len(self.values)
+            types = set(map(type, self.values))
+            if types <= {int, float} and (
+                int not in types
+                or -_EXACT_FLOAT_LIMIT <= min(v for v in self.values if type(v) is int)
+                and max(v for v in self.values if type(v) is int) <= _EXACT_FLOAT_LIMIT
+            ):
+                # Every row holds an exact number: convert the column in one go
+                self._numbers = (np.ones(size, dtype=bool), np.array(self.values, dtype=np.float64))
+            else:
+                mask = np.fromiter((_is_exact_number(v) for v in self.values), dtype=bool, count=size)
+                numbers = np.zeros(size, dtype=np.float64)
+                numbers[mask] = [v for v, is_number in zip(self.values, mask) if is_number]
+                self._numbers = (mask, numbers)
+        return self._numbers
+
+
+class VectorizedEvaluator:
+    """Evaluates expression ASTs against a batch of payloads at once."""
+
+    def __init__(self, payloads: Sequence[Dict[str, Any]]):
+        if np is None:
+            raise EvaluationException("Vectorized evaluation requires NumPy to be installed")
+        self.payloads = payloads
+        self.size = len(payloads)
+        self._columns: Dict[str, _Column] = {}
+        # Interned comparisons, shared by every rule evaluated on this batch
+        self._comparisons: Dict[Hashable, Masks] = {}
+
+    def column(self, field: str) -> _Column:
+        """Return the column for a field, building it on first use."""
+        column = self._columns.get(field)
+        if column is None:
+            column = _Column(field, self.payloads)
+            self._columns[field] = column
+        return column
+
+    def evaluate(self, node: Union[ComparisonNode, BinaryOpNode]) -> Masks:
+        """Evaluate an expression for every row.
+
+        Returns:
+            Tuple of (value mask, error mask). Where the error mask is False the
+            value mask equals ExpressionEvaluator's result; where it is True
+            ExpressionEvaluator would raise.
+        """
+        if isinstance(node, ComparisonNode):
+            return self._evaluate_comparison(node)
+        if isinstance(node, BinaryOpNode):
+            left_value, left_error = self.evaluate(node.left)
+            right_value, right_error = self.evaluate(node.right)
+            if node.operator == 'AND':
+                value = left_value & right_value
+            elif node.operator == 'OR':
+                value = left_value | right_value
+            else:
+                raise EvaluationException(f"Unknown binary operator: {node.operator}")
+            return value, left_error | right_error
+        raise EvaluationException(f"Unknown node type: {type(node)}")
+
+    def evaluate_verdict(self, node: Union[ComparisonNode, BinaryOpNode]) -> "np.ndarray":
+        """Evaluate an expression rule and return its PASS mask.
+
+        Matches evaluate_expression_detailed: rows that error do not pass.
+        """
+        value, error = self.evaluate(node)
+        return value & ~error
+
+    def evaluate_predicates(self, nodes: Sequence[ComparisonNode], logical_operator: str) -> "np.ndarray":
+        """Evaluate a predicate rule and return its PASS mask.
+
+        A predicate that errors counts as failed, as in the row-wise evaluation.
+        """
+        if logical_operator == "AND":
+            result = np.ones(self.size, dtype=bool)
+            for node in nodes:
+                value, error = self._evaluate_comparison(node)
+                result &= value & ~error
+        else:
+            result = np.zeros(self.size, dtype=bool)
+            for node in nodes:
+                value, error = self._evaluate_comparison(node)
+                result |= value & ~error
+        return result
+
+    def _evaluate_comparison(self, node: ComparisonNode) -> Masks:
+        """Return the masks for a comparison, reusing them if another rule already asked."""
+        key = predicate_key(node)
+        masks = self._comparisons.get(key)
+        if masks is None:
+            masks = self._compute_comparison(node)
+            self._comparisons[key] = masks
+        return masks
+
+    def _compute_comparison(self, node: ComparisonNode) -> Masks:
+        column = self.column(node.field)
+        relational = _RELATIONAL_OPERATORS.get(node.operator)
+
+        if node.is_field_comparison:
+            if relational is not None:
+                return self._evaluate_numeric_fields(node, relational, column, self.column(node.value))
+            return self._evaluate_rowwise(node)
+
+        if node.operator in ('==', '!='):
+            # Equality never raises, so plain Python comparison per element is exact
+            if isinstance(node.value, (list, dict)):
+                value = np.fromiter((v == node.value for v in column.values), dtype=bool, count=self.size)
+            else:
+                value = (column.objects == node.value).astype(bool)
+            if node.operator == '!=':
+                value = ~value
+            return value & column.present, ~column.present
+
+        if relational is not None and _is_exact_number(node.value):
+            return self._evaluate_numeric_literal(node, relational, column)
+
+        if node.operator in ('in', 'not_in') and isinstance(node.value, list):
+            return self._evaluate_membership(node, column)
+
+        return self._evaluate_rowwise(node)
+
+    def _evaluate_numeric_literal(self, node: ComparisonNode, relational: Any, column: _Column) -> Masks:
+        """Compare against a numeric literal: array operation for numeric rows, Python for the rest."""
+        is_number, numbers = column.numbers
+        value = relational(numbers, node.value) & is_number
+        error = ~column.present
+        others = column.present & ~is_number
+        if others.any():
+            self._evaluate_rows(node, np.flatnonzero(others), value, error)
+        return value, error
+
+    def _evaluate_numeric_fields(
+        self,
+        node: ComparisonNode,
+        relational: Any,
+        column: _Column,
+        other: _Column
+    ) -> Masks:
+        """Compare two fields: array operation where both are numbers, Python for the rest."""
+        is_number, numbers = column.numbers
+        other_is_number, other_numbers = other.numbers
+        both = is_number & other_is_number
+        present = column.present & other.present
+        value = relational(numbers, other_numbers) & both
+        error = ~present
+        others = present & ~both
+        if others.any():
+            self._evaluate_rows(node, np.flatnonzero(others), value, error)
+        return value, error
+
+    def _evaluate_membership(self, node: ComparisonNode, column: _Column) -> Masks:
+        """Evaluate in/not_in against a literal list using a set where possible."""
+        options = node.value
+        try:
+            option_set = frozenset(options)
+        except TypeError:
+            return self._evaluate_rowwise(node)
+
+        def contained(value: Any) -> bool:
+            try:
+                return value in option_set
+            except TypeError:
+                # Unhashable payload value: fall back to list semantics
+                return value in options
+
+        value = np.fromiter((contained(v) for v in column.values), dtype=bool, count=self.size)
+        if node.operator == 'not_in':
+            value = ~value
+        return value & column.present, ~column.present
+
+    def _evaluate_rowwise(self, node: ComparisonNode) -> Masks:
+        """Evaluate a comparison one row at a time with Python semantics."""
+        value = np.zeros(self.size, dtype=bool)
+        error = np.zeros(self.size, dtype=bool)
+        self._evaluate_rows(node, range(self.size), value, error)
+        return value, error
+
+    def _evaluate_rows(self, node: ComparisonNode, rows: Any, value: "np.ndarray", error: "np.ndarray") -> None:
+        """Fill value/error for the given rows using the compiled row-wise comparison."""
+        compare = compile_comparison(node)
+        payloads = self.payloads
+        for i in rows:
+            try:
+                value[i] = bool(compare(payloads[i]))
+                error[i] = False
+            except (MissingFieldException, TypeMismatchException):
+                value[i] = False
+                error[i] = True
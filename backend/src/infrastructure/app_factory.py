@@ -1,26 +1,95 @@
 """FastAPI application factory."""
 
+from contextlib import asynccontextmanager
+from pathlib import Path
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
 
 from adapters.inbound.api_router import create_rule_router
+from adapters.json_codec import JSONCodecResponse
 from adapters.outbound.file_repository import FileRuleRepository
-from application.services import EvaluationService, RuleService
+from adapters.outbound.journal_repository import JournalRuleRepository
+from adapters.outbound.rule_set_repository import FileRuleSetRepository
+from adapters.outbound.sqlite_repository import SqliteRuleRepository
+from application.evaluation_executor import EvaluationExecutor
+from application.ports import RuleRepository
+from application.rule_cache import CompiledRuleCache
+from application.rule_snapshot import RuleSnapshotStore
+from application.services import EvaluationService, RuleService, RuleSetService
 from infrastructure.config import config
 
 
+def create_repository() -> RuleRepository:
+    """Create the rule repository selected by RULES_BACKEND."""
+    if config.RULES_BACKEND == "file":
+        return FileRuleRepository(config.RULES_FILE, compact_json=config.RULES_FILE_COMPACT)
+
+    if config.RULES_BACKEND == "journal":
+        return JournalRuleRepository(
+            config.RULES_FILE,
+            compact_threshold=config.JOURNAL_COMPACT_THRESHOLD,
+            compact_json=config.RULES_FILE_COMPACT
+        )
+
+    if config.RULES_BACKEND == "sqlite":
+        repository = SqliteRuleRepository(config.RULES_DB)
+        # Seed a new database from the rules file so switching backends keeps the rules
+        if repository.version == 0 and Path(config.RULES_FILE).exists():
+            repository.save_all(FileRuleRepository(config.RULES_FILE).get_all())
+        return repository
+
+    raise ValueError(f"Unknown RULES_BACKEND: {config.RULES_BACKEND}")
+
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
 
     config.ensure_data_directory()
 
+    repository = create_repository()
+    compiled_cache = CompiledRuleCache(max_size=config.COMPILED_RULE_CACHE_SIZE)
+    # One store, so writes through RuleService swap the snapshot evaluations read
+    snapshots = RuleSnapshotStore(repository, compiled_cache)
+    rule_service = RuleService(repository, compiled_cache, snapshots=snapshots)
+    executor = EvaluationExecutor(
+        config.EVALUATION_EXECUTOR,
+        max_workers=config.EVALUATION_WORKERS or None,
+        min_chunk_cost=config.EVALUATION_MIN_CHUNK_COST
+    )
+    evaluation_service = EvaluationService(
+        repository,
+        compiled_cache,
+        vectorize_min_batch=config.VECTORIZE_MIN_BATCH or None,
+        snapshots=snapshots,
+        executor=executor
+    )
+    rule_set_service = RuleSetService(FileRuleSetRepository(config.RULESETS_FILE), evaluation_service)
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # With several workers, poll for the other workers' writes and rebuild
+        # the snapshot in the background instead of checking on every request
+        watch = isinstance(repository, FileRuleRepository) and config.RULES_WATCH_INTERVAL > 0
+        if watch:
+            repository.start_watching(config.RULES_WATCH_INTERVAL, on_change=snapshots.current)
+        try:
+            yield
+        finally:
+            if watch:
+                repository.stop_watching()
+            executor.shutdown()
+
     app = FastAPI(
         title=config.APP_NAME,
         version=config.APP_VERSION,
         description=config.APP_DESCRIPTION,
         docs_url="/docs",
         redoc_url="/redoc",
+        # orjson when installed, stdlib json otherwise
+        default_response_class=JSONCodecResponse,
+        lifespan=lifespan,
     )
 
     # Configure CORS
@@ -32,11 +101,13 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    repository = FileRuleRepository(config.RULES_FILE)
-    rule_service = RuleService(repository)
-    evaluation_service = EvaluationService(repository)
-
-    router = create_rule_router(rule_service, evaluation_service)
+    router = create_rule_router(
+        rule_service,
+        evaluation_service,
+        stream_max_line_bytes=config.STREAM_MAX_LINE_BYTES,
+        max_blocking_threads=config.MAX_BLOCKING_THREADS,
+        rule_set_service=rule_set_service
+    )
     app.include_router(router)
 
     @app.get("/", include_in_schema=False)
@@ -48,7 +119,12 @@ def create_app() -> FastAPI:
     @app.get("/health", tags=["health"])
     async def health_check():
         """Health check endpoint."""
-        return {"status": "healthy", "service": config.APP_NAME, "version": config.APP_VERSION}
+        return {
+            "status": "healthy",
+            "service": config.APP_NAME,
+            "version": config.APP_VERSION,
+            "compiled_rule_cache": compiled_cache.stats()
+        }
 
     return app
 
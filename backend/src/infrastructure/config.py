@@ -61,6 +61,41 @@ class Config:
     DATA_DIR: Path = BASE_DIR / "data"
     RULES_FILE: str = str(DATA_DIR / "rules.json")
 
+    # Rule storage backend: "file" (RULES_FILE), "journal" (RULES_FILE plus an
+    # append-only journal next to it) or "sqlite" (RULES_DB)
+    RULES_BACKEND: str = os.getenv("RULES_BACKEND", "file")
+    RULES_DB: str = os.getenv("RULES_DB", str(DATA_DIR / "rules.db"))
+    # Named rule sets, stored as JSON whatever the rules backend
+    RULESETS_FILE: str = os.getenv("RULESETS_FILE", str(DATA_DIR / "rulesets.json"))
+    # Write rules.json without indentation (smaller, faster to write and parse)
+    RULES_FILE_COMPACT: bool = os.getenv("RULES_FILE_COMPACT", "false").lower() in ("1", "true", "yes")
+    # Journal records after which the journal is folded into rules.json
+    JOURNAL_COMPACT_THRESHOLD: int = int(os.getenv("JOURNAL_COMPACT_THRESHOLD", "1000"))
+    # Seconds between checks of the rules file for writes by other worker
+    # processes (file and journal backends); 0 checks on every read instead
+    RULES_WATCH_INTERVAL: float = float(os.getenv("RULES_WATCH_INTERVAL", "1.0"))
+
+    COMPILED_RULE_CACHE_SIZE: int = int(os.getenv("COMPILED_RULE_CACHE_SIZE", "10000"))
+
+    # Smallest verdict-only batch evaluated column-wise with NumPy (0 disables)
+    VECTORIZE_MIN_BATCH: int = int(os.getenv("VECTORIZE_MIN_BATCH", "256"))
+
+    # Longest single NDJSON line accepted by the streaming evaluation endpoint
+    STREAM_MAX_LINE_BYTES: int = int(os.getenv("STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
+    # Worker threads per process running blocking service calls for the API
+    MAX_BLOCKING_THREADS: int = int(os.getenv("MAX_BLOCKING_THREADS", "40"))
+
+    # Where large evaluations run: "serial" or "process" (a pool of worker
+    # processes, which get past the GIL)
+    EVALUATION_EXECUTOR: str = os.getenv("EVALUATION_EXECUTOR", "serial")
+    # Workers in the evaluation pool (0 uses one per CPU)
+    EVALUATION_WORKERS: int = int(os.getenv("EVALUATION_WORKERS", "0"))
+    # Smallest estimated cost (relative comparison units) worth one pool
+    # task, about 3 ms of verdict-only evaluation; smaller evaluations run
+    # serially
+    EVALUATION_MIN_CHUNK_COST: float = float(os.getenv("EVALUATION_MIN_CHUNK_COST", "5000"))
+
     @classmethod
     def ensure_data_directory(cls):
         """Ensure data directory exists."""
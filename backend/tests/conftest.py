@@ -0,0 +1,36 @@
+"""Fixtures shared by the test modules."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from adapters.outbound.file_repository import FileRuleRepository
+from adapters.outbound.rule_set_repository import FileRuleSetRepository
+from application.services import EvaluationService, RuleService, RuleSetService
+
+
+@pytest.fixture
+def services(tmp_path):
+    """Rule, evaluation and rule set services wired to one rules file, as in the app."""
+    repository = FileRuleRepository(str(tmp_path / "rules.json"))
+    rule_service = RuleService(repository)
+    evaluation_service = EvaluationService(repository, rule_service.compiled_cache, snapshots=rule_service.snapshots)
+    rule_set_service = RuleSetService(FileRuleSetRepository(str(tmp_path / "rulesets.json")), evaluation_service)
+    return rule_service, evaluation_service, rule_set_service
+
+
+@pytest.fixture
+def rule_ids(services):
+    """IDs of an expression rule and a predicate rule."""
+    rule_service = services[0]
+    adult = rule_service.create_rule(
+        name="Adult", description="Adult", expression="age >= 18 OR country == 'USA'"
+    )
+    credit = rule_service.create_rule(
+        name="Credit", description="Credit",
+        predicates=[{"field": "credit_score", "operator": ">=", "value": 650}]
+    )
+    return [str(adult.id), str(credit.id)]
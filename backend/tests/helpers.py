@@ -0,0 +1,33 @@
+"""Builders shared by the test modules."""
+
+from typing import Callable
+from uuid import uuid4
+
+from application.ports import RuleRepository
+from domain.models import Predicate, Rule
+
+
+def make_rule(name="Adult", expression="age >= 18", rule_id=None):
+    """Build an expression rule named and described by `name`."""
+    return Rule(id=rule_id or uuid4(), name=name, description=name, expression=expression)
+
+
+def expression_rule(expression):
+    """Build an expression rule named after its expression."""
+    return Rule(id=uuid4(), name=expression, description=expression, expression=expression)
+
+
+def predicate_rule(logical_operator, *predicates):
+    """Build a predicate rule from (field, operator, value) triples."""
+    return Rule(
+        id=uuid4(), name="P", description="P",
+        predicates=[Predicate(field, operator, value) for field, operator, value in predicates],
+        logical_operator=logical_operator
+    )
+
+
+def create_rules(repository_factory: Callable[[], RuleRepository], count):
+    """Create `count` rules through a new repository; run in worker processes sharing one store."""
+    repository = repository_factory()
+    for i in range(count):
+        repository.create(make_rule(name=f"Rule {i}"))
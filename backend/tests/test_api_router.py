@@ -0,0 +1,229 @@
+"""Tests for the API router."""
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import anyio
+import httpx
+import pytest
+from fastapi import FastAPI
+from adapters.inbound.api_router import (
+    BatchEvaluateResponse,
+    EvaluateAllResponse,
+    EvaluateResponse,
+    create_rule_router
+)
+
+
+def make_app(services, max_blocking_threads=40, stream_max_line_bytes=1024 * 1024):
+    rule_service, evaluation_service, _ = services
+    app = FastAPI()
+    app.include_router(create_rule_router(
+        rule_service,
+        evaluation_service,
+        stream_max_line_bytes=stream_max_line_bytes,
+        max_blocking_threads=max_blocking_threads
+    ))
+    return app
+
+
+async def request(app, method, url, **kwargs):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, url, **kwargs)
+
+
+class TestBlockingCalls:
+    """Test that blocking service calls do not stall the event loop."""
+
+    def test_slow_evaluation_does_not_block_other_requests(self, services, monkeypatch):
+        """Test that a request completes while another one is blocked inside the service."""
+        rule_service, evaluation_service, _ = services
+        rule = rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18")
+        entered = threading.Event()
+        release = threading.Event()
+        evaluate = evaluation_service.evaluate
+
+        def slow_evaluate(*args, **kwargs):
+            entered.set()
+            release.wait(timeout=10)
+            return evaluate(*args, **kwargs)
+
+        monkeypatch.setattr(evaluation_service, "evaluate", slow_evaluate)
+        app = make_app(services)
+        responses = {}
+
+        async def slow_request():
+            responses["evaluate"] = await request(
+                app, "POST", "/api/v1/evaluate", json={"payload": {"age": 20}, "rule_ids": [str(rule.id)]}
+            )
+
+        async def main():
+            async with anyio.create_task_group() as tasks:
+                tasks.start_soon(slow_request)
+                while not entered.is_set():
+                    await anyio.sleep(0.01)
+                with anyio.fail_after(5):
+                    responses["list"] = await request(app, "GET", "/api/v1/rules")
+                release.set()
+
+        anyio.run(main)
+        assert responses["list"].status_code == 200
+        assert responses["evaluate"].json()["result"] == "PASS"
+
+    def test_thread_limit(self, services, monkeypatch):
+        """Test that at most max_blocking_threads service calls run at once."""
+        rule_service, _, _ = services
+        running = []
+        peak = []
+        lock = threading.Lock()
+        get_all_rules = rule_service.get_all_rules
+
+        def counting_get_all_rules():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            try:
+                threading.Event().wait(0.05)
+                return get_all_rules()
+            finally:
+                with lock:
+                    running.pop()
+
+        monkeypatch.setattr(rule_service, "get_all_rules", counting_get_all_rules)
+        app = make_app(services, max_blocking_threads=2)
+
+        async def main():
+            async with anyio.create_task_group() as tasks:
+                for _ in range(6):
+                    tasks.start_soon(request, app, "GET", "/api/v1/rules")
+
+        anyio.run(main)
+        assert len(peak) == 6
+        assert max(peak) == 2
+
+
+class TestErrors:
+    """Test how service errors map to responses."""
+
+    def test_every_missing_rule_is_reported(self, services):
+        """Test that evaluating several unknown rules names all of them in one 404."""
+        rule_service, _, _ = services
+        rule = rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18")
+        missing = ["123e4567-e89b-12d3-a456-426614174000", "123e4567-e89b-12d3-a456-426614174001"]
+        response = anyio.run(lambda: request(
+            make_app(services), "POST", "/api/v1/evaluate",
+            json={"payload": {"age": 20}, "rule_ids": [missing[0], str(rule.id), missing[1]]}
+        ))
+        assert response.status_code == 404
+        assert response.json()["detail"] == f"Rules with ids '{missing[0]}', '{missing[1]}' not found"
+
+
+class TestResponseModels:
+    """Test that evaluation endpoints, which bypass response_model serialization, still match it."""
+
+    @pytest.mark.parametrize("path, model, body", [
+        ("/api/v1/evaluate", EvaluateResponse, {"payload": {"age": 30, "credit_score": 600}}),
+        ("/api/v1/evaluate", EvaluateResponse, {"payload": {"age": 30}, "explain": False}),
+        ("/api/v1/evaluate", EvaluateResponse, {"payload": {"credit_score": 600}, "stop_on_first_fail": True}),
+        ("/api/v1/evaluate/all", EvaluateAllResponse, {"payload": {"age": 30, "credit_score": 700}}),
+        ("/api/v1/evaluate/batch", BatchEvaluateResponse, {"payloads": [{"age": 30}, {"age": "x"}], "explain_indices": [1]}),
+    ])
+    def test_response_matches_declared_model(self, services, rule_ids, path, model, body):
+        """Test that the OpenAPI schema names the model and the response validates against it unchanged."""
+        app = make_app(services)
+        schema = app.openapi()["paths"][path]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema == {"$ref": f"#/components/schemas/{model.__name__}"}
+
+        if path != "/api/v1/evaluate/all":
+            body = {"rule_ids": rule_ids, **body}
+        response = anyio.run(lambda: request(app, "POST", path, json=body))
+        assert response.status_code == 200
+        data = response.json()
+        assert model.model_validate(data).model_dump(exclude_unset=True) == data
+
+
+class TestStopOnFirstFail:
+    """Test the stop_on_first_fail option of the evaluation endpoints."""
+
+    def test_skipped_rules_reported(self, services):
+        """Test that rules left out after a failure are listed."""
+        rule_service, _, _ = services
+        failing = rule_service.create_rule(name="Senior", description="Senior", expression="age >= 65")
+        passing = rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18")
+        rule_ids = [str(passing.id), str(failing.id)]
+        app = make_app(services)
+
+        async def main():
+            results = []
+            for stop_on_first_fail in (False, True, True):
+                response = await request(app, "POST", "/api/v1/evaluate", json={
+                    "payload": {"age": 30}, "rule_ids": rule_ids, "stop_on_first_fail": stop_on_first_fail
+                })
+                results.append(response.json())
+            return results
+
+        full, first, learned = anyio.run(main)
+        assert "skipped_rules" not in full
+        assert first["result"] == learned["result"] == "FAIL"
+        assert len(first["details"]) + len(first["skipped_rules"]) == 2
+        # The failing rule has been seen failing, so it now runs first
+        assert learned["skipped_rules"] == [str(passing.id)]
+        assert [d["rule_id"] for d in learned["details"]] == [str(failing.id)]
+
+
+class TestEvaluateStream:
+    """Test the NDJSON streaming evaluation endpoint."""
+
+    @pytest.fixture
+    def stream(self, services):
+        rule_service, _, _ = services
+        rule = rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18")
+        app = make_app(services, stream_max_line_bytes=32)
+
+        def post(chunks):
+            async def body():
+                # Each chunk reaches the endpoint as a separate piece of the request body
+                for chunk in chunks:
+                    yield chunk
+
+            response = anyio.run(lambda: request(
+                app, "POST", "/api/v1/evaluate/stream", params={"rule_ids": [str(rule.id)]}, content=body()
+            ))
+            assert response.status_code == 200
+            return [json.loads(line) for line in response.text.splitlines()]
+
+        return post
+
+    def test_lines_across_chunks(self, stream):
+        """Test that lines split over chunks are evaluated in order and blank lines are skipped."""
+        records = stream([b'{"age": 20}\n\n{"a', b'ge": 10}\n  \n', b'{"age": 30}\n'])
+        assert [(r["index"], r["result"]) for r in records] == [(0, "PASS"), (1, "FAIL"), (2, "PASS")]
+
+    def test_last_line_without_newline(self, stream):
+        """Test that a final line without a trailing newline is evaluated."""
+        records = stream([b'{"age": 20}\n{"age": 5}'])
+        assert [r["result"] for r in records] == ["PASS", "FAIL"]
+
+    def test_invalid_lines(self, stream):
+        """Test that invalid JSON and non-object lines are reported without ending the stream."""
+        records = stream([b'{"age": \n[1, 2]\n{"age": 40}\n'])
+        assert records[0]["index"] == 0 and records[0]["error"].startswith("Invalid JSON")
+        assert records[1] == {"index": 1, "error": "Each line must be a JSON object"}
+        assert records[2]["result"] == "PASS"
+
+    @pytest.mark.parametrize("chunks", [
+        [b'{"age": 20}\n{"name": "', b"x" * 40, b'"}\n{"age": 30}\n'],
+        [b'{"age": 20}\n{"name": "' + b"x" * 40 + b'"}\n{"age": 30}\n'],
+    ], ids=["split", "one_chunk"])
+    def test_oversized_line(self, stream, chunks):
+        """Test that a line over the limit ends the stream with an error, however it arrives."""
+        records = stream(chunks)
+        assert records[0]["result"] == "PASS"
+        assert records[1] == {"index": 1, "error": "Line exceeds the maximum length of 32 bytes"}
+        assert len(records) == 2
@@ -0,0 +1,128 @@
+"""Tests for spreading evaluations over worker processes."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from application.evaluation_executor import EvaluationExecutor, split
+from application import services as services_module
+from application.services import EvaluationService
+
+
+@pytest.fixture
+def rule_service(services):
+    return services[0]
+
+
+@pytest.fixture
+def mixed_rule_ids(rule_service, rule_ids):
+    """The shared rules plus rules mixing AND/OR, `in` and `contains`."""
+    rules = [
+        rule_service.create_rule(
+            name="Senior", description="Senior", expression="age >= 65 AND (country == 'UK' OR country == 'IE')"
+        ),
+        rule_service.create_rule(
+            name="Country", description="Country",
+            predicates=[{"field": "country", "operator": "in", "value": ["UK", "USA"]}]
+        ),
+        rule_service.create_rule(name="Income", description="Income", expression="income > 1000 OR age < 25"),
+        rule_service.create_rule(name="Tags", description="Tags", expression="tags contains 'vip'"),
+    ]
+    return rule_ids + [str(rule.id) for rule in rules]
+
+
+PAYLOADS = [
+    {"age": 70, "country": "UK", "income": 500, "tags": ["vip"], "credit_score": 700},
+    {"age": 20, "country": "FR", "income": 2000, "tags": [], "credit_score": 600},
+    {"age": 30},
+    {"age": "old", "country": "USA", "income": None, "tags": "vip", "credit_score": "high"},
+    {"age": 17, "country": "IE", "income": 5000, "tags": ["vip", "new"], "credit_score": 650},
+]
+
+
+def evaluation_service(rule_service, executor=None):
+    return EvaluationService(
+        rule_service.repository,
+        rule_service.compiled_cache,
+        vectorize_min_batch=None,
+        snapshots=rule_service.snapshots,
+        executor=executor
+    )
+
+
+class TestEvaluationExecutor:
+    """Test the executor and its serial fallback."""
+
+    def test_chunk_count(self):
+        """Test that work is only split when every chunk is worth a task."""
+        assert EvaluationExecutor("serial", 4, min_chunk_cost=10).chunk_count(1000) == 1
+        assert EvaluationExecutor("process", 1, min_chunk_cost=10).chunk_count(1000) == 1
+
+        executor = EvaluationExecutor("process", 4, min_chunk_cost=10)
+        assert executor.chunk_count(5) == 1
+        assert executor.chunk_count(25) == 2
+        assert executor.chunk_count(1000) == 4
+
+    def test_transfer_cost_keeps_work_serial(self):
+        """Test that work is not split when copying results back costs more than the split saves."""
+        executor = EvaluationExecutor("process", 4, min_chunk_cost=10)
+        assert executor.chunk_count(1000, transfer_cost=700) == 4
+        assert executor.chunk_count(1000, transfer_cost=750) == 1
+
+    def test_invalid_settings(self):
+        """Test that unknown kinds, including threads, and non-positive chunk costs are rejected."""
+        with pytest.raises(ValueError):
+            EvaluationExecutor("fibers")
+        with pytest.raises(ValueError):
+            EvaluationExecutor("thread")
+        with pytest.raises(ValueError):
+            EvaluationExecutor("process", min_chunk_cost=0)
+
+    def test_map_keeps_task_order(self):
+        """Test that results come back in task order."""
+        executor = EvaluationExecutor("process", 2)
+        try:
+            assert executor.map(pow, [(i, 2) for i in range(20)]) == [i * i for i in range(20)]
+        finally:
+            executor.shutdown()
+
+    def test_split(self):
+        """Test that items are split into contiguous, nearly equal runs."""
+        assert split([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+        assert split([1, 2], 5) == [[1], [2]]
+        assert [list(run) for run in split(range(7), 3)] == [[0, 1, 2], [3, 4], [5, 6]]
+
+
+class TestParallelEvaluation:
+    """Test that spread evaluations match serial ones."""
+
+    def test_matches_serial(self, rule_service, mixed_rule_ids, monkeypatch):
+        """Test batches and single payloads, split by payload and by rule."""
+        serial = evaluation_service(rule_service)
+        executor = EvaluationExecutor("process", 3, min_chunk_cost=1)
+        # Split however small the job, whatever copying the results back costs
+        monkeypatch.setattr(services_module, "_RESULT_TRANSFER_COST", 0.0)
+        parallel = evaluation_service(rule_service, executor)
+        try:
+            for explain in (True, False):
+                expected = serial.evaluate_batch(PAYLOADS, mixed_rule_ids, explain=explain, explain_indices=[1])
+                actual = parallel.evaluate_batch(PAYLOADS, mixed_rule_ids, explain=explain, explain_indices=[1])
+                assert actual.results == expected.results
+
+                for payload in PAYLOADS:
+                    assert parallel.evaluate(payload, mixed_rule_ids, explain=explain) == serial.evaluate(
+                        payload, mixed_rule_ids, explain=explain
+                    )
+        finally:
+            executor.shutdown()
+
+    def test_small_jobs_run_serially(self, rule_service, mixed_rule_ids):
+        """Test that jobs below the chunk cost never reach the pool."""
+        executor = EvaluationExecutor("process", 4)
+        service = evaluation_service(rule_service, executor)
+        service.evaluate_batch(PAYLOADS, mixed_rule_ids, explain=True)
+        service.evaluate(PAYLOADS[0], mixed_rule_ids)
+        assert executor._pool is None
@@ -0,0 +1,166 @@
+"""Tests for the evaluation service."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from domain.exceptions import EvaluationException, RuleNotFoundException
+from domain.models import RuleEffect
+
+
+class TestEvaluate:
+    """Test single-payload evaluation."""
+
+    def test_detailed(self, services, rule_ids):
+        """Test that the detailed mode reports every comparison."""
+        _, evaluation_service, _ = services
+        response = evaluation_service.evaluate({"age": 25, "country": "UK", "credit_score": 700}, rule_ids)
+        assert response.result == RuleEffect.PASS
+        assert len(response.details[0].predicate_results) == 2
+
+    def test_verdict_only(self, services, rule_ids):
+        """Test that explain=False gives the same verdict without details."""
+        _, evaluation_service, _ = services
+        payload = {"age": 25, "country": "UK", "credit_score": 600}
+        detailed = evaluation_service.evaluate(payload, rule_ids)
+        fast = evaluation_service.evaluate(payload, rule_ids, explain=False)
+        assert fast.result == detailed.result == RuleEffect.FAIL
+        assert [d.result for d in fast.details] == [d.result for d in detailed.details]
+        assert all(d.predicate_results == [] for d in fast.details)
+
+    def test_unknown_rule(self, services):
+        """Test that unknown rule IDs are reported."""
+        _, evaluation_service, _ = services
+        with pytest.raises(RuleNotFoundException):
+            evaluation_service.evaluate({}, ["123e4567-e89b-12d3-a456-426614174000"])
+
+    def test_invalid_rule_id(self, services):
+        """Test that malformed rule IDs are rejected."""
+        _, evaluation_service, _ = services
+        with pytest.raises(EvaluationException):
+            evaluation_service.evaluate({}, ["not-a-uuid"])
+
+
+class TestEvaluateBatch:
+    """Test batch evaluation."""
+
+    def test_results_in_order(self, services, rule_ids):
+        """Test that one result is returned per payload, in order."""
+        _, evaluation_service, _ = services
+        payloads = [
+            {"age": 25, "country": "UK", "credit_score": 700},
+            {"age": 12, "country": "UK", "credit_score": 700},
+            {"age": 12, "country": "USA", "credit_score": 700}
+        ]
+        batch = evaluation_service.evaluate_batch(payloads, rule_ids)
+        assert [r.result for r in batch.results] == [RuleEffect.PASS, RuleEffect.FAIL, RuleEffect.PASS]
+
+        summary = batch.to_dict()
+        assert summary["count"] == 3
+        assert summary["passed"] == 2
+        assert summary["failed"] == 1
+
+    def test_matches_single_evaluation(self, services, rule_ids):
+        """Test that batch results equal evaluating each payload on its own."""
+        _, evaluation_service, _ = services
+        payloads = [{"age": 30, "country": "UK", "credit_score": 500}, {"age": "x", "country": "UK"}]
+        batch = evaluation_service.evaluate_batch(payloads, rule_ids, explain=True)
+        for payload, result in zip(payloads, batch.results):
+            assert result.to_dict() == evaluation_service.evaluate(payload, rule_ids).to_dict()
+
+    def test_empty_batch(self, services, rule_ids):
+        """Test that an empty batch is rejected."""
+        _, evaluation_service, _ = services
+        with pytest.raises(EvaluationException):
+            evaluation_service.evaluate_batch([], rule_ids)
+
+
+class TestEvaluateAll:
+    """Test evaluation against the whole rule base."""
+
+    def test_only_applicable_rules(self, services, rule_ids):
+        """Test that rules whose fields are absent are skipped."""
+        _, evaluation_service, _ = services
+        response = evaluation_service.evaluate_all({"credit_score": 700})
+        summary = response.to_dict()
+        assert summary["total_rules"] == 2
+        assert summary["evaluated_rules"] == 1
+        assert summary["matched"] == [rule_ids[1]]
+
+    def test_matches_explicit_evaluation(self, services, rule_ids):
+        """Test verdicts equal evaluating the same rules by ID, with and without details."""
+        _, evaluation_service, _ = services
+        payload = {"age": 30, "country": "UK", "credit_score": 500}
+        expected = evaluation_service.evaluate(payload, rule_ids)
+        for explain in (False, True):
+            response = evaluation_service.evaluate_all(payload, explain=explain)
+            assert [d.result for d in response.details] == [d.result for d in expected.details]
+        assert response.to_dict()["details"] == [d.to_dict() for d in expected.details]
+
+    def test_sees_new_rules(self, services, rule_ids):
+        """Test that the cached index is rebuilt when rules change."""
+        rule_service, evaluation_service, _ = services
+        evaluation_service.evaluate_all({"age": 30})
+        rule_service.create_rule(name="Senior", description="Senior", expression="age >= 65")
+        assert evaluation_service.evaluate_all({"age": 30}).to_dict()["total_rules"] == 3
+
+
+class TestStopOnFirstFail:
+    """Test evaluation that stops at the first failing rule."""
+
+    @pytest.fixture
+    def many_rule_ids(self, services, rule_ids):
+        rule_service, _, _ = services
+        strict = rule_service.create_rule(
+            name="Strict", description="Strict", expression="credit_score >= 800 AND tags contains 'vip'"
+        )
+        return rule_ids + [str(strict.id)]
+
+    @pytest.mark.parametrize("explain", [True, False])
+    def test_all_pass(self, services, rule_ids, explain):
+        """Test that nothing is skipped when every rule passes."""
+        _, evaluation_service, _ = services
+        payload = {"age": 25, "country": "UK", "credit_score": 700}
+        response = evaluation_service.evaluate(payload, rule_ids, explain=explain, stop_on_first_fail=True)
+        expected = evaluation_service.evaluate(payload, rule_ids, explain=explain)
+        assert response.details == expected.details
+        assert response.skipped_rules == []
+        assert response.to_dict()["skipped_rules"] == []
+        assert "skipped_rules" not in expected.to_dict()
+
+    @pytest.mark.parametrize("explain", [True, False])
+    def test_stops_and_learns(self, services, many_rule_ids, explain):
+        """Test that a rule that keeps failing is tried first and the others are skipped."""
+        _, evaluation_service, _ = services
+        payload = {"age": 25, "country": "UK", "credit_score": 700, "tags": []}
+        for _ in range(5):
+            response = evaluation_service.evaluate(payload, many_rule_ids, explain=explain, stop_on_first_fail=True)
+            assert response.result == RuleEffect.FAIL
+
+        assert [str(d.rule_id) for d in response.details] == [many_rule_ids[2]]
+        assert [str(rule_id) for rule_id in response.skipped_rules] == many_rule_ids[:2]
+        full = evaluation_service.evaluate(payload, many_rule_ids, explain=explain)
+        assert response.details[0] == full.details[2]
+
+    def test_same_verdict(self, services, many_rule_ids):
+        """Test that the overall result always matches a full evaluation."""
+        _, evaluation_service, _ = services
+        payloads = [
+            {"age": 10, "country": "UK", "credit_score": 900, "tags": ["vip"]},
+            {"age": 10, "country": "USA", "credit_score": 900, "tags": ["vip"]},
+            {"age": 30, "credit_score": 600},
+            {"age": "x", "country": "UK", "credit_score": 820, "tags": "vip"},
+            {},
+        ]
+        for _ in range(3):
+            for payload in payloads:
+                for explain in (True, False):
+                    stopped = evaluation_service.evaluate(payload, many_rule_ids, explain, stop_on_first_fail=True)
+                    full = evaluation_service.evaluate(payload, many_rule_ids, explain)
+                    assert stopped.result == full.result
+                    evaluated = {str(d.rule_id) for d in stopped.details}
+                    assert [d for d in full.details if str(d.rule_id) in evaluated] == stopped.details
+                    assert len(evaluated) + len(stopped.skipped_rules) == len(many_rule_ids)
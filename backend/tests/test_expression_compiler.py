@@ -0,0 +1,211 @@
+"""Tests for the closure-based expression compiler."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from domain.expression_parser import parse_expression
+from domain.expression_evaluator import evaluate_expression, evaluate_expression_detailed
+from domain.expression_compiler import (
+    compile_comparison,
+    compile_expression,
+    compile_expression_detailed,
+    compile_expression_verdict,
+    compile_predicates_verdict,
+    compile_verdict_tree
+)
+from domain.exceptions import EvaluationException, MissingFieldException, TypeMismatchException
+from domain.expression_parser import BinaryOpNode, ComparisonNode
+
+
+EXPRESSIONS = [
+    "age >= 18",
+    "age > 18 AND age < 65",
+    "age <= 17 OR age != 30",
+    "(age >= 21 AND credit_score >= 700 AND debt_ratio < 0.4) OR net_worth > 1000000",
+    "country in ['USA', 'Canada'] AND status not_in ['banned']",
+    "email contains '@' AND tags not_contains 'spam'",
+    "ip_country == account_country",
+    "age > credit_score OR country == 'UK'",
+    "status == null OR verified == true",
+    "age >= 18 OR email contains '@'",
+    "(age >= 18 AND email contains '@') OR country == 'USA'",
+    "(country == 'USA' OR age > 30) AND (tags contains 'vip' OR credit_score >= 700)",
+    "(age < 18 AND country in ['UK']) OR (credit_score > 600 AND debt_ratio < 0.4) OR verified == true",
+]
+
+PAYLOADS = [
+    {"age": 25, "credit_score": 720, "debt_ratio": 0.3, "net_worth": 5, "country": "USA",
+     "status": "active", "email": "a@b.c", "tags": ["vip"], "ip_country": "US",
+     "account_country": "US", "verified": True},
+    {"age": 17, "credit_score": 600, "debt_ratio": 0.5, "net_worth": 2000000, "country": "UK",
+     "status": "banned", "email": "nope", "tags": ["spam"], "ip_country": "US",
+     "account_country": "FR", "verified": False},
+    {"age": "old", "credit_score": None, "debt_ratio": "x", "net_worth": 1, "country": 1,
+     "status": None, "email": 5, "tags": 3, "ip_country": 1, "account_country": "1",
+     "verified": None},
+    {"age": 30},
+    {},
+]
+
+# Payloads where one operand is mistyped, so skipping it would hide an error
+MISTYPED_PAYLOADS = [
+    {"age": 25, "email": 5, "country": "USA", "tags": ["vip"], "credit_score": 800,
+     "debt_ratio": 0.1, "verified": True},
+    {"age": 10, "email": "a@b", "country": "USA", "tags": 7, "credit_score": 800,
+     "debt_ratio": "low", "verified": True},
+    {"age": "x", "email": "a@b", "country": "USA", "tags": ["vip"], "credit_score": "high",
+     "debt_ratio": 0.1, "verified": True},
+]
+
+
+def _outcome(fn, *args):
+    try:
+        return ("ok", fn(*args))
+    except Exception as e:
+        return (type(e).__name__, str(e))
+
+
+class TestParity:
+    """Compiled expressions must behave exactly like the tree-walking evaluator."""
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    def test_evaluate_matches_evaluator(self, expression):
+        """Test results and raised exceptions match for every payload."""
+        ast = parse_expression(expression)
+        compiled = compile_expression(ast)
+        for payload in PAYLOADS:
+            assert _outcome(compiled, payload) == _outcome(evaluate_expression, ast, payload)
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    def test_detailed_matches_evaluator(self, expression):
+        """Test detailed comparison results match for every payload."""
+        ast = parse_expression(expression)
+        compiled = compile_expression_detailed(ast)
+        for payload in PAYLOADS:
+            assert compiled(payload) == evaluate_expression_detailed(ast, payload)
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    def test_verdict_matches_detailed(self, expression):
+        """Test the short-circuit verdict equals the detailed result for every payload."""
+        ast = parse_expression(expression)
+        verdict = compile_expression_verdict(ast)
+        for payload in PAYLOADS + MISTYPED_PAYLOADS:
+            assert verdict(payload) == evaluate_expression_detailed(ast, payload)[0]
+
+
+class TestCompiledEvaluation:
+    """Test behaviour of compiled expressions directly."""
+
+    def test_reusable_across_payloads(self):
+        """Test that one compiled expression can be called repeatedly."""
+        compiled = compile_expression(parse_expression("age >= 18"))
+        assert compiled({"age": 18}) is True
+        assert compiled({"age": 17}) is False
+
+    def test_missing_field(self):
+        """Test that missing fields raise MissingFieldException."""
+        compiled = compile_expression(parse_expression("age >= 18"))
+        with pytest.raises(MissingFieldException):
+            compiled({})
+
+    def test_type_mismatch(self):
+        """Test that incomparable types raise TypeMismatchException."""
+        compiled = compile_expression(parse_expression("age >= 18"))
+        with pytest.raises(TypeMismatchException):
+            compiled({"age": "eighteen"})
+
+    def test_no_short_circuit(self):
+        """Test that both sides of AND are evaluated."""
+        compiled = compile_expression(parse_expression("age >= 18 AND name == 'x'"))
+        with pytest.raises(MissingFieldException):
+            compiled({"age": 10})
+
+    def test_detailed_records_every_comparison(self):
+        """Test that the detailed form reports all comparisons."""
+        compiled = compile_expression_detailed(parse_expression("age >= 18 OR country == 'USA'"))
+        passed, results = compiled({"age": 25, "country": "UK"})
+        assert passed is True
+        assert [r["passed"] for r in results] == [True, False]
+
+    def test_unsupported_operator(self):
+        """Test that unknown operators are rejected at compile time."""
+        with pytest.raises(EvaluationException):
+            compile_expression(ComparisonNode(field="age", operator="~", value=1))
+
+    def test_unknown_binary_operator(self):
+        """Test that unknown binary operators are rejected at compile time."""
+        node = BinaryOpNode(
+            operator="XOR",
+            left=ComparisonNode(field="a", operator="==", value=1),
+            right=ComparisonNode(field="b", operator="==", value=1)
+        )
+        with pytest.raises(EvaluationException):
+            compile_expression(node)
+
+
+class TestVerdictShortCircuit:
+    """Test that verdict-only evaluation skips work it does not need."""
+
+    @staticmethod
+    def _counting_tree(expression):
+        calls = []
+
+        def leaf_factory(node):
+            compare = compile_comparison(node)
+
+            def counted(payload):
+                calls.append(node.field)
+                return compare(payload)
+            return counted
+
+        return compile_verdict_tree(parse_expression(expression), leaf_factory), calls
+
+    def test_and_stops_at_first_false(self):
+        """Test that a false left operand skips the right operand of a top-level AND."""
+        tree, calls = self._counting_tree("age >= 18 AND score > 100")
+        assert tree({"age": 10, "score": 500}) is False
+        assert calls == ["age"]
+
+    def test_or_stops_at_first_true_when_right_cannot_raise(self):
+        """Test that OR skips an equality operand once the result is known."""
+        tree, calls = self._counting_tree("age >= 18 OR country == 'USA'")
+        assert tree({"age": 25, "country": "UK"}) is True
+        assert calls == ["age"]
+
+    def test_or_still_checks_operand_that_could_raise(self):
+        """Test that a skipped operand that can raise is still checked on PASS."""
+        tree, calls = self._counting_tree("age >= 18 OR score > 100")
+        assert tree({"age": 25, "score": "high"}) is False
+        assert calls == ["age", "score"]
+
+    def test_missing_field_fails(self):
+        """Test that the payload-level verdict fails on missing fields."""
+        verdict = compile_expression_verdict(parse_expression("age >= 18 OR country == 'USA'"))
+        assert verdict({"age": 25}) is False
+
+
+class TestPredicatesVerdict:
+    """Test verdict-only evaluation of predicate rules."""
+
+    def _evaluators(self):
+        return [
+            compile_comparison(ComparisonNode(field="age", operator=">=", value=18)),
+            compile_comparison(ComparisonNode(field="country", operator="==", value="USA"))
+        ]
+
+    def test_and(self):
+        """Test AND requires every predicate to pass."""
+        verdict = compile_predicates_verdict(self._evaluators(), "AND")
+        assert verdict({"age": 20, "country": "USA"}) is True
+        assert verdict({"age": 20, "country": "UK"}) is False
+        assert verdict({"age": "x", "country": "USA"}) is False
+
+    def test_or(self):
+        """Test OR treats erroring predicates as failed."""
+        verdict = compile_predicates_verdict(self._evaluators(), "OR")
+        assert verdict({"age": "x", "country": "USA"}) is True
+        assert verdict({"country": "UK"}) is False
@@ -0,0 +1,303 @@
+"""Tests for the file-based rule repository."""
+
+import json
+import multiprocessing
+import os
+import sys
+import threading
+from functools import partial
+from pathlib import Path
+from uuid import uuid4
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from adapters import json_codec
+from adapters.outbound import atomic_json_file
+from adapters.outbound.file_repository import FileRuleRepository
+from domain.models import Rule
+from tests.helpers import create_rules, make_rule
+
+
+def touch(path):
+    """Bump the mtime so the change is visible even on coarse-grained filesystems."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return FileRuleRepository(str(tmp_path / "rules.json"))
+
+
+class TestCrud:
+    """Test basic CRUD behaviour."""
+
+    def test_creates_empty_file(self, repository):
+        """Test that a missing file is created with an empty list."""
+        assert json.loads(repository.file_path.read_text()) == []
+        assert repository.get_all() == []
+
+    def test_create_and_get(self, repository):
+        """Test creating a rule and reading it back."""
+        rule = repository.create(make_rule())
+        assert repository.get_by_id(rule.id) == rule
+        assert repository.get_all() == [rule]
+
+    def test_update(self, repository):
+        """Test updating an existing rule."""
+        rule = repository.create(make_rule())
+        updated = Rule(id=rule.id, name="Senior", description="Senior", expression="age >= 65")
+        repository.update(updated)
+        assert repository.get_by_id(rule.id).expression == "age >= 65"
+
+    def test_delete(self, repository):
+        """Test deleting a rule."""
+        rule = repository.create(make_rule())
+        assert repository.delete(rule.id) is True
+        assert repository.delete(rule.id) is False
+        assert repository.get_by_id(rule.id) is None
+
+    def test_preserves_insertion_order(self, repository):
+        """Test that get_all returns rules in file order."""
+        rules = [repository.create(make_rule(name=f"Rule {i}")) for i in range(5)]
+        assert [r.id for r in repository.get_all()] == [r.id for r in rules]
+
+    def test_get_many(self, repository):
+        """Test looking up several rules at once, skipping unknown IDs."""
+        rules = [repository.create(make_rule(name=f"Rule {i}")) for i in range(3)]
+        unknown = uuid4()
+        found = repository.get_many([rules[2].id, unknown, rules[0].id, rules[0].id])
+        assert found == {rules[2].id: rules[2], rules[0].id: rules[0]}
+        assert repository.get_many([]) == {}
+
+
+    def test_compact_json(self, tmp_path):
+        """Test that the compact format writes no indentation and reads back the same rules."""
+        path = str(tmp_path / "rules.json")
+        rule = FileRuleRepository(path, compact_json=True).create(make_rule())
+        assert "\n" not in Path(path).read_text()
+        assert FileRuleRepository(path).get_all() == [rule]
+
+class TestInMemoryIndex:
+    """Test that the in-memory index is reused and invalidated correctly."""
+
+    def test_lookup_does_not_reread_file(self, repository, monkeypatch):
+        """Test that repeated lookups are served from memory."""
+        rule = repository.create(make_rule())
+        calls = []
+        original = repository._read_rules
+        monkeypatch.setattr(repository, "_read_rules", lambda: calls.append(1) or original())
+
+        for _ in range(20):
+            assert repository.get_by_id(rule.id) is not None
+        assert calls == []
+
+    def test_external_change_is_picked_up(self, repository):
+        """Test that editing the file on disk invalidates the index."""
+        rule = repository.create(make_rule())
+        version = repository.version
+
+        other = make_rule(name="Other")
+        data = [rule.to_dict(), other.to_dict()]
+        repository.file_path.write_text(json.dumps(data))
+        # Force a different mtime even on coarse-grained filesystems
+        stat = os.stat(repository.file_path)
+        os.utime(repository.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert repository.get_by_id(other.id) is not None
+        assert repository.version > version
+
+    def test_two_instances_share_file(self, tmp_path):
+        """Test that a second repository sees writes made by the first."""
+        path = str(tmp_path / "rules.json")
+        first = FileRuleRepository(path)
+        second = FileRuleRepository(path)
+        assert second.get_all() == []
+
+        rule = first.create(make_rule())
+        assert second.get_by_id(rule.id) == rule
+
+
+class TestAtomicWrites:
+    """Test that the rules file is replaced atomically."""
+
+    def test_failed_write_keeps_previous_file(self, repository, monkeypatch):
+        """Test that an error while writing leaves the old file and no temp file behind."""
+        rule = repository.create(make_rule())
+        before = repository.file_path.read_text()
+
+        def failing_dump(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(json_codec, "dumps", failing_dump)
+        with pytest.raises(OSError):
+            repository.create(make_rule(name="Other"))
+
+        assert repository.file_path.read_text() == before
+        assert set(os.listdir(repository.file_path.parent)) - {repository.lock_path.name} == {repository.file_path.name}
+        assert repository.get_all() == [rule]
+
+    def test_failed_rename_removes_temp_file(self, repository, monkeypatch):
+        """Test that a write failing after the temp file was written removes it."""
+        repository.create(make_rule())
+        before = repository.file_path.read_text()
+
+        def failing_replace(*args, **kwargs):
+            raise OSError("rename failed")
+
+        monkeypatch.setattr(atomic_json_file.os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            repository.create(make_rule(name="Other"))
+
+        assert repository.file_path.read_text() == before
+        assert set(os.listdir(repository.file_path.parent)) - {repository.lock_path.name} == {repository.file_path.name}
+
+    def test_write_replaces_inode(self, repository):
+        """Test that writes rename a new file into place instead of truncating the old one."""
+        inode = os.stat(repository.file_path).st_ino
+        repository.create(make_rule())
+        assert os.stat(repository.file_path).st_ino != inode
+
+
+class TestConcurrentReads:
+    """Test that readers do not serialize on the writer lock or on reloads."""
+
+    def test_reads_do_not_wait_for_writers(self, repository):
+        """Test that reads complete while a writer holds the lock."""
+        rule = repository.create(make_rule())
+        results = []
+
+        with repository._lock:
+            reader = threading.Thread(target=lambda: results.append(repository.get_by_id(rule.id)))
+            reader.start()
+            reader.join(timeout=5)
+            assert not reader.is_alive()
+
+        assert results == [rule]
+
+    def test_concurrent_reload_serves_current_index(self, repository, monkeypatch):
+        """Test that a reader does not re-parse the file while another thread reloads it."""
+        rule = repository.create(make_rule())
+        stat = os.stat(repository.file_path)
+        os.utime(repository.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        calls = []
+        original = repository._read_rules
+        monkeypatch.setattr(repository, "_read_rules", lambda: calls.append(1) or original())
+
+        with repository._reload_lock:
+            assert repository.get_all() == [rule]
+        assert calls == []
+
+        assert repository.get_all() == [rule]
+        assert calls == [1]
+
+    def test_reload_does_not_overwrite_newer_write(self, repository, monkeypatch):
+        """Test that rules a reload parsed are dropped if a writer published newer ones meanwhile."""
+        first = repository.create(make_rule())
+        touch(repository.file_path)
+        newer = make_rule(name="Newer")
+        original = repository._read_consistent
+
+        def read_then_write(signature):
+            result = original(signature)
+            repository.save_all([first, newer])
+            return result
+
+        monkeypatch.setattr(repository, "_read_consistent", read_then_write)
+        assert [r.id for r in repository.get_all()] == [first.id, newer.id]
+        monkeypatch.undo()
+        assert [r.id for r in repository.get_all()] == [first.id, newer.id]
+
+    def test_writer_waits_for_reload(self, repository):
+        """Test that writers always build on the latest rules on disk."""
+        first = repository.create(make_rule())
+        other = make_rule(name="Other")
+        repository.file_path.write_text(json.dumps([first.to_dict(), other.to_dict()]))
+        stat = os.stat(repository.file_path)
+        os.utime(repository.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        third = repository.create(make_rule(name="Third"))
+        assert [r.id for r in repository.get_all()] == [first.id, other.id, third.id]
+
+
+class TestCrossProcess:
+    """Test sharing one rules file between processes."""
+
+    def test_concurrent_writers_lose_nothing(self, tmp_path):
+        """Test that writes from several processes are all kept."""
+        path = str(tmp_path / "rules.json")
+        FileRuleRepository(path)
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=create_rules, args=(partial(FileRuleRepository, path), 25)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+            assert worker.exitcode == 0
+
+        assert len(FileRuleRepository(path).get_all()) == 100
+
+
+class TestWatching:
+    """Test change detection by the background watcher."""
+
+    def test_reads_skip_the_file_while_watched(self, repository, monkeypatch):
+        """Test that reads do not stat the file while a watcher is running."""
+        rule = repository.create(make_rule())
+        repository.start_watching(interval=60)
+        try:
+            calls = []
+            original = repository._file_signature
+            monkeypatch.setattr(repository, "_file_signature", lambda: calls.append(1) or original())
+            assert repository.get_by_id(rule.id) == rule
+            assert repository.version > 0
+            assert calls == []
+        finally:
+            repository.stop_watching()
+
+    def test_poll_picks_up_external_change(self, repository):
+        """Test that one poll loads a change made by another process and notifies listeners."""
+        rule = repository.create(make_rule())
+        changes = []
+        watcher = repository.start_watching(interval=60, on_change=lambda: changes.append(1))
+        try:
+            assert not watcher.poll()
+
+            other = make_rule(name="Other")
+            repository.file_path.write_text(json.dumps([rule.to_dict(), other.to_dict()]))
+            touch(repository.file_path)
+            assert repository.get_by_id(other.id) is None
+
+            assert watcher.poll()
+            assert changes == [1]
+            assert repository.get_by_id(other.id) == other
+        finally:
+            repository.stop_watching()
+
+    def test_watcher_thread_notices_change(self, repository):
+        """Test that the watcher thread reloads a change within its interval."""
+        changed = threading.Event()
+        repository.start_watching(interval=0.01, on_change=changed.set)
+        try:
+            other = make_rule(name="Other")
+            repository.file_path.write_text(json.dumps([other.to_dict()]))
+            touch(repository.file_path)
+            assert changed.wait(timeout=5)
+            assert repository.get_all() == [other]
+        finally:
+            repository.stop_watching()
+
+    def test_writes_see_external_change_while_watched(self, repository):
+        """Test that writers still read the latest file when a watcher has not polled yet."""
+        repository.start_watching(interval=60)
+        try:
+            other = make_rule(name="Other")
+            repository.file_path.write_text(json.dumps([other.to_dict()]))
+            touch(repository.file_path)
+
+            rule = repository.create(make_rule())
+            assert [r.id for r in repository.get_all()] == [other.id, rule.id]
+        finally:
+            repository.stop_watching()
@@ -0,0 +1,153 @@
+"""Tests for the journal-backed rule repository."""
+
+import json
+import multiprocessing
+import sys
+from functools import partial
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from adapters.outbound.file_repository import FileRuleRepository
+from adapters.outbound.journal_repository import JournalRuleRepository
+from domain.models import Rule
+from tests.helpers import create_rules, make_rule
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "rules.json")
+
+
+@pytest.fixture
+def repository(path):
+    return JournalRuleRepository(path, compact_threshold=100)
+
+
+def journal_lines(repository):
+    return repository.journal_path.read_text().splitlines()
+
+
+class TestJournal:
+    """Test that mutations are appended and replayed."""
+
+    def test_writes_append_to_journal(self, repository):
+        """Test that CRUD calls append one record each and leave the snapshot alone."""
+        snapshot = repository.file_path.read_text()
+        rule = repository.create(make_rule())
+        repository.update(Rule(id=rule.id, name="Senior", description="Senior", expression="age >= 65"))
+        repository.delete(repository.create(make_rule(name="Other")).id)
+
+        assert repository.file_path.read_text() == snapshot
+        assert [json.loads(line)["op"] for line in journal_lines(repository)] == ["put", "put", "put", "delete"]
+        assert [r.name for r in repository.get_all()] == ["Senior"]
+
+    def test_replay_on_startup(self, repository, path):
+        """Test that a new instance rebuilds the rules from snapshot and journal."""
+        rules = [repository.create(make_rule(name=f"Rule {i}")) for i in range(3)]
+        repository.delete(rules[1].id)
+        repository.update(Rule(id=rules[0].id, name="First", description="First", expression="age >= 1"))
+
+        reopened = JournalRuleRepository(path)
+        assert [r.name for r in reopened.get_all()] == ["First", "Rule 2"]
+
+    def test_ignores_incomplete_last_record(self, repository, path):
+        """Test that a partial record left by a crash is skipped."""
+        rule = repository.create(make_rule())
+        with open(repository.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "rule": {"id"')
+
+        assert JournalRuleRepository(path).get_all() == [rule]
+
+    def test_appends_after_incomplete_record(self, repository, path):
+        """Test that records appended after a crash are not lost behind the partial record."""
+        rule = repository.create(make_rule())
+        with open(repository.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "put", "rule": {"id"')
+
+        reopened = JournalRuleRepository(path)
+        created = reopened.create(make_rule(name="After crash"))
+        assert JournalRuleRepository(path).get_all() == [rule, created]
+        assert len(journal_lines(repository)) == 2
+
+    def test_keeps_record_missing_newline(self, repository, path):
+        """Test that a complete last record without its newline is kept when appending."""
+        first = repository.create(make_rule())
+        journal = repository.journal_path.read_bytes()
+        repository.journal_path.write_bytes(journal.rstrip(b"\n"))
+
+        reopened = JournalRuleRepository(path)
+        second = reopened.create(make_rule(name="Second"))
+        assert JournalRuleRepository(path).get_all() == [first, second]
+
+    def test_other_instance_sees_appends(self, repository, path):
+        """Test that appends by one instance are picked up by another."""
+        other = JournalRuleRepository(path)
+        assert other.get_all() == []
+        rule = repository.create(make_rule())
+        assert other.get_by_id(rule.id) == rule
+
+
+class TestCompaction:
+    """Test folding the journal into the snapshot."""
+
+    def test_compacts_at_threshold(self, path):
+        """Test that reaching the threshold rewrites the snapshot and empties the journal."""
+        repository = JournalRuleRepository(path, compact_threshold=3)
+        rules = [repository.create(make_rule(name=f"Rule {i}")) for i in range(3)]
+
+        assert journal_lines(repository) == []
+        assert [r["id"] for r in json.loads(repository.file_path.read_text())] == [str(r.id) for r in rules]
+
+        repository.create(make_rule(name="Next"))
+        assert len(journal_lines(repository)) == 1
+        assert len(JournalRuleRepository(path).get_all()) == 4
+
+    def test_manual_compact(self, repository, path):
+        """Test that compact() keeps every rule."""
+        rules = [repository.create(make_rule(name=f"Rule {i}")) for i in range(3)]
+        repository.compact()
+        assert journal_lines(repository) == []
+        assert JournalRuleRepository(path).get_all() == rules
+
+    def test_reload_during_compaction(self, repository, path, monkeypatch):
+        """Test that a reload which read the old snapshot while another instance compacted reads again."""
+        for i in range(3):
+            repository.create(make_rule(name=f"Rule {i}"))
+        reader = JournalRuleRepository(path)
+        read_snapshot = FileRuleRepository._read_rules
+        compacted = []
+
+        def read_then_compact(self):
+            rules = read_snapshot(self)
+            if not compacted:
+                # The old snapshot is read; the journal holding every rule is emptied before it is replayed
+                compacted.append(True)
+                repository.compact()
+            return rules
+
+        monkeypatch.setattr(FileRuleRepository, "_read_rules", read_then_compact)
+        assert sorted(r.name for r in reader.get_all()) == ["Rule 0", "Rule 1", "Rule 2"]
+        assert compacted
+
+    def test_rejects_invalid_threshold(self, path):
+        """Test that the threshold must be positive."""
+        with pytest.raises(ValueError):
+            JournalRuleRepository(path, compact_threshold=0)
+
+    def test_concurrent_processes_across_compactions(self, path):
+        """Test that appends and compactions from several processes lose nothing."""
+        JournalRuleRepository(path)
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(
+            target=create_rules, args=(partial(JournalRuleRepository, path, compact_threshold=10), 25)
+        ) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+            assert worker.exitcode == 0
+
+        assert len(JournalRuleRepository(path).get_all()) == 100
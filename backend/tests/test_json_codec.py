@@ -0,0 +1,81 @@
+"""Tests for the shared JSON codec."""
+
+import json
+import math
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from adapters import json_codec
+
+VALUES = [
+    {"name": "Rule", "value": [1, 2.5, "é", None, True], "nested": {"a": {"b": []}}},
+    [],
+    {},
+    -(2 ** 63),
+    2 ** 64 - 1,
+    0.1,
+    1e16,
+]
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request, monkeypatch):
+    if request.param == "orjson":
+        if not json_codec.ORJSON_AVAILABLE:
+            pytest.skip("orjson is not installed")
+    else:
+        monkeypatch.setattr(json_codec, "orjson", None)
+    return json_codec
+
+
+class TestCodec:
+    """Test that both implementations agree with the standard library."""
+
+    @pytest.mark.parametrize("value", VALUES)
+    def test_round_trip(self, codec, value):
+        """Test that encoding and decoding returns an equal value."""
+        encoded = codec.dumps(value)
+        assert json.loads(encoded) == value
+        assert codec.loads(encoded) == value
+        assert codec.loads(codec.dumps(value, indent=True)) == value
+
+    def test_large_integers_stay_exact(self, codec):
+        """Test that integers beyond 64 bits are neither rounded on read nor rejected on write."""
+        value = {"id": 123456789012345678901234567890, "neg": -(2 ** 80)}
+        assert codec.loads(json.dumps(value)) == value
+        assert json.loads(codec.dumps(value)) == value
+
+    @pytest.mark.parametrize("value", [-(2 ** 63) - 1, -(2 ** 63), 2 ** 64 - 1, 2 ** 64, -(10 ** 18), 10 ** 19])
+    def test_64_bit_boundaries(self, codec, value):
+        """Test that integers just inside and outside orjson's range decode exactly."""
+        decoded = codec.loads(json.dumps({"value": value}))["value"]
+        assert type(decoded) is int and decoded == value
+
+    def test_non_ascii_is_utf8(self, codec):
+        """Test that non-ASCII text is written as UTF-8 rather than escaped."""
+        assert codec.dumps({"city": "Zürich"}) == '{"city":"Zürich"}'.encode("utf-8")
+
+    def test_indent(self, codec):
+        """Test that indented output uses two spaces."""
+        assert codec.dumps({"a": [1]}, indent=True).decode("utf-8") == json.dumps({"a": [1]}, indent=2)
+
+    def test_nan_literal(self, codec):
+        """Test that NaN literals written by the standard library can be read back."""
+        assert math.isnan(codec.loads(b'{"x": NaN}')["x"])
+
+    def test_invalid_document(self, codec):
+        """Test that invalid JSON raises the standard library's error."""
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads(b'{"a": ')
+        with pytest.raises(ValueError):
+            codec.loads(b'\xff')
+
+    def test_response_class(self, codec):
+        """Test that the response class renders with the codec."""
+        response = codec.JSONCodecResponse({"result": "PASS", "actual": 2 ** 70})
+        assert json.loads(response.body) == {"result": "PASS", "actual": 2 ** 70}
+        assert response.media_type == "application/json"
@@ -0,0 +1,109 @@
+"""Tests for cost- and selectivity-based operand ordering."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from domain.expression_compiler import compile_expression_verdict
+from domain.expression_parser import ComparisonNode, parse_expression
+from domain.predicate_order import (
+    PredicateStatistics,
+    comparison_cost,
+    order_operands,
+    order_predicates
+)
+
+
+def static_estimate(node):
+    return comparison_cost(node), 0.5
+
+
+def leaves(node):
+    if isinstance(node, ComparisonNode):
+        return [f"{node.field} {node.operator} {node.value!r}"]
+    return leaves(node.left) + leaves(node.right)
+
+
+class TestOrderOperands:
+    """Test reordering of AND/OR chains."""
+
+    def test_cheap_comparisons_first(self):
+        """Test that without statistics equality checks run before contains."""
+        ordered = order_operands(parse_expression("tags contains 'vip' AND country == 'UK' AND age >= 18"), static_estimate)
+        assert leaves(ordered) == ["country == 'UK'", "age >= 18", "tags contains 'vip'"]
+
+    def test_selectivity(self):
+        """Test that AND starts with operands that usually fail and OR with ones that usually pass."""
+        rates = {"a": 0.9, "b": 0.1, "c": 0.5}
+
+        def estimate(node):
+            return 1.0, rates[node.field]
+
+        assert leaves(order_operands(parse_expression("a == 1 AND b == 1 AND c == 1"), estimate)) == [
+            "b == 1", "c == 1", "a == 1"
+        ]
+        assert leaves(order_operands(parse_expression("a == 1 OR b == 1 OR c == 1"), estimate)) == [
+            "a == 1", "c == 1", "b == 1"
+        ]
+
+    def test_nested_groups_move_as_a_whole(self):
+        """Test that a parenthesized group is ordered as one operand of its parent."""
+        expression = parse_expression("(x contains 'a' OR y contains 'b') AND z == 1")
+        ordered = order_operands(expression, static_estimate)
+        assert ordered.operator == "AND"
+        assert leaves(ordered.left) == ["z == 1"]
+        assert leaves(ordered.right) == ["x contains 'a'", "y contains 'b'"]
+
+    def test_stable_for_equal_estimates(self):
+        """Test that operands estimated alike keep their order."""
+        expression = parse_expression("a == 1 AND b == 2 AND c == 3")
+        assert leaves(order_operands(expression, static_estimate)) == ["a == 1", "b == 2", "c == 3"]
+
+    @pytest.mark.parametrize("payload", [
+        {"a": 1, "b": 2, "tags": ["x"]},
+        {"a": 1, "b": "2", "tags": ["x"]},
+        {"a": "1", "b": 2, "tags": 5},
+        {"a": 0, "b": 0, "tags": []},
+    ])
+    def test_verdict_unchanged(self, payload):
+        """Test that the reordered expression has the same verdict, errors included."""
+        for source in (
+            "a >= 1 AND (b > 1 OR tags contains 'x') AND a != 3",
+            "(a > 0 AND tags contains 'y') OR b < 5 OR a == 1",
+        ):
+            expression = parse_expression(source)
+            reordered = order_operands(expression, lambda node: (comparison_cost(node), 0.99))
+            assert compile_expression_verdict(reordered)(payload) == compile_expression_verdict(expression)(payload)
+
+
+class TestOrderPredicates:
+    """Test ordering of predicate rules."""
+
+    def test_orders_by_operator(self):
+        """Test that AND predicates are ordered by cost per chance of failing."""
+        nodes = [
+            ComparisonNode("tags", "contains", "x"),
+            ComparisonNode("age", ">=", 18),
+            ComparisonNode("country", "==", "UK"),
+        ]
+        assert order_predicates(nodes, "AND", static_estimate) == [2, 1, 0]
+
+        rates = {"tags": 0.9, "age": 0.2, "country": 0.5}
+        assert order_predicates(nodes, "OR", lambda node: (1.0, rates[node.field])) == [0, 2, 1]
+
+
+class TestPredicateStatistics:
+    """Test recording of comparison outcomes."""
+
+    def test_pass_rate(self):
+        """Test that pass rates are smoothed towards one half."""
+        statistics = PredicateStatistics()
+        assert statistics.pass_rate("k") == 0.5
+        for passed in (True, True, True, False):
+            statistics.record("k", passed)
+        assert statistics.observations("k") == 4
+        assert statistics.pass_rate("k") == pytest.approx(4 / 6)
+        assert len(statistics) == 1
@@ -0,0 +1,96 @@
+"""Tests for compiled rules and the compiled-rule cache."""
+
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from application.rule_cache import CompiledRuleCache
+from domain.compiled_rule import compile_rule, rule_fingerprint
+from domain.models import Predicate, OperatorType, Rule
+from tests.helpers import make_rule
+
+
+class TestCompileRule:
+    """Test compiling a rule into its artifacts."""
+
+    def test_expression_rule(self):
+        """Test that expression rules carry their AST and fields."""
+        compiled = compile_rule(make_rule(expression="age >= 18 AND country == 'USA'"))
+        assert compiled.expression_ast is not None
+        assert sorted(compiled.required_fields) == ["age", "country"]
+
+    def test_predicate_rule(self):
+        """Test that predicate rules list their fields in order."""
+        rule = Rule(
+            id=uuid4(), name="P", description="P",
+            predicates=[
+                Predicate("age", OperatorType.GREATER_THAN_OR_EQUAL, 18),
+                Predicate("country", OperatorType.EQUALS, "USA"),
+                Predicate("age", OperatorType.LESS_THAN, 65)
+            ]
+        )
+        compiled = compile_rule(rule)
+        assert compiled.expression_ast is None
+        assert compiled.required_fields == ("age", "country")
+
+    def test_fingerprint_ignores_name(self):
+        """Test that renaming a rule does not change its fingerprint."""
+        rule_id = uuid4()
+        assert rule_fingerprint(make_rule(rule_id=rule_id, name="A")) == \
+            rule_fingerprint(make_rule(rule_id=rule_id, name="B"))
+        assert rule_fingerprint(make_rule(expression="age >= 18")) != \
+            rule_fingerprint(make_rule(expression="age >= 21"))
+
+
+class TestCompiledRuleCache:
+    """Test cache hits, misses and invalidation."""
+
+    def test_hit_after_miss(self):
+        """Test that the second lookup is a hit."""
+        cache = CompiledRuleCache()
+        rule = make_rule()
+        first = cache.get(rule)
+        second = cache.get(rule)
+        assert first is second
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_changed_content_recompiles(self):
+        """Test that a rule with new content is not served a stale entry."""
+        cache = CompiledRuleCache()
+        rule = make_rule(expression="age >= 18")
+        cache.get(rule)
+        changed = make_rule(expression="age >= 21", rule_id=rule.id)
+        compiled = cache.get(changed)
+        assert compiled.expression_ast.value == 21
+        assert cache.stats()["misses"] == 2
+
+    def test_invalidate(self):
+        """Test that invalidation drops the entry."""
+        cache = CompiledRuleCache()
+        rule = make_rule()
+        cache.put(rule)
+        cache.invalidate(rule.id)
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["invalidations"] == 1
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = CompiledRuleCache(max_size=2)
+        a, b, c = make_rule(), make_rule(), make_rule()
+        cache.get(a)
+        cache.get(b)
+        cache.get(a)
+        cache.get(c)
+        assert cache.stats()["evictions"] == 1
+        cache.get(a)
+        assert cache.stats()["hits"] == 2
+
+    def test_invalid_size(self):
+        """Test that a zero-sized cache is rejected."""
+        with pytest.raises(ValueError):
+            CompiledRuleCache(max_size=0)
@@ -0,0 +1,70 @@
+"""Tests for the inverted rule index used by evaluate-all."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from domain.compiled_rule import compile_rule
+from domain.models import OperatorType
+from domain.rule_index import RuleIndex
+from tests.helpers import expression_rule, predicate_rule
+
+
+RULES = [
+    expression_rule("country == 'USA' AND age >= 21"),                      # 0
+    expression_rule("country in ['UK', 'FR'] AND status == 'active'"),      # 1
+    expression_rule("country == 'USA' OR age >= 65"),                       # 2
+    expression_rule("credit_score >= 650"),                                 # 3
+    expression_rule("verified == true AND age >= 18"),                      # 4
+    expression_rule("tier == 1 AND ip_country == account_country"),         # 5
+    predicate_rule("AND", ("status", OperatorType.EQUALS, "active"),
+                   ("credit_score", OperatorType.GREATER_THAN, 700)),       # 6
+    predicate_rule("OR", ("age", OperatorType.LESS_THAN, 18),
+                   ("status", OperatorType.EQUALS, "minor")),               # 7
+]
+
+PAYLOADS = [
+    {"country": "USA", "age": 30, "status": "active", "credit_score": 720, "verified": True},
+    {"country": "UK", "age": 17, "status": "active"},
+    {"country": "FR", "status": "blocked", "age": "x"},
+    {"country": ["USA"], "age": 70, "verified": 1, "tier": True,
+     "ip_country": "US", "account_country": "US"},
+    {"tier": 1.0, "ip_country": "US", "account_country": "FR"},
+    {"status": "minor"},
+    {},
+]
+
+
+@pytest.fixture
+def compiled_rules():
+    return [compile_rule(rule) for rule in RULES]
+
+
+class TestRuleIndex:
+    """Test candidate selection."""
+
+    def test_candidates(self, compiled_rules):
+        """Test that only rules whose fields are present and guards match are selected."""
+        index = RuleIndex(compiled_rules)
+        assert index.candidates(PAYLOADS[0]) == [0, 2, 3, 4, 6, 7]
+        assert index.candidates(PAYLOADS[1]) == [1, 2, 7]
+        assert index.candidates(PAYLOADS[4]) == [5]
+        assert index.candidates(PAYLOADS[5]) == [7]
+        assert index.candidates({}) == []
+
+    def test_guards_follow_python_equality(self, compiled_rules):
+        """Test that guards match values that compare equal across types, like true and 1."""
+        index = RuleIndex(compiled_rules)
+        assert index.candidates(PAYLOADS[3]) == [2, 4, 5, 7]
+
+    def test_skipped_rules_never_pass(self, compiled_rules):
+        """Test that every rule left out would have failed anyway."""
+        index = RuleIndex(compiled_rules)
+        for payload in PAYLOADS:
+            candidates = set(index.candidates(payload))
+            for position, compiled in enumerate(compiled_rules):
+                if position not in candidates:
+                    assert compiled.verdict(payload) is False
@@ -0,0 +1,215 @@
+"""Tests for the shared-predicate rule network."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import random
+
+import pytest
+from domain.compiled_rule import compile_rule
+from domain.expression_parser import ComparisonNode
+from domain.models import OperatorType
+from domain.predicate_order import PredicateStatistics
+from domain.rule_network import RuleNetwork, predicate_key
+from tests.helpers import expression_rule, predicate_rule
+
+
+RULES = [
+    expression_rule("age >= 18 AND status == 'active'"),
+    expression_rule("age >= 18 OR credit_score >= 650"),
+    expression_rule("(credit_score >= 650 AND status == 'active') OR country in ['USA', 'UK']"),
+    expression_rule("age >= 18.0 AND verified == true"),
+    predicate_rule("AND", ("age", OperatorType.GREATER_THAN_OR_EQUAL, 18),
+                   ("credit_score", OperatorType.GREATER_THAN_OR_EQUAL, 650)),
+    predicate_rule("OR", ("status", OperatorType.EQUALS, "active"),
+                   ("age", OperatorType.LESS_THAN, 18)),
+]
+
+PAYLOADS = [
+    {"age": 25, "status": "active", "credit_score": 700, "country": "USA", "verified": True},
+    {"age": 16, "status": "blocked", "credit_score": 600, "country": "FR", "verified": False},
+    {"age": "x", "status": "active", "credit_score": None, "country": "UK", "verified": 1},
+    {"age": 30},
+    {},
+]
+
+
+@pytest.fixture
+def compiled_rules():
+    return [compile_rule(rule) for rule in RULES]
+
+
+class TestRuleNetwork:
+    """Test shared-predicate evaluation."""
+
+    def test_matches_individual_verdicts(self, compiled_rules):
+        """Test every rule's verdict equals evaluating it on its own."""
+        network = RuleNetwork(compiled_rules)
+        for payload in PAYLOADS:
+            assert network.evaluate(payload) == [compiled.verdict(payload) for compiled in compiled_rules]
+
+    def test_interns_repeated_comparisons(self, compiled_rules):
+        """Test identical comparisons across rules share one node."""
+        network = RuleNetwork(compiled_rules)
+        assert network.predicate_count == 13
+        # age >= 18, status == 'active', credit_score >= 650, country in [...],
+        # age >= 18.0, verified == true, age < 18
+        assert network.node_count == 7
+        assert network.shared_node_count == 3
+
+    def test_each_node_evaluated_once_per_payload(self, compiled_rules, monkeypatch):
+        """Test a shared comparison is computed at most once per payload."""
+        import domain.rule_network as rule_network
+
+        calls = []
+        original = rule_network.compile_comparison
+
+        def counting_compile(node):
+            compare = original(node)
+
+            def counted(payload):
+                calls.append(predicate_key(node))
+                return compare(payload)
+            return counted
+
+        monkeypatch.setattr(rule_network, "compile_comparison", counting_compile)
+        network = RuleNetwork(compiled_rules)
+        for payload in PAYLOADS:
+            calls.clear()
+            network.evaluate(payload)
+            assert len(calls) == len(set(calls))
+
+    def test_value_types_are_not_merged(self):
+        """Test that comparisons with equal but differently typed values stay distinct."""
+        one = ComparisonNode(field="a", operator="==", value=1)
+        true = ComparisonNode(field="a", operator="==", value=True)
+        one_float = ComparisonNode(field="a", operator="==", value=1.0)
+        assert len({predicate_key(one), predicate_key(true), predicate_key(one_float)}) == 3
+
+
+class TestThresholds:
+    """Test threshold comparisons resolved by bisect."""
+
+    RULES = [
+        expression_rule("credit_score >= 650 AND age > 18"),
+        expression_rule("credit_score > 650 OR age <= 17.5"),
+        expression_rule("credit_score < 600.5 AND age < 65"),
+        expression_rule("credit_score <= 700 OR age >= 18"),
+        predicate_rule("AND", ("credit_score", OperatorType.GREATER_THAN, 700),
+                       ("age", OperatorType.LESS_THAN_OR_EQUAL, 30)),
+    ]
+
+    def test_thresholds_grouped_by_field(self):
+        """Test that fields with several thresholds are indexed."""
+        network = RuleNetwork([compile_rule(rule) for rule in self.RULES])
+        assert network.threshold_fields == {"credit_score": 3, "age": 4}
+
+    @pytest.mark.parametrize("credit_score", [
+        300, 600, 600.5, 650, 650.0, 651, 700, 700.1, 2 ** 70, -1e308,
+        float("nan"), True, "high", None, [700]
+    ])
+    def test_matches_individual_verdicts(self, credit_score):
+        """Test bisect outcomes equal direct comparisons, including non-numeric values."""
+        compiled_rules = [compile_rule(rule) for rule in self.RULES]
+        network = RuleNetwork(compiled_rules)
+        for age in (17, 17.5, 18, 30, 64.9, 65, 90):
+            payload = {"credit_score": credit_score, "age": age}
+            assert network.evaluate(payload) == [c.verdict(payload) for c in compiled_rules]
+        payload = {"age": 40}
+        assert network.evaluate(payload) == [c.verdict(payload) for c in compiled_rules]
+
+
+class TestAdaptiveOrdering:
+    """Test operand ordering from sampled comparison outcomes."""
+
+    RULES = [
+        expression_rule("country == 'UK' AND tags contains 'vip' AND age >= 18"),
+        expression_rule("(age >= 18 AND tags contains 'vip') OR country != 'UK'"),
+        expression_rule("score > 10 AND tags not_contains 'spam' AND score < 20"),
+        predicate_rule("AND", ("country", OperatorType.EQUALS, "UK"),
+                       ("tags", OperatorType.CONTAINS, "vip")),
+        predicate_rule("OR", ("tags", OperatorType.CONTAINS, "vip"),
+                       ("country", OperatorType.IN, ["UK", "IE"])),
+    ]
+
+    def test_samples_every_interval(self):
+        """Test that comparison outcomes are recorded every sample_interval payloads."""
+        network = RuleNetwork([compile_rule(rule) for rule in self.RULES], sample_interval=4)
+        key = predicate_key(ComparisonNode("tags", "contains", "vip"))
+        for _ in range(8):
+            network.evaluate({"country": "UK", "tags": [], "age": 30, "score": 15})
+        assert network.statistics.observations(key) == 2
+        assert network.statistics.pass_rate(key) == pytest.approx(1 / 4)
+
+    def test_rarely_passing_comparison_moves_first(self):
+        """Test that re-optimizing puts a comparison that usually fails at the front of an AND."""
+        compiled_rules = [compile_rule(rule) for rule in self.RULES]
+        network = RuleNetwork(compiled_rules, sample_interval=1)
+        first = network._orders[0]
+        assert first.left.left.field == "country"
+
+        for _ in range(16):
+            network.evaluate({"country": "UK", "tags": ["new"], "age": 30, "score": 15})
+        assert network._orders[0].left.left.field == "tags"
+        # Nothing left to learn from the same statistics
+        assert network.reoptimize() == 0
+
+    def test_large_network_samples_and_reoptimizes_in_steps(self):
+        """Test that a sample records at most 256 rules and re-ordering is spread over samples."""
+        compiled_rules = [compile_rule(expression_rule(f"f{i} == 2 AND g{i} == 'x'")) for i in range(600)]
+        network = RuleNetwork(compiled_rules, sample_interval=1)
+        payload = {**{f"f{i}": 2 for i in range(600)}, **{f"g{i}": "y" for i in range(600)}}
+
+        network.evaluate(payload)
+        assert network.statistics.observations(predicate_key(ComparisonNode("f0", "==", 2))) == 1
+        assert network.statistics.observations(predicate_key(ComparisonNode("f256", "==", 2))) == 0
+        network.evaluate(payload)
+        assert network.statistics.observations(predicate_key(ComparisonNode("f256", "==", 2))) == 1
+
+        for _ in range(14):
+            network.evaluate(payload)
+        # The 16th sample starts a re-optimization that covers 256 rules per sample
+        assert network._reoptimize_from == 256
+        assert network._orders[0].left.field == "g0"
+        assert network._orders[300].left.field == "f300"
+        network.evaluate(payload)
+        network.evaluate(payload)
+        assert network._reoptimize_from is None
+        assert network._orders[599].left.field == "g599"
+        assert network.evaluate(payload) == [compiled.verdict(payload) for compiled in compiled_rules]
+
+    def test_shared_statistics(self):
+        """Test that networks given the same statistics learn from each other."""
+        statistics = PredicateStatistics()
+        compiled_rules = [compile_rule(rule) for rule in self.RULES]
+        learner = RuleNetwork(compiled_rules, statistics, sample_interval=1)
+        for _ in range(16):
+            learner.evaluate({"country": "UK", "tags": [], "age": 30, "score": 15})
+        assert RuleNetwork(compiled_rules[:1], statistics)._orders[0].left.left.field == "tags"
+
+    def test_verdicts_never_change(self):
+        """Test that verdicts match the rules' own verdicts while orders keep changing."""
+        rng = random.Random(7)
+        fields = ["a", "b", "c"]
+        operators = ["==", "!=", ">", ">=", "<", "<=", "contains", "not_contains"]
+        literals = ["1", "5", "'x'", "true", "b"]
+
+        def comparison():
+            return f"{rng.choice(fields)} {rng.choice(operators)} {rng.choice(literals)}"
+
+        def expression(depth=0):
+            if depth > 2 or rng.random() < 0.3:
+                return comparison()
+            return f"({expression(depth + 1)} {rng.choice(['AND', 'OR'])} {expression(depth + 1)})"
+
+        compiled_rules = [compile_rule(expression_rule(expression())) for _ in range(40)]
+        compiled_rules += [compile_rule(rule) for rule in self.RULES]
+        network = RuleNetwork(compiled_rules, sample_interval=1)
+        values = [0, 1, 5, "x", "xy", ["x"], None, True, 2.5]
+        for _ in range(2000):
+            payload = {field: rng.choice(values) for field in fields + ["country", "tags", "age", "score"]
+                       if rng.random() < 0.9}
+            assert network.evaluate(payload) == [compiled.verdict(payload) for compiled in compiled_rules]
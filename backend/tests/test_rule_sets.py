@@ -0,0 +1,222 @@
+"""Tests for rule sets and their evaluation plans."""
+
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import anyio
+import httpx
+import pytest
+from fastapi import FastAPI
+from adapters import json_codec
+from adapters.inbound.api_router import create_rule_router
+from adapters.outbound.rule_set_repository import FileRuleSetRepository
+from application.evaluation_plan import EvaluationPlan
+from domain.exceptions import RuleSetNotFoundException, RulesNotFoundException, RuleValidationException
+from domain.models import RuleEffect, RuleSet
+
+
+@pytest.fixture
+def rules(services):
+    rule_service = services[0]
+    return [
+        rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18"),
+        rule_service.create_rule(name="Senior", description="Senior", expression="age >= 65 AND country == 'UK'"),
+        rule_service.create_rule(
+            name="Country", description="Country",
+            predicates=[{"field": "country", "operator": "in", "value": ["UK", "USA"]}]
+        ),
+    ]
+
+
+class TestRuleSetRepository:
+    """Test rule set persistence."""
+
+    def test_crud(self, tmp_path):
+        """Test creating, reading, updating and deleting rule sets, also from another instance."""
+        path = str(tmp_path / "rulesets.json")
+        repository = FileRuleSetRepository(path)
+        rule_set = repository.create(RuleSet(id=uuid4(), name="A", description="A", rule_ids=[uuid4()]))
+        assert FileRuleSetRepository(path).get_by_id(rule_set.id) == rule_set
+
+        updated = RuleSet(id=rule_set.id, name="B", description="B", rule_ids=[uuid4(), uuid4()])
+        FileRuleSetRepository(path).update(updated)
+        assert repository.get_all() == [updated]
+
+        assert repository.delete(rule_set.id) is True
+        assert repository.delete(rule_set.id) is False
+        assert FileRuleSetRepository(path).get_all() == []
+
+
+    def test_reload_does_not_overwrite_newer_write(self, tmp_path, monkeypatch):
+        """Test that rule sets a reload parsed are dropped if a writer published newer ones meanwhile."""
+        path = str(tmp_path / "rulesets.json")
+        repository = FileRuleSetRepository(path)
+        first = repository.create(RuleSet(id=uuid4(), name="A", description="A", rule_ids=[uuid4()]))
+        other = FileRuleSetRepository(path).create(RuleSet(id=uuid4(), name="B", description="B", rule_ids=[uuid4()]))
+        newer = RuleSet(id=uuid4(), name="C", description="C", rule_ids=[uuid4()])
+        loads = json_codec.loads
+
+        def load_then_write(data):
+            result = loads(data)
+            monkeypatch.setattr(json_codec, "loads", loads)
+            repository.create(newer)
+            return result
+
+        monkeypatch.setattr(json_codec, "loads", load_then_write)
+        assert repository.get_all() == [first, other, newer]
+
+
+class TestRuleSetService:
+    """Test rule set management."""
+
+    def test_create_and_get(self, services, rules):
+        """Test that a rule set keeps its rules in the given order."""
+        rule_set_service = services[2]
+        rule_ids = [str(rules[2].id), str(rules[0].id)]
+        rule_set = rule_set_service.create_rule_set("Loan", "Loan checks", rule_ids)
+        assert rule_set_service.get_rule_set(rule_set.id).rule_ids == [rules[2].id, rules[0].id]
+        assert rule_set_service.get_all_rule_sets() == [rule_set]
+
+    def test_validation(self, services, rules):
+        """Test that invalid rule sets are rejected."""
+        rule_set_service = services[2]
+        with pytest.raises(RuleValidationException):
+            rule_set_service.create_rule_set(" ", "", [str(rules[0].id)])
+        with pytest.raises(RuleValidationException):
+            rule_set_service.create_rule_set("Empty", "", [])
+        with pytest.raises(RuleValidationException):
+            rule_set_service.create_rule_set("Bad", "", ["not-a-uuid"])
+        with pytest.raises(RuleValidationException):
+            rule_set_service.create_rule_set("Twice", "", [str(rules[0].id), str(rules[0].id)])
+
+        missing = [str(uuid4()), str(uuid4())]
+        with pytest.raises(RulesNotFoundException) as error:
+            rule_set_service.create_rule_set("Missing", "", [missing[0], str(rules[0].id), missing[1]])
+        assert error.value.rule_ids == missing
+
+    def test_update_and_delete(self, services, rules):
+        """Test updating and deleting rule sets."""
+        rule_set_service = services[2]
+        rule_set = rule_set_service.create_rule_set("Loan", "", [str(rules[0].id)])
+        updated = rule_set_service.update_rule_set(rule_set.id, "Loan v2", "", [str(rules[1].id)])
+        assert rule_set_service.get_rule_set(rule_set.id) == updated
+
+        assert rule_set_service.delete_rule_set(rule_set.id) is True
+        with pytest.raises(RuleSetNotFoundException):
+            rule_set_service.delete_rule_set(rule_set.id)
+        with pytest.raises(RuleSetNotFoundException):
+            rule_set_service.update_rule_set(rule_set.id, "Loan", "", [str(rules[0].id)])
+
+
+class TestRuleSetEvaluation:
+    """Test evaluation through precompiled plans."""
+
+    def test_matches_evaluate(self, services, rules):
+        """Test that evaluating a rule set equals evaluating its rule IDs directly."""
+        _, evaluation_service, rule_set_service = services
+        rule_ids = [str(rule.id) for rule in rules]
+        rule_set = rule_set_service.create_rule_set("All", "", rule_ids)
+        payloads = [
+            {"age": 70, "country": "UK"},
+            {"age": 20, "country": "FR"},
+            {"age": 30},
+            {"age": "old", "country": "USA"},
+        ]
+        for payload in payloads:
+            for explain in (True, False):
+                expected = evaluation_service.evaluate(payload, rule_ids, explain=explain)
+                assert rule_set_service.evaluate(rule_set.id, payload, explain=explain) == expected
+
+    def test_plan_is_reused(self, services, rules, monkeypatch):
+        """Test that repeated evaluations share one plan until a member rule changes."""
+        rule_service, evaluation_service, rule_set_service = services
+        rule_set = rule_set_service.create_rule_set("Loan", "", [str(rules[0].id), str(rules[2].id)])
+        rule_set_service.evaluate(rule_set.id, {"age": 20, "country": "UK"})
+        plan = rule_set_service._plans[rule_set.id]
+        rule_set_service.evaluate(rule_set.id, {"age": 10, "country": "UK"})
+        assert rule_set_service._plans[rule_set.id] is plan
+
+        # A rule outside the set changes: the plan is kept at the new snapshot version
+        rule_service.update_rule(rules[1].id, name="Senior", description="Senior", expression="age >= 60")
+        build = EvaluationPlan.build
+        monkeypatch.setattr(EvaluationPlan, "build", None)
+        response = rule_set_service.evaluate(rule_set.id, {"age": 20, "country": "UK"})
+        assert rule_set_service._plans[rule_set.id].network is plan.network
+        assert response.snapshot_version == rule_service.snapshots.current().version
+
+        # A member is renamed: the plan is rebuilt so responses carry the new name
+        monkeypatch.setattr(EvaluationPlan, "build", build)
+        rule_service.update_rule(rules[0].id, name="Grown-up", description="Adult", expression="age >= 18")
+        response = rule_set_service.evaluate(rule_set.id, {"age": 20, "country": "UK"})
+        assert response.details[0].rule_name == "Grown-up"
+
+    def test_member_rule_change_takes_effect(self, services, rules):
+        """Test that editing a member rule changes the next evaluation."""
+        rule_service, _, rule_set_service = services
+        rule_set = rule_set_service.create_rule_set("Adult", "", [str(rules[0].id)])
+        assert rule_set_service.evaluate(rule_set.id, {"age": 20}).result == RuleEffect.PASS
+
+        rule_service.update_rule(rules[0].id, name="Adult", description="Adult", expression="age >= 21")
+        response = rule_set_service.evaluate(rule_set.id, {"age": 20}, explain=False)
+        assert response.result == RuleEffect.FAIL
+        assert response.snapshot_version == rule_service.snapshots.current().version
+
+    def test_deleted_member_rule(self, services, rules):
+        """Test that a rule set whose rule was deleted reports the missing rule."""
+        rule_service, _, rule_set_service = services
+        rule_set = rule_set_service.create_rule_set("Loan", "", [str(rules[0].id), str(rules[1].id)])
+        rule_service.delete_rule(rules[1].id)
+        with pytest.raises(RulesNotFoundException) as error:
+            rule_set_service.evaluate(rule_set.id, {"age": 20})
+        assert error.value.rule_ids == [str(rules[1].id)]
+
+    def test_unknown_rule_set(self, services):
+        """Test that evaluating an unknown rule set fails."""
+        with pytest.raises(RuleSetNotFoundException):
+            services[2].evaluate(uuid4(), {})
+
+
+class TestRuleSetApi:
+    """Test the rule set endpoints."""
+
+    def test_endpoints(self, services, rules):
+        """Test the rule set lifecycle over HTTP."""
+        rule_service, evaluation_service, rule_set_service = services
+        app = FastAPI()
+        app.include_router(create_rule_router(rule_service, evaluation_service, rule_set_service=rule_set_service))
+        rule_ids = [str(rules[0].id), str(rules[2].id)]
+
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                created = await client.post("/api/v1/rulesets", json={"name": "Loan", "description": "", "rule_ids": rule_ids})
+                assert created.status_code == 201
+                rule_set_id = created.json()["id"]
+                assert created.json()["rule_ids"] == rule_ids
+
+                listed = await client.get("/api/v1/rulesets")
+                assert [r["id"] for r in listed.json()] == [rule_set_id]
+
+                evaluated = await client.post(
+                    f"/api/v1/rulesets/{rule_set_id}/evaluate", json={"payload": {"age": 30, "country": "UK"}}
+                )
+                assert evaluated.status_code == 200
+                assert evaluated.json()["result"] == "PASS"
+                assert [d["rule_id"] for d in evaluated.json()["details"]] == rule_ids
+
+                missing = await client.put(
+                    f"/api/v1/rulesets/{rule_set_id}", json={"name": "Loan", "description": "", "rule_ids": [str(uuid4())]}
+                )
+                assert missing.status_code == 404
+                invalid = await client.post("/api/v1/rulesets", json={"name": "", "description": "", "rule_ids": rule_ids})
+                assert invalid.status_code == 400
+
+                assert (await client.delete(f"/api/v1/rulesets/{rule_set_id}")).status_code == 204
+                gone = await client.post(f"/api/v1/rulesets/{rule_set_id}/evaluate", json={"payload": {}})
+                assert gone.status_code == 404
+
+        anyio.run(main)
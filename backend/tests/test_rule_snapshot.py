@@ -0,0 +1,235 @@
+"""Tests for immutable rule snapshots."""
+
+import json
+import os
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from adapters.outbound.file_repository import FileRuleRepository
+from adapters.outbound.sqlite_repository import SqliteRuleRepository
+from application.rule_cache import CompiledRuleCache
+from application.rule_snapshot import RuleSnapshotStore
+from application.services import EvaluationService, RuleService
+from domain.exceptions import EvaluationException, RuleNotFoundException, RulesNotFoundException
+from domain.models import Rule, RuleEffect
+from tests.helpers import make_rule
+
+
+@pytest.fixture
+def repository(tmp_path):
+    return FileRuleRepository(str(tmp_path / "rules.json"))
+
+
+@pytest.fixture
+def store(repository):
+    return RuleSnapshotStore(repository)
+
+
+class TestRuleSnapshot:
+    """Test lookups in a snapshot."""
+
+    def test_resolve(self, repository, store):
+        """Test that rules resolve in the requested order."""
+        first = repository.create(make_rule())
+        second = repository.create(make_rule(name="Other"))
+        resolved = store.current().resolve([str(second.id), str(first.id)])
+        assert [rule for rule, _ in resolved] == [second, first]
+        assert all(compiled.rule_id == rule.id for rule, compiled in resolved)
+
+    def test_resolve_errors(self, store):
+        """Test that missing, malformed and unknown ids are rejected."""
+        snapshot = store.current()
+        with pytest.raises(EvaluationException):
+            snapshot.resolve([])
+        with pytest.raises(EvaluationException):
+            snapshot.resolve(["not-a-uuid"])
+        with pytest.raises(RuleNotFoundException):
+            snapshot.resolve([str(uuid4())])
+
+    def test_resolve_reports_every_missing_id(self, repository, store):
+        """Test that all unknown ids are reported together."""
+        rule = repository.create(make_rule())
+        missing = [str(uuid4()), str(uuid4())]
+        with pytest.raises(RulesNotFoundException) as error:
+            store.current().resolve([missing[0], str(rule.id), missing[1]])
+        assert error.value.rule_ids == missing
+        assert str(error.value) == f"Rules with ids '{missing[0]}', '{missing[1]}' not found"
+
+        with pytest.raises(RulesNotFoundException) as error:
+            store.current().resolve([missing[0]])
+        assert str(error.value) == f"Rule with id '{missing[0]}' not found"
+
+
+class TestRuleSnapshotStore:
+    """Test publishing and swapping snapshots."""
+
+    def test_reused_while_unchanged(self, repository, store):
+        """Test that reads return the same snapshot until the rules change."""
+        repository.create(make_rule())
+        snapshot = store.current()
+        assert store.current() is snapshot
+
+    def test_write_swaps_snapshot(self, repository, store):
+        """Test that a write publishes a new snapshot and leaves the old one untouched."""
+        rule = repository.create(make_rule())
+        old = store.current()
+
+        added = make_rule(name="Other")
+        store.write(added.id, lambda: repository.create(added), stored=added)
+        updated = Rule(id=rule.id, name="Renamed", description="Renamed", expression="age >= 21")
+        store.write(rule.id, lambda: repository.update(updated), stored=updated)
+
+        new = store.current()
+        assert new.version > old.version
+        assert [r for r, _ in new.compiled_rules] == [updated, added]
+        assert [r for r, _ in old.compiled_rules] == [rule]
+
+    def test_write_delete(self, repository, store):
+        """Test that deleting a rule removes it from the next snapshot."""
+        rule = repository.create(make_rule())
+        store.current()
+        store.write(rule.id, lambda: repository.delete(rule.id))
+        assert store.current().get(rule.id) is None
+
+    def test_write_does_not_reload(self, repository, store, monkeypatch):
+        """Test that a write through the store updates the snapshot without reading every rule."""
+        repository.create(make_rule())
+        store.current()
+        monkeypatch.setattr(repository, "get_all", lambda: pytest.fail("snapshot was rebuilt"))
+
+        added = make_rule(name="Other")
+        store.write(added.id, lambda: repository.create(added), stored=added)
+        assert len(store.current()) == 2
+
+    def test_external_change_rebuilds(self, repository, store):
+        """Test that a change made outside the store is picked up on the next read."""
+        rule = repository.create(make_rule())
+        old = store.current()
+
+        other = make_rule(name="Other")
+        repository.file_path.write_text(json.dumps([rule.to_dict(), other.to_dict()]))
+        stat = os.stat(repository.file_path)
+        os.utime(repository.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        new = store.current()
+        assert new.version > old.version
+        assert new.get(other.id) is not None
+
+    def test_invalid_stored_rule(self, repository):
+        """Test that a stored rule that does not compile only fails requests for it."""
+        valid = repository.create(make_rule())
+        corrupt = make_rule(name="Corrupt", expression="age >>= 1")
+        repository.file_path.write_text(json.dumps([valid.to_dict(), corrupt.to_dict()]))
+        stat = os.stat(repository.file_path)
+        os.utime(repository.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        service = EvaluationService(repository)
+
+        assert service.evaluate({"age": 20}, [str(valid.id)]).result == RuleEffect.PASS
+        assert service.evaluate({"age": 20}, [str(valid.id)], explain=False).result == RuleEffect.PASS
+        assert [d.rule_id for d in service.evaluate_all({"age": 20}).details] == [valid.id]
+        with pytest.raises(EvaluationException, match="cannot be evaluated"):
+            service.evaluate({"age": 20}, [str(valid.id), str(corrupt.id)])
+
+        # Fixing the rule through the store makes it evaluable again
+        fixed = Rule(id=corrupt.id, name="Fixed", description="Fixed", expression="age >= 1")
+        service.snapshots.write(fixed.id, lambda: repository.update(fixed), stored=fixed)
+        assert service.evaluate({"age": 20}, [str(corrupt.id)]).result == RuleEffect.PASS
+
+    def test_rebuild_reuses_compiled_rules(self, repository):
+        """Test that a rebuild only compiles changed rules, even with more rules than the cache holds."""
+        store = RuleSnapshotStore(repository, CompiledRuleCache(max_size=2))
+        rules = [repository.create(make_rule(name=f"Rule {i}", expression=f"age >= {i}")) for i in range(5)]
+        old = store.current()
+
+        changed = Rule(id=rules[0].id, name="Changed", description="Changed", expression="age >= 30")
+        FileRuleRepository(str(repository.file_path)).update(changed)
+        misses = store.compiled_cache.stats()["misses"]
+        new = store.current()
+
+        assert new.version > old.version
+        assert store.compiled_cache.stats()["misses"] == misses + 1
+        assert new.get(changed.id)[1].expression_ast.value == 30
+        assert all(new.get(rule.id)[1] is old.get(rule.id)[1] for rule in rules[1:])
+
+    @pytest.mark.parametrize("backend", ["file", "sqlite"])
+    def test_concurrent_write_rebuilds(self, tmp_path, backend):
+        """Test that a write by another instance landing during a store write is not lost."""
+        if backend == "file":
+            repository, other = (FileRuleRepository(str(tmp_path / "rules.json")) for _ in range(2))
+        else:
+            repository, other = (SqliteRuleRepository(str(tmp_path / "rules.db")) for _ in range(2))
+        store = RuleSnapshotStore(repository)
+        rule = repository.create(make_rule())
+        store.current()
+
+        changed = Rule(id=rule.id, name="Changed", description="Changed", expression="age >= 30")
+        added = make_rule(name="Other")
+
+        def write():
+            other.update(changed)
+            return repository.create(added)
+
+        store.write(added.id, write, stored=added)
+        snapshot = store.current()
+        assert snapshot.get(rule.id)[0] == changed
+        assert snapshot.get(added.id)[0] == added
+
+    def test_no_op_write_with_concurrent_write_rebuilds(self, tmp_path):
+        """Test that a delete that found nothing does not take credit for another instance's write."""
+        path = str(tmp_path / "rules.json")
+        repository, other = FileRuleRepository(path), FileRuleRepository(path)
+        store = RuleSnapshotStore(repository)
+        rule = repository.create(make_rule())
+        kept = repository.create(make_rule(name="Kept"))
+        store.current()
+
+        changed = Rule(id=kept.id, name="Changed", description="Changed", expression="age >= 30")
+
+        def write():
+            other.delete(rule.id)
+            other.update(changed)
+            return repository.delete(rule.id)
+
+        assert store.write(rule.id, write) is False
+        snapshot = store.current()
+        assert snapshot.get(rule.id) is None
+        assert snapshot.get(kept.id)[0] == changed
+
+
+class TestEvaluationSnapshots:
+    """Test that evaluations report and stick to one snapshot."""
+
+    def test_responses_report_version(self, repository):
+        """Test that every kind of evaluation reports the snapshot version."""
+        store = RuleSnapshotStore(repository)
+        rule_service = RuleService(repository, snapshots=store)
+        evaluation_service = EvaluationService(repository, snapshots=store)
+        rule_id = str(rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18").id)
+        version = store.current().version
+
+        assert evaluation_service.evaluate({"age": 20}, [rule_id]).snapshot_version == version
+        assert evaluation_service.evaluate_all({"age": 20}).to_dict()["snapshot_version"] == version
+        batch = evaluation_service.evaluate_batch([{"age": 20}], [rule_id])
+        assert batch.snapshot_version == version
+        assert batch.results[0].snapshot_version == version
+
+        rule_service.create_rule(name="Other", description="Other", expression="age >= 21")
+        assert evaluation_service.evaluate({"age": 20}, [rule_id]).snapshot_version > version
+
+    def test_prepared_evaluation_keeps_snapshot(self, repository):
+        """Test that a prepared evaluation keeps using the rules it was prepared with."""
+        store = RuleSnapshotStore(repository)
+        rule_service = RuleService(repository, snapshots=store)
+        evaluation_service = EvaluationService(repository, snapshots=store)
+        rule = rule_service.create_rule(name="Adult", description="Adult", expression="age >= 18")
+
+        evaluate_payload = evaluation_service.prepare([str(rule.id)], explain=False)
+        rule_service.update_rule(rule.id, name="Adult", description="Adult", expression="age >= 30")
+
+        assert evaluate_payload({"age": 20}).result.value == "PASS"
+        assert evaluation_service.evaluate({"age": 20}, [str(rule.id)]).result.value == "FAIL"
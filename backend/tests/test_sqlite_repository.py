@@ -0,0 +1,122 @@
+"""Tests for the SQLite rule repository."""
+
+import sys
+import threading
+from pathlib import Path
+from uuid import uuid4
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from adapters.outbound.sqlite_repository import SqliteRuleRepository
+from domain.models import OperatorType, Predicate, Rule
+from tests.helpers import make_rule
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = SqliteRuleRepository(str(tmp_path / "rules.db"))
+    yield repository
+    repository.close()
+
+
+class TestCrud:
+    """Test basic CRUD behaviour."""
+
+    def test_starts_empty(self, repository):
+        """Test that a new database holds no rules."""
+        assert repository.get_all() == []
+        assert repository.version == 0
+
+    def test_create_and_get(self, repository):
+        """Test creating a rule and reading it back."""
+        rule = repository.create(make_rule())
+        assert repository.get_by_id(rule.id) == rule
+        assert repository.get_all() == [rule]
+
+    def test_predicate_rule_round_trip(self, repository):
+        """Test that predicate rules keep their predicates and logical operator."""
+        rule = Rule(
+            id=uuid4(), name="P", description="P",
+            predicates=[Predicate("country", OperatorType.IN, ["USA", "UK"])],
+            logical_operator="OR"
+        )
+        repository.create(rule)
+        assert repository.get_by_id(rule.id) == rule
+
+    def test_update(self, repository):
+        """Test updating an existing rule keeps its position."""
+        first = repository.create(make_rule())
+        second = repository.create(make_rule(name="Other"))
+        repository.update(Rule(id=first.id, name="Senior", description="Senior", expression="age >= 65"))
+        assert [r.id for r in repository.get_all()] == [first.id, second.id]
+        assert repository.get_by_id(first.id).expression == "age >= 65"
+
+    def test_update_missing_rule_is_ignored(self, repository):
+        """Test that updating an unknown rule does not create it."""
+        repository.update(make_rule())
+        assert repository.get_all() == []
+
+    def test_delete(self, repository):
+        """Test deleting a rule."""
+        rule = repository.create(make_rule())
+        assert repository.delete(rule.id) is True
+        assert repository.delete(rule.id) is False
+        assert repository.get_by_id(rule.id) is None
+
+    def test_get_many(self, repository):
+        """Test looking up several rules at once, skipping unknown IDs."""
+        rules = [repository.create(make_rule(name=f"Rule {i}")) for i in range(3)]
+        unknown = uuid4()
+        found = repository.get_many([rules[2].id, unknown, rules[0].id, rules[0].id])
+        assert found == {rules[2].id: rules[2], rules[0].id: rules[0]}
+        assert repository.get_many([]) == {}
+
+    def test_get_many_beyond_parameter_limit(self, repository):
+        """Test that lookups of more IDs than one query can bind are split."""
+        rules = [make_rule(name=f"Rule {i}") for i in range(1200)]
+        repository.save_all(rules)
+        assert repository.get_many([rule.id for rule in rules]) == {rule.id: rule for rule in rules}
+
+    def test_save_all_replaces_rules(self, repository):
+        """Test that save_all replaces the whole rule base, in order."""
+        repository.create(make_rule())
+        rules = [make_rule(name=f"Rule {i}") for i in range(5)]
+        repository.save_all(rules)
+        assert repository.get_all() == rules
+
+
+class TestSharing:
+    """Test behaviour across connections."""
+
+    def test_version_tracks_writes(self, repository):
+        """Test that every write bumps the version."""
+        rule = repository.create(make_rule())
+        version = repository.version
+        repository.delete(rule.id)
+        assert repository.version > version
+
+    def test_two_instances_share_database(self, tmp_path):
+        """Test that a second repository sees writes made by the first."""
+        path = str(tmp_path / "rules.db")
+        first = SqliteRuleRepository(path)
+        second = SqliteRuleRepository(path)
+        version = second.version
+
+        rule = first.create(make_rule())
+        assert second.get_by_id(rule.id) == rule
+        assert second.version > version
+
+    def test_threads_use_own_connections(self, repository):
+        """Test concurrent writes from several threads."""
+        def write(i):
+            repository.create(make_rule(name=f"Rule {i}"))
+            repository.close()
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(repository.get_all()) == 8
@@ -0,0 +1,79 @@
+"""Tests for column-wise batch evaluation."""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from domain.expression_parser import ComparisonNode, parse_expression
+from domain.expression_evaluator import evaluate_expression_detailed
+from domain.vectorized_evaluator import VectorizedEvaluator
+from domain.exceptions import MissingFieldException, TypeMismatchException
+from domain.expression_compiler import compile_comparison
+
+
+EXPRESSIONS = [
+    "age >= 18",
+    "age > 18 AND age < 65",
+    "(age >= 21 AND credit_score >= 700 AND debt_ratio < 0.4) OR net_worth > 1000000",
+    "country in ['USA', 'Canada'] AND status not_in ['banned']",
+    "email contains '@' OR tags not_contains 'spam'",
+    "ip_country == account_country OR age > credit_score",
+    "status == null OR verified == true",
+    "age == 1 OR country != 'UK'",
+]
+
+PAYLOADS = [
+    {"age": 25, "credit_score": 720, "debt_ratio": 0.3, "net_worth": 5, "country": "USA",
+     "status": "active", "email": "a@b.c", "tags": ["vip"], "ip_country": "US",
+     "account_country": "US", "verified": True},
+    {"age": 17, "credit_score": 600, "debt_ratio": 0.5, "net_worth": 2000000, "country": "UK",
+     "status": "banned", "email": "nope", "tags": ["spam"], "ip_country": "US",
+     "account_country": "FR", "verified": False},
+    {"age": "old", "credit_score": None, "debt_ratio": "x", "net_worth": 1, "country": 1,
+     "status": None, "email": 5, "tags": 3, "ip_country": 1, "account_country": "1",
+     "verified": None},
+    {"age": True, "credit_score": 2 ** 60, "debt_ratio": float("nan"), "country": ["USA"],
+     "status": {"a": 1}, "net_worth": 1000000.5},
+    {"age": 30},
+    {},
+]
+
+
+class TestParity:
+    """Column-wise results must match the row-wise evaluator for every row."""
+
+    @pytest.mark.parametrize("expression", EXPRESSIONS)
+    def test_verdict_matches_detailed(self, expression):
+        """Test the PASS mask equals the detailed evaluator's verdict per row."""
+        ast = parse_expression(expression)
+        passes = VectorizedEvaluator(PAYLOADS).evaluate_verdict(ast).tolist()
+        assert passes == [evaluate_expression_detailed(ast, p)[0] for p in PAYLOADS]
+
+    @pytest.mark.parametrize("operator", ["==", "!=", ">", ">=", "<", "<="])
+    def test_comparison_errors_match(self, operator):
+        """Test value and error masks match compiled comparisons, including raised errors."""
+        node = ComparisonNode(field="age", operator=operator, value=18)
+        value, error = VectorizedEvaluator(PAYLOADS).evaluate(node)
+        compare = compile_comparison(node)
+        for i, payload in enumerate(PAYLOADS):
+            try:
+                expected = (compare(payload), False)
+            except (MissingFieldException, TypeMismatchException):
+                expected = (False, True)
+            assert (bool(value[i]), bool(error[i])) == expected
+
+    def test_predicates(self):
+        """Test predicate rules treat erroring predicates as failed."""
+        nodes = [
+            ComparisonNode(field="age", operator=">=", value=18),
+            ComparisonNode(field="country", operator="==", value="USA")
+        ]
+        evaluator = VectorizedEvaluator(PAYLOADS)
+        assert evaluator.evaluate_predicates(nodes, "AND").tolist() == [True, False, False, False, False, False]
+        assert evaluator.evaluate_predicates(nodes, "OR").tolist() == [True, False, False, False, True, False]